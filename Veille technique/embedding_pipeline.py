@@ -0,0 +1,335 @@
+################## Pipeline d'embeddings des descriptions produits (veille technique) ########################
+# Reprend les étapes du notebook Fifi_Nelly_2_notebook_veille_122024.ipynb :
+# nettoyage -> embeddings (TF-IDF, Word2Vec, BERT/DeBERTa) -> StandardScaler + PCA(50) -> T-SNE -> K-Means -> ARI
+# Chaque étape est mise en cache sur disque, indexée par l'empreinte de ses entrées et de ses paramètres :
+# une grid search ne recalcule que les étapes dont les paramètres changent.
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from sklearn.metrics import adjusted_rand_score, confusion_matrix
+
+# Répertoire du cache des embeddings et des projections
+CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", ".embedding_cache")
+
+# Nombre de clusters K-Means (catégories principales du jeu Flipkart)
+N_CLUSTERS = 7
+
+# Dimension de la PCA appliquée avant T-SNE
+PCA_COMPONENTS = 50
+
+RANDOM_STATE = 42
+
+# Initialisations K-Means : "auto" (une seule avec k-means++), valeur par défaut de scikit-learn
+# utilisée par le notebook (KMeans(n_clusters=7, random_state=42))
+KMEANS_N_INIT = "auto"
+
+
+##### nettoyage du texte
+def load_stop_words():
+    """Mots vides anglais de NLTK, ou ceux de scikit-learn si le corpus NLTK n'est pas installé."""
+    try:
+        from nltk.corpus import stopwords
+
+        return set(stopwords.words("english"))
+    except (ImportError, LookupError):
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        return set(ENGLISH_STOP_WORDS)
+
+
+# Séparateur de documents dans le corpus concaténé (ni une lettre, ni un espace)
+_DOCUMENT_SEPARATOR = "\x00"
+
+
+def clean_descriptions(descriptions, stop_words=None):
+    """
+    Version vectorisée de `clean_text` : minuscules, suppression de la ponctuation,
+    des mots vides et des mots courts. Le résultat est identique ligne à ligne.
+    Le corpus est traité comme une seule chaîne (une expression régulière, un découpage),
+    et le test des mots vides est fait une fois par mot distinct, non par occurrence.
+    """
+    stop_words = load_stop_words() if stop_words is None else stop_words
+    texts = pd.Series(descriptions, dtype=object).fillna("").astype(str)
+    if texts.empty:
+        # "".split("\n") donnerait un document vide de trop
+        return pd.Series([], index=texts.index, dtype=object)
+    corpus = f" {_DOCUMENT_SEPARATOR} ".join(texts.tolist()).lower()
+    corpus = re.sub(rf"[^a-z\s{_DOCUMENT_SEPARATOR}]", "", corpus)
+    codes, vocabulary = pd.factorize(np.array(corpus.split(), dtype=object))
+    # Chaque mot distinct devient "mot " (conservé), "" (supprimé) ou un saut de ligne (fin de document)
+    pieces = np.array([
+        "\n" if word == _DOCUMENT_SEPARATOR else (f"{word} " if len(word) > 2 and word not in stop_words else "")
+        for word in vocabulary
+    ], dtype=object)
+    documents = "".join(pieces[codes].tolist()).split("\n")
+    return pd.Series([document.rstrip() for document in documents], index=texts.index, dtype=object)
+
+
+def first_categories(category_trees):
+    """Version vectorisée de `get_first_category` : premier niveau de l'arborescence."""
+    trees = pd.Series(category_trees, dtype=object).astype(str)
+    trees = trees.str.strip("[]").str.replace("'", "", regex=False).str.replace('"', "", regex=False).str.strip()
+    return trees.str.split(" >> ").str[0]
+
+
+##### empreintes et cache disque
+def content_hash(*parts):
+    """Empreinte stable de textes, tableaux NumPy et paramètres JSON."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.dtype).encode())
+            digest.update(str(part.shape).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        elif isinstance(part, (list, tuple, pd.Series)) and all(isinstance(text, str) for text in part):
+            for text in part:
+                digest.update(text.encode("utf-8"))
+                digest.update(b"\x00")
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class ArrayCache:
+    """Tableaux NumPy sur disque (un fichier .npy par clé), doublés d'un cache mémoire."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._arrays = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, f"{key[:32]}.npy")
+
+    def get_or_compute(self, stage, key, compute):
+        """Retourne `(tableau, en_cache)` ; `compute()` n'est appelé qu'en l'absence du tableau."""
+        if (stage, key) in self._arrays:
+            self.hits += 1
+            return self._arrays[stage, key], True
+        path = self._path(stage, key)
+        if os.path.exists(path):
+            array = np.load(path, allow_pickle=False)
+            cached = True
+            self.hits += 1
+        else:
+            array = np.asarray(compute())
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp.npy"
+            np.save(tmp_path, array)
+            os.replace(tmp_path, path)
+            cached = False
+            self.misses += 1
+        self._arrays[stage, key] = array
+        return array, cached
+
+    def forget(self, stage, key):
+        """Libère la copie en mémoire d'un tableau (le fichier sur disque est conservé)."""
+        self._arrays.pop((stage, key), None)
+
+
+##### embeddings
+def tfidf_embeddings(texts, **params):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if "ngram_range" in params:
+        params["ngram_range"] = tuple(params["ngram_range"])
+    return TfidfVectorizer(**params).fit_transform(texts).toarray().astype(np.float32)
+
+
+def word2vec_embeddings(texts, vector_size=100, window=5, epochs=5, min_count=1, sg=1, seed=RANDOM_STATE):
+    """
+    Moyenne des vecteurs Word2Vec des mots de chaque description.
+    La moyenne est un produit matrice creuse (comptages) x vecteurs, sans boucle par document.
+    """
+    from gensim.models import Word2Vec
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    tokens = [text.split() for text in texts]
+    # Un seul worker : l'entraînement est reproductible, condition pour réutiliser le cache
+    model = Word2Vec(sentences=tokens, vector_size=vector_size, window=window, min_count=min_count,
+                     sg=sg, epochs=epochs, seed=seed, workers=1)
+    counter = CountVectorizer(vocabulary=model.wv.index_to_key, token_pattern=r"\S+", lowercase=False)
+    counts = counter.transform(texts)
+    sums = counts @ model.wv.vectors
+    lengths = np.asarray(counts.sum(axis=1), dtype=np.float32)
+    # Description sans mot connu : vecteur nul, comme dans le notebook
+    return np.divide(sums, lengths, out=np.zeros_like(sums), where=lengths > 0).astype(np.float32)
+
+
+def transformer_embeddings(texts, model_name="bert-base-uncased", max_length=256, batch_size=32, num_threads=None):
+    """
+    Embeddings moyens (mean pooling masqué) d'un modèle Hugging Face, calculés par lots sur CPU.
+    Les textes sont triés par longueur : chaque lot n'est complété (padding) que jusqu'à
+    son plus long texte, puis les résultats sont remis dans l'ordre d'origine.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    texts = list(texts)
+    order = np.argsort([len(text) for text in texts], kind="stable")
+    embeddings = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+    with torch.inference_mode():
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = tokenizer([texts[i] for i in batch], padding="longest", truncation=True,
+                               max_length=max_length, return_tensors="pt")
+            hidden = model(**inputs).last_hidden_state
+            # Les positions de padding sont exclues de la moyenne : même résultat qu'un texte seul
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            embeddings[batch] = pooled.numpy()
+    return embeddings
+
+
+# Méthode -> (fonction, paramètres sans effet sur le résultat, exclus de la clé de cache)
+EMBEDDERS = {
+    "tfidf": (tfidf_embeddings, ()),
+    "word2vec": (word2vec_embeddings, ()),
+    "transformer": (transformer_embeddings, ("batch_size", "num_threads")),
+}
+
+
+##### réduction de dimension, clustering et évaluation
+def standardize_pca(embeddings, n_components=PCA_COMPONENTS, random_state=RANDOM_STATE):
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
+    scaled = StandardScaler().fit_transform(embeddings)
+    n_components = min(n_components, *scaled.shape)
+    return PCA(n_components=n_components, random_state=random_state).fit_transform(scaled).astype(np.float32)
+
+
+def tsne_projection(features, learning_rate="auto", perplexity=30.0, random_state=RANDOM_STATE):
+    from sklearn.manifold import TSNE
+
+    return TSNE(n_components=2, random_state=random_state, init="pca", learning_rate=learning_rate,
+                perplexity=perplexity).fit_transform(features).astype(np.float32)
+
+
+def kmeans_clusters(projection, n_clusters=N_CLUSTERS, random_state=RANDOM_STATE):
+    from sklearn.cluster import KMeans
+
+    return KMeans(n_clusters=n_clusters, random_state=random_state, n_init=KMEANS_N_INIT).fit_predict(projection)
+
+
+def conf_mat_transform(true_labels, predicted_labels):
+    """Aligne les clusters sur les vraies classes (matrice de confusion + algorithme hongrois)."""
+    predicted_labels = np.asarray(predicted_labels)
+    conf_matrix_raw = confusion_matrix(true_labels, predicted_labels)
+    row_ind, col_ind = linear_sum_assignment(-conf_matrix_raw)
+    # Table de correspondance indexée par cluster, appliquée en une seule opération
+    mapping = np.arange(max(conf_matrix_raw.shape))
+    mapping[col_ind] = row_ind
+    return mapping[predicted_labels]
+
+
+##### pipeline avec cache par étape
+def tsne_key(pca_key, learning_rate):
+    """Clé de cache d'une projection T-SNE (partagée avec sweep_executor)."""
+    return content_hash(pca_key, "tsne", learning_rate)
+
+
+class EmbeddingPipeline:
+    """
+    Pipeline textes -> ARI dont chaque étape est indexée par l'empreinte de ses entrées :
+    embeddings (méthode et paramètres), PCA (embeddings), T-SNE (PCA et learning rate).
+    """
+
+    def __init__(self, texts, labels, cache_dir=CACHE_DIR, n_clusters=N_CLUSTERS):
+        self.texts = list(texts)
+        self.labels = np.asarray(labels)
+        self.n_clusters = n_clusters
+        self.cache = ArrayCache(cache_dir)
+        self.texts_key = content_hash(self.texts)
+
+    def embeddings(self, method, **params):
+        embed, ignored = EMBEDDERS[method]
+        key_params = {name: value for name, value in params.items() if name not in ignored}
+        key = content_hash(self.texts_key, method, key_params)
+        array, cached = self.cache.get_or_compute("embeddings", key, lambda: embed(self.texts, **params))
+        return key, array, cached
+
+    def pca(self, embeddings_key, embeddings, n_components=PCA_COMPONENTS):
+        key = content_hash(embeddings_key, "pca", n_components)
+        array, cached = self.cache.get_or_compute("pca", key, lambda: standardize_pca(embeddings, n_components))
+        return key, array, cached
+
+    def tsne(self, pca_key, features, learning_rate="auto"):
+        key = tsne_key(pca_key, learning_rate)
+        array, cached = self.cache.get_or_compute("tsne", key, lambda: tsne_projection(features, learning_rate))
+        return key, array, cached
+
+    def run(self, method, embedding_params=None, tsne_learning_rate="auto", n_components=PCA_COMPONENTS):
+        """Évalue une configuration ; retourne l'ARI, les durées et la provenance de chaque étape."""
+        timings, cached = {}, {}
+        start = time.perf_counter()
+        embeddings_key, embeddings, cached["embeddings"] = self.embeddings(method, **(embedding_params or {}))
+        timings["embeddings"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pca_key, features, cached["pca"] = self.pca(embeddings_key, embeddings, n_components)
+        timings["pca"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, projection, cached["tsne"] = self.tsne(pca_key, features, tsne_learning_rate)
+        timings["tsne"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        clusters = kmeans_clusters(projection, self.n_clusters)
+        ari = adjusted_rand_score(self.labels, conf_mat_transform(self.labels, clusters))
+        timings["kmeans"] = time.perf_counter() - start
+        return {
+            "method": method,
+            **(embedding_params or {}),
+            "tsne_lr": tsne_learning_rate,
+            "ari": ari,
+            **{f"{stage}_s": seconds for stage, seconds in timings.items()},
+            **{f"{stage}_cached": value for stage, value in cached.items()},
+        }
+
+    def grid_search(self, method, embedding_grid, tsne_learning_rates=("auto",)):
+        """
+        Toutes les combinaisons, les embeddings en boucle externe : chaque embedding et sa PCA
+        ne sont calculés qu'une fois pour tous les learning rates T-SNE.
+        """
+        names = list(embedding_grid)
+        rows = []
+        for values in itertools.product(*(embedding_grid[name] for name in names)):
+            params = dict(zip(names, values))
+            for learning_rate in tsne_learning_rates:
+                rows.append(self.run(method, params, learning_rate))
+        return pd.DataFrame(rows).sort_values("ari", ascending=False, ignore_index=True)
+
+
+def load_flipkart(path="flipkart_com-ecommerce_sample_1050.csv", stop_words=None):
+    """Jeu Flipkart préparé comme dans le notebook : description nettoyée et catégorie encodée."""
+    from sklearn.preprocessing import LabelEncoder
+
+    ecom = pd.read_csv(path, usecols=["uniq_id", "description", "product_category_tree"])
+    ecom["cleaned_description"] = clean_descriptions(ecom["description"], stop_words)
+    ecom["main_category"] = first_categories(ecom["product_category_tree"])
+    ecom["category_encoded"] = LabelEncoder().fit_transform(ecom["main_category"])
+    return ecom.drop(columns=["product_category_tree", "description"])
+
+
+if __name__ == "__main__":
+    # Exemple : grid search TF-IDF ; relancer le script ne recalcule aucune étape
+    ecom = load_flipkart(os.path.join(os.path.dirname(os.path.abspath(__file__)), "flipkart_com-ecommerce_sample_1050.csv"))
+    pipeline = EmbeddingPipeline(ecom["cleaned_description"], ecom["category_encoded"])
+    tfidf_grid = {"max_df": [0.7, 0.9], "min_df": [2, 3], "max_features": [1000, 2000], "ngram_range": [(1, 1), (1, 2)]}
+    results = pipeline.grid_search("tfidf", tfidf_grid, tsne_learning_rates=(50, 200))
+    print(results.head(10).to_string())
+    print(f"Étapes en cache : {pipeline.cache.hits}, calculées : {pipeline.cache.misses}")
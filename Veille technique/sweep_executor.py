@@ -0,0 +1,301 @@
+################## Exécution parallèle des sweeps d'hyperparamètres (clustering / ARI) ########################
+# Remplace les boucles itertools du notebook (word2vec_params x tsne_params, 81 T-SNE en série) :
+# - chaque configuration d'embedding (embeddings, PCA, score approché) est préparée par un worker du pool
+# - un score approché (K-Means directement sur la PCA) écarte les embeddings clairement mauvais dès qu'il arrive,
+#   avant leurs fits T-SNE
+# - les matrices PCA retenues sont placées en mémoire partagée : les fits T-SNE les lisent sans copie
+# - chaque résultat (score approché ou ARI final) est ajouté à un fichier de reprise : un sweep interrompu
+#   repart où il s'était arrêté, et un autre seuil d'élagage peut être appliqué à la reprise
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score
+
+from embedding_pipeline import (
+    CACHE_DIR,
+    KMEANS_N_INIT,
+    N_CLUSTERS,
+    PCA_COMPONENTS,
+    ArrayCache,
+    EmbeddingPipeline,
+    conf_mat_transform,
+    content_hash,
+    kmeans_clusters,
+    load_flipkart,
+    tsne_key,
+    tsne_projection,
+)
+
+# Grilles du notebook
+WORD2VEC_GRID = {"vector_size": [50, 100, 200], "window": [3, 5, 7], "epochs": [5, 10, 20]}
+TFIDF_GRID = {"max_df": [0.7, 0.8, 0.9], "min_df": [2, 3], "max_features": [1000, 2000], "ngram_range": [(1, 1), (1, 2)]}
+TSNE_LEARNING_RATES = [10, 50, 200]
+
+# Un embedding est écarté si son score approché est inférieur à cette fraction du meilleur (0 : aucun élagage)
+PRUNE_RATIO = 0.5
+
+
+def cluster_ari(labels, projection, n_clusters=N_CLUSTERS):
+    clusters = kmeans_clusters(projection, n_clusters)
+    return adjusted_rand_score(labels, conf_mat_transform(labels, clusters))
+
+
+##### matrices en mémoire partagée
+class SharedMatrix:
+    """Tableau NumPy copié dans un segment de mémoire partagée ; `spec` suffit à le rouvrir ailleurs."""
+
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.spec = (self.shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, array.dtype, buffer=self.shm.buf)[...] = array
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# État d'un worker : segments déjà ouverts (une ouverture par matrice et par processus) et pipeline
+_attached = {}
+_thread_limits = None
+_pipeline = None
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, np.dtype(dtype), buffer=_attached[name].buf)
+
+
+def _init_worker(texts, labels, cache_dir, n_clusters):
+    # Un thread BLAS/OpenMP par worker : le parallélisme vient du pool, pas de la sursouscription
+    global _thread_limits, _pipeline
+    from threadpoolctl import threadpool_limits
+
+    _thread_limits = threadpool_limits(1)
+    # Textes et libellés transmis une fois par worker, pas à chaque tâche
+    _pipeline = EmbeddingPipeline(texts, labels, cache_dir, n_clusters)
+
+
+def _prepare(task):
+    """Tâche d'un worker : embeddings, PCA (caches disque de embedding_pipeline) et score approché."""
+    stages = {}
+    start = time.perf_counter()
+    embeddings_key, embeddings, stages["embeddings_cached"] = _pipeline.embeddings(task["method"], **task["params"])
+    stages["embeddings_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    pca_key, features, stages["pca_cached"] = _pipeline.pca(embeddings_key, embeddings, task["n_components"])
+    stages["pca_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    stages["proxy_ari"] = cluster_ari(_pipeline.labels, features, _pipeline.n_clusters)
+    stages["proxy_s"] = time.perf_counter() - start
+    # Les embeddings ne sont plus utiles à ce worker : seule la PCA (quelques centaines de Ko) est renvoyée
+    _pipeline.cache.forget("embeddings", embeddings_key)
+    return {"pca_key": pca_key, **stages}, features
+
+
+def _evaluate(task):
+    """Tâche d'un worker : T-SNE (en cache disque si déjà calculé), K-Means et ARI."""
+    features = _attach(task["features"])
+    labels = _attach(task["labels"])
+    cache = ArrayCache(task["cache_dir"])
+    start = time.perf_counter()
+    projection, cached = cache.get_or_compute(
+        "tsne", tsne_key(task["pca_key"], task["tsne_lr"]),
+        lambda: tsne_projection(features, task["tsne_lr"]),
+    )
+    tsne_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    ari = cluster_ari(labels, projection, task["n_clusters"])
+    return {
+        "key": task["key"],
+        "ari": ari,
+        "tsne_s": tsne_seconds,
+        "kmeans_s": time.perf_counter() - start,
+        "tsne_cached": cached,
+        "worker": os.getpid(),
+    }
+
+
+##### reprise
+class Checkpoint:
+    """Résultats déjà obtenus, un objet JSON par ligne ; chaque ligne est écrite dès que le résultat arrive."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par l'interruption : la configuration sera relancée
+                        continue
+                    self.rows[row["key"]] = row
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def add(self, row):
+        self.rows[row["key"]] = row
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(row, default=str) + "\n")
+
+
+##### sweep
+class SweepExecutor:
+    """
+    Sweep embeddings x learning rates T-SNE réparti sur `workers` processus.
+    La table de résultats donne l'ARI et la durée de chaque étape par configuration.
+    """
+
+    def __init__(self, texts, labels, method="word2vec", cache_dir=CACHE_DIR, checkpoint_path=None,
+                 workers=None, prune_ratio=PRUNE_RATIO, n_components=PCA_COMPONENTS, n_clusters=N_CLUSTERS):
+        self.texts = list(texts)
+        self.labels = np.asarray(labels)
+        self.texts_key = content_hash(self.texts)
+        self.method = method
+        self.cache_dir = cache_dir
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.workers = workers or os.cpu_count()
+        self.prune_ratio = prune_ratio
+        self.n_components = n_components
+        self.n_clusters = n_clusters
+        self.learning_rates = list(TSNE_LEARNING_RATES)
+
+    def _proxy_key(self, params):
+        return content_hash(self.texts_key, self.method, params, self.n_components, "proxy", KMEANS_N_INIT)
+
+    def _config_key(self, params, learning_rate):
+        return content_hash(self.texts_key, self.method, params, self.n_components, learning_rate, KMEANS_N_INIT)
+
+    def run(self, embedding_grid, tsne_learning_rates=TSNE_LEARNING_RATES):
+        names = list(embedding_grid)
+        grid = [dict(zip(names, values)) for values in itertools.product(*(embedding_grid[name] for name in names))]
+        self.learning_rates = list(tsne_learning_rates)
+        start = time.perf_counter()
+
+        # Meilleur score approché connu, y compris ceux des sweeps précédents
+        best = max((row["proxy_ari"] for row in self.checkpoint.rows.values() if row["status"] == "proxy"), default=0.0)
+        labels = SharedMatrix(self.labels)
+        shared = []
+        preparing = {}
+        evaluating = {}
+
+        def schedule(proxy_row, features, pending):
+            """Lance les fits T-SNE d'un embedding, sauf s'il est sous le seuil d'élagage courant."""
+            if proxy_row["proxy_ari"] < self.prune_ratio * best:
+                return
+            matrix = SharedMatrix(features)
+            shared.append(matrix)
+            for rate, key in pending.items():
+                future = pool.submit(_evaluate, {
+                    "key": key, "features": matrix.spec, "labels": labels.spec, "pca_key": proxy_row["pca_key"],
+                    "tsne_lr": rate, "cache_dir": self.cache_dir, "n_clusters": self.n_clusters,
+                })
+                evaluating[future] = (proxy_row, rate)
+
+        try:
+            with ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"), initializer=_init_worker,
+                                     initargs=(self.texts, self.labels, self.cache_dir, self.n_clusters)) as pool:
+                # 1. préparation des embeddings restant à évaluer, en parallèle
+                for params in grid:
+                    pending = {rate: self._config_key(params, rate) for rate in self.learning_rates}
+                    pending = {rate: key for rate, key in pending.items() if key not in self.checkpoint}
+                    if not pending:
+                        continue
+                    proxy_key = self._proxy_key(params)
+                    proxy_row = self.checkpoint.rows.get(proxy_key)
+                    if proxy_row is not None and proxy_row["proxy_ari"] < self.prune_ratio * best:
+                        # Écarté d'après le score approché enregistré : rien à recalculer
+                        continue
+                    task = {"method": self.method, "params": params, "n_components": self.n_components}
+                    preparing[pool.submit(_prepare, task)] = (params, proxy_key, pending)
+
+                # 2. élagage au fil des scores approchés, puis 3. T-SNE + K-Means + ARI
+                while preparing or evaluating:
+                    done, _ = wait([*preparing, *evaluating], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in preparing:
+                            params, proxy_key, pending = preparing.pop(future)
+                            stages, features = future.result()
+                            proxy_row = {"key": proxy_key, "status": "proxy", "method": self.method, **params, **stages}
+                            self.checkpoint.add(proxy_row)
+                            if proxy_row["proxy_ari"] > best:
+                                best = proxy_row["proxy_ari"]
+                                # Fits pas encore démarrés d'embeddings désormais sous le seuil : annulés
+                                for queued, (row, _) in list(evaluating.items()):
+                                    if row["proxy_ari"] < self.prune_ratio * best and queued.cancel():
+                                        del evaluating[queued]
+                            schedule(proxy_row, features, pending)
+                        else:
+                            proxy_row, rate = evaluating.pop(future)
+                            result = future.result()
+                            base = {name: value for name, value in proxy_row.items() if name not in ("key", "status")}
+                            self.checkpoint.add({**base, **result, "tsne_lr": rate, "status": "done"})
+        finally:
+            for matrix in shared + [labels]:
+                matrix.release()
+
+        self.wall_seconds = time.perf_counter() - start
+        self.best_proxy = best
+        return self.results()
+
+    def results(self):
+        """
+        Toutes les configurations (reprises comprises), les meilleures en tête.
+        Une configuration sans ARI final est marquée "pruned" : son embedding est resté sous le seuil.
+        """
+        rows = [row for row in self.checkpoint.rows.values() if row["status"] == "done"]
+        done = {(row["pca_key"], row["tsne_lr"]) for row in rows}
+        for row in self.checkpoint.rows.values():
+            if row["status"] != "proxy":
+                continue
+            base = {name: value for name, value in row.items() if name not in ("key", "status")}
+            rows += [{**base, "tsne_lr": rate, "status": "pruned", "ari": None}
+                     for rate in self.learning_rates if (row["pca_key"], rate) not in done]
+        table = pd.DataFrame(rows)
+        if table.empty:
+            return table
+        return table.sort_values(["ari", "proxy_ari"], ascending=False, na_position="last", ignore_index=True)
+
+
+def stage_summary(results):
+    """Temps cumulé par étape, pour le comparer à la durée réelle du sweep."""
+    # Embeddings, PCA et score approché sont communs aux learning rates d'un même embedding
+    shared = results.drop_duplicates("pca_key")[["embeddings_s", "pca_s", "proxy_s"]].sum()
+    per_config = results[[column for column in ("tsne_s", "kmeans_s") if column in results]].sum()
+    return pd.concat([shared, per_config]).rename("secondes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep parallèle embeddings x T-SNE évalué par l'ARI.")
+    parser.add_argument("--method", default="word2vec", choices=["word2vec", "tfidf"])
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       "flipkart_com-ecommerce_sample_1050.csv"))
+    parser.add_argument("--checkpoint", default=None, help="fichier JSONL de reprise (par défaut sweep-<méthode>.jsonl)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--prune-ratio", type=float, default=PRUNE_RATIO)
+    args = parser.parse_args()
+
+    ecom = load_flipkart(args.data)
+    executor = SweepExecutor(
+        ecom["cleaned_description"], ecom["category_encoded"], method=args.method,
+        checkpoint_path=args.checkpoint or f"sweep-{args.method}.jsonl",
+        workers=args.workers, prune_ratio=args.prune_ratio,
+    )
+    results = executor.run(WORD2VEC_GRID if args.method == "word2vec" else TFIDF_GRID)
+    print(results.drop(columns=["key", "pca_key"], errors="ignore").head(10).to_string())
+    print(f"\n{len(results)} configurations, {(results['status'] == 'pruned').sum()} écartées, "
+          f"sweep en {executor.wall_seconds:.1f} s")
+    print(stage_summary(results).to_string())
@@ -0,0 +1,62 @@
+################## Débit et latence des prédictions avec et sans la passerelle ########################
+"""
+Compare les appels directs au modèle local (ScoringService.predict) et la passerelle de
+regroupement (gateway.PredictionGateway) : latence d'un utilisateur seul, puis débit
+avec N threads qui demandent chacun la prédiction d'un client existant.
+
+    SCORING_MODE=local python benchmarks/gateway_benchmark.py --clients 400 --threads 1 8 32
+
+À lancer depuis le répertoire contenant clients_data.csv et le modèle (ou avec
+CLIENTS_DATA_PATH / MODEL_PATH).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("SCORING_MODE", "local")
+
+from credit_dashboard.gateway import PredictionGateway  # noqa: E402
+from credit_dashboard.scoring import get_scoring_service  # noqa: E402
+
+
+def single_user_latency(predict, client_ids):
+    """Latence médiane (ms) de demandes successives, sans concurrence."""
+    durations = []
+    for client_id in client_ids:
+        start = time.perf_counter()
+        predict(client_id)
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations) * 1000)
+
+
+def throughput(predict, client_ids, threads):
+    """Prédictions par seconde avec `threads` demandes simultanées."""
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(predict, client_ids))
+        return len(client_ids) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=400)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    service = get_scoring_service()
+    gateway = PredictionGateway(service)
+    client_ids = service.get_client_ids()[:args.clients]
+    # Premier appel hors mesure : chargement du modèle et des colonnes
+    service.predict(client_ids[0])
+
+    for name, predict in (("direct", service.predict), ("passerelle", gateway.predict)):
+        latency = single_user_latency(predict, client_ids[:50])
+        rates = ", ".join(f"{threads} threads : {throughput(predict, client_ids, threads):.0f}/s"
+                          for threads in args.threads)
+        print(f"{name:<11} latence p50 {latency:.2f} ms | {rates}")
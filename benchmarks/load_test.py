@@ -0,0 +1,209 @@
+################## Test de charge du dashboard contre l'API simulée ########################
+"""
+Simule plusieurs chargés de clientèle parcourant toutes les pages du dashboard
+(sessions Streamlit sans navigateur, AppTest) face à l'API simulée de mock_api.py.
+Chaque session tourne dans son propre processus : AppTest ne peut pas être piloté depuis
+plusieurs threads, et les caches de processus ne sont donc pas partagés entre sessions.
+
+    python benchmarks/load_test.py --users 8 --iterations 3 --latency 0.05 --clients 50000
+
+Rapporte, par page, les centiles p50/p95/p99 de la durée d'exécution du script,
+le débit global (exécutions par seconde) et la mémoire retenue par session.
+--output enregistre le résultat en JSON pour suivre l'évolution d'une version à l'autre.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+DASHBOARD = os.path.join(REPO_ROOT, "FIFI_Nelly_1_dashboard_122024.py")
+sys.path[:0] = [REPO_ROOT, BENCHMARK_DIR]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _configure(args, workdir):
+    """La configuration du dashboard est lue à l'import : elle doit précéder tout import de credit_dashboard."""
+    port = _free_port()
+    os.environ.update({
+        "API_URL": f"http://127.0.0.1:{port}",
+        "SCORING_MODE": "remote",
+        "CLIENTS_DATA_PATH": os.path.join(workdir, "clients_data.csv"),
+        "DASHBOARD_CACHE_DIR": os.path.join(workdir, "cache"),
+        "DASHBOARD_WARM_UP": "0",
+    })
+    return port
+
+
+class Session:
+    """Une session utilisateur : un AppTest qui visite les pages via le paramètre d'URL ?page=."""
+
+    def __init__(self, pages, client_ids, rng):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(DASHBOARD, default_timeout=120)
+        self.pages = pages
+        self.client_ids = client_ids
+        self.rng = rng
+
+    def _run(self, page, timings):
+        start = time.perf_counter()
+        self.app.run()
+        timings[page].append(time.perf_counter() - start)
+        if self.app.exception:
+            raise RuntimeError(f"{page} : {self.app.exception[0].value}")
+
+    def visit(self, page, module_name, timings):
+        self.app.query_params["page"] = page
+        self._run(page, timings)
+        # Recherche d'un client au hasard dans le sélecteur
+        search = [widget for widget in self.app.text_input if widget.key == f"{module_name}_search"]
+        if search:
+            search[0].input(str(self.rng.choice(self.client_ids)))
+            self._run(page, timings)
+        # Action principale de la page (prédiction, mise à jour...)
+        if len(self.app.button):
+            self.app.button[0].click()
+            self._run(page, timings)
+
+    def walk(self, timings):
+        for page, (module_name, _) in self.pages.items():
+            self.visit(page, module_name, timings)
+
+
+def measure_memory(pages, client_ids, n_sessions):
+    """Mémoire Python retenue par session ouverte (les caches partagés sont remplis au préalable)."""
+    Session(pages, client_ids, random.Random(0)).walk(defaultdict(list))
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = []
+    for index in range(n_sessions):
+        session = Session(pages, client_ids, random.Random(index))
+        session.walk(defaultdict(list))
+        sessions.append(session)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"per_session_mb": (after - before) / n_sessions / 2**20, "peak_mb": (peak - before) / 2**20}
+
+
+def _user(index, pages, client_ids, iterations, start_at):
+    """Une session dans son propre processus : AppTest n'est pas utilisable depuis plusieurs threads."""
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    timings = defaultdict(list)
+    session = Session(pages, client_ids, random.Random(index))
+    # Départ synchronisé, une fois Streamlit importé dans chaque processus
+    time.sleep(max(0.0, start_at - time.time()))
+    start = time.time()
+    try:
+        for _ in range(iterations):
+            session.walk(timings)
+        error = None
+    except Exception as exception:  # noqa: BLE001 - rapporté à la fin du test
+        error = str(exception)
+    return dict(timings), start, time.time(), error
+
+
+def run_load(pages, client_ids, users, iterations):
+    """`users` sessions simultanées, chacune parcourant toutes les pages `iterations` fois."""
+    # AppTest remplace le module __main__ : la fonction des processus est référencée par son module
+    from load_test import _user as user
+
+    timings = defaultdict(list)
+    context = multiprocessing.get_context("spawn")
+    start_at = time.time() + 5 + users
+    with context.Pool(users) as pool:
+        results = pool.starmap(user, [(index, pages, client_ids, iterations, start_at) for index in range(users)])
+    for local, _, _, _ in results:
+        for page, values in local.items():
+            timings[page].extend(values)
+    elapsed = max(result[2] for result in results) - min(result[1] for result in results)
+    errors = [result[3] for result in results if result[3]]
+    return timings, elapsed, errors
+
+
+def summarize(timings):
+    rows = {}
+    for page, values in timings.items():
+        values = np.asarray(values) * 1000
+        rows[page] = {
+            "runs": len(values),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "p99_ms": float(np.percentile(values, 99)),
+            "mean_ms": float(values.mean()),
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=4, help="sessions simultanées")
+    parser.add_argument("--iterations", type=int, default=2, help="parcours complets par session")
+    parser.add_argument("--clients", type=int, default=20000, help="taille de la population synthétique")
+    parser.add_argument("--latency", type=float, default=0.05, help="latence de l'API simulée (secondes)")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--memory-sessions", type=int, default=3, help="sessions utilisées pour la mesure mémoire")
+    parser.add_argument("--output", help="fichier JSON de résultats")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        port = _configure(args, workdir)
+
+        from mock_api import MockScoringAPI
+        from synthetic_data import generate_clients, model_feature_names
+
+        from credit_dashboard.views import PAGES
+
+        frame = generate_clients(args.clients, model_feature_names(os.path.join(REPO_ROOT, "best_model_lgb_no.pkl")))
+        frame.to_csv(os.environ["CLIENTS_DATA_PATH"], index=False)
+        client_ids = frame["SK_ID_CURR"].tolist()
+
+        # Les pages lisent l'image d'accueil et le modèle en chemin relatif
+        os.chdir(REPO_ROOT)
+        with MockScoringAPI(frame, port=port, latency=args.latency, jitter=args.jitter):
+            memory = measure_memory(PAGES, client_ids, args.memory_sessions)
+            timings, elapsed, errors = run_load(PAGES, client_ids, args.users, args.iterations)
+
+    pages = summarize(timings)
+    total_runs = sum(row["runs"] for row in pages.values())
+    report = {
+        "users": args.users, "iterations": args.iterations, "clients": args.clients,
+        "latency_s": args.latency, "elapsed_s": elapsed, "throughput_runs_per_s": total_runs / elapsed,
+        "memory": memory, "pages": pages, "errors": errors,
+    }
+
+    print(f"{args.users} sessions x {args.iterations} parcours, API simulée à {args.latency * 1000:.0f} ms, {args.clients} clients")
+    print(f"{'Page':<32}{'exécutions':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for page, row in pages.items():
+        print(f"{page:<32}{row['runs']:>11}{row['p50_ms']:>10.0f}{row['p95_ms']:>10.0f}{row['p99_ms']:>10.0f}")
+    print(f"Débit : {report['throughput_runs_per_s']:.1f} exécutions/s ({total_runs} en {elapsed:.1f} s)")
+    print(f"Mémoire par session : {memory['per_session_mb']:.2f} Mo (pic {memory['peak_mb']:.1f} Mo)")
+    if errors:
+        print(f"{len(errors)} erreur(s) : {errors[:3]}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+################## API de scoring simulée pour les benchmarks ########################
+"""
+Remplaçant local de l'API projet7-1, avec latence configurable.
+Les scores et valeurs SHAP sont pseudo-aléatoires mais stables pour un client donné.
+
+    python benchmarks/mock_api.py --data clients_data.csv --port 8000 --latency 0.05 --jitter 0.02
+    API_URL=http://127.0.0.1:8000 SCORING_MODE=remote streamlit run FIFI_Nelly_1_dashboard_122024.py
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_dashboard.config import ID_COLUMN  # noqa: E402
+
+
+class MockScoringData:
+    """Réponses des six endpoints de l'API, calculées à partir d'une population clients."""
+
+    def __init__(self, frame):
+        frame = frame.drop(columns=["default_status"], errors="ignore")
+        self.client_ids = frame[ID_COLUMN].astype(np.int64).tolist()
+        self.feature_names = [name for name in frame.columns if name != ID_COLUMN]
+        self.positions = {client_id: position for position, client_id in enumerate(self.client_ids)}
+        self.values = frame[self.feature_names].to_numpy(np.float64)
+        self.next_id = max(self.client_ids, default=0) + 1
+        self._lock = threading.Lock()
+        weights = np.random.default_rng(0).exponential(0.05, len(self.feature_names))
+        self.global_importances = [
+            {"Feature": name, "Global Importance": float(weight)}
+            for name, weight in sorted(zip(self.feature_names, weights), key=lambda item: -item[1])
+        ]
+
+    def _score(self, seed, client_info=None):
+        rng = np.random.default_rng(seed)
+        response = {
+            "probability_of_default": float(rng.beta(1.2, 12)),
+            "shap_values": rng.normal(0, 0.05, len(self.feature_names)).tolist(),
+            "feature_names": self.feature_names,
+        }
+        if client_info is not None:
+            response["client_info"] = client_info
+        return response
+
+    def _client_info(self, position):
+        row = self.values[position]
+        return {name: (None if np.isnan(value) else float(value)) for name, value in zip(self.feature_names, row)}
+
+    def get_client_ids(self):
+        return {"client_ids": self.client_ids}
+
+    def get_next_client_id(self):
+        with self._lock:
+            self.next_id += 1
+            return {"next_id": self.next_id - 1}
+
+    def get_global_importance(self):
+        return {"global_importances": self.global_importances}
+
+    def predict(self, payload):
+        position = self.positions.get(int(payload.get(ID_COLUMN, -1)))
+        if position is None:
+            return None
+        return self._score(position, self._client_info(position))
+
+    def predict_with_custom_values(self, payload):
+        if int(payload.get(ID_COLUMN, -1)) not in self.positions:
+            return None
+        return self._score(zlib.crc32(json.dumps(payload, sort_keys=True).encode()))
+
+    def predict_new_client(self, payload):
+        return self._score(zlib.crc32(json.dumps(payload, sort_keys=True).encode()))
+
+
+def make_handler(data, latency, jitter):
+    routes = {
+        ("GET", "/get_client_ids"): lambda payload: data.get_client_ids(),
+        ("GET", "/get_next_client_id"): lambda payload: data.get_next_client_id(),
+        ("GET", "/get_global_importance"): lambda payload: data.get_global_importance(),
+        ("POST", "/predict"): data.predict,
+        ("POST", "/predict_with_custom_values"): data.predict_with_custom_values,
+        ("POST", "/predict_new_client"): data.predict_new_client,
+    }
+    rng = np.random.default_rng()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _handle(self, method):
+            route = routes.get((method, self.path.split("?")[0]))
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if route is None:
+                self._send(404, {"detail": "Not Found"})
+                return
+            # Latence simulée du service distant
+            time.sleep(max(0.0, latency + jitter * rng.standard_normal()))
+            try:
+                result = route(json.loads(body) if body else {})
+            except (ValueError, TypeError):
+                self._send(422, {"detail": "Requête invalide"})
+                return
+            if result is None:
+                self._send(404, {"detail": "Client non trouvé"})
+            else:
+                self._send(200, result)
+
+        def _send(self, status, content):
+            body = json.dumps(content).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class MockScoringAPI:
+    """Serveur HTTP dans un thread d'arrière-plan ; utilisable comme gestionnaire de contexte."""
+
+    def __init__(self, frame, host="127.0.0.1", port=0, latency=0.05, jitter=0.0):
+        self.server = ThreadingHTTPServer((host, port), make_handler(MockScoringData(frame), latency, jitter))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="clients_data.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05, help="latence moyenne par requête (secondes)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="écart-type de la latence (secondes)")
+    args = parser.parse_args()
+
+    api = MockScoringAPI(pd.read_csv(args.data), args.host, args.port, args.latency, args.jitter)
+    print(f"API simulée sur {api.url} (latence {args.latency}s ± {args.jitter}s)")
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+################## Mesure du démarrage à froid du dashboard ########################
+"""
+Temps jusqu'au premier affichage d'une page, dans un processus Python neuf à chaque répétition.
+
+    python benchmarks/startup_benchmark.py --page Accueil --repeat 5
+
+Pour comparer avec une autre version, lancer le script depuis une copie de cette version
+(git worktree) avec --script pointant vers son dashboard.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPT = os.path.join(REPO_ROOT, "FIFI_Nelly_1_dashboard_122024.py")
+
+# Bibliothèques dont on vérifie le chargement au premier affichage
+HEAVY_MODULES = ["pandas", "plotly.graph_objects", "requests", "joblib", "lightgbm", "sklearn", "pyarrow", "matplotlib", "seaborn"]
+
+# Exécuté dans un sous-processus : Streamlit est déjà importé, comme dans un serveur démarré
+_CHILD = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+from streamlit.testing.v1 import AppTest
+
+script, page, heavy = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+app = AppTest.from_file(script, default_timeout=300)
+app.query_params["page"] = page
+start = time.perf_counter()
+app.run()
+first_paint = time.perf_counter() - start
+loaded = [name for name in heavy if name in sys.modules]
+start = time.perf_counter()
+app.run()
+rerun = time.perf_counter() - start
+print(json.dumps({"first_paint": first_paint, "rerun": rerun, "loaded": loaded,
+                  "exceptions": [str(error.value) for error in app.exception]}))
+"""
+
+
+def run_once(script, page, env):
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD, script, page, json.dumps(HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(script)), env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--page", default="Accueil")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warm-up", action="store_true", help="laisser le préchargement en arrière-plan actif")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(args.script)), env.get("PYTHONPATH")]))
+    if not args.warm_up:
+        env["DASHBOARD_WARM_UP"] = "0"
+
+    runs = [run_once(args.script, args.page, env) for _ in range(args.repeat)]
+    first_paint = [run["first_paint"] for run in runs]
+    rerun = [run["rerun"] for run in runs]
+    print(f"Script : {args.script}")
+    print(f"Page : {args.page} ({args.repeat} démarrages à froid)")
+    print(f"Premier affichage : médiane {statistics.median(first_paint):.3f} s, min {min(first_paint):.3f} s, max {max(first_paint):.3f} s")
+    print(f"Réexécution : médiane {statistics.median(rerun):.3f} s")
+    print(f"Bibliothèques chargées au premier affichage : {', '.join(runs[0]['loaded']) or 'aucune'}")
+    if runs[0]["exceptions"]:
+        print(f"Erreurs : {runs[0]['exceptions']}")
+
+
+if __name__ == "__main__":
+    main()
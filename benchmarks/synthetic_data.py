@@ -0,0 +1,76 @@
+################## Population clients synthétique pour les benchmarks ########################
+"""
+Génère un CSV au format clients_data.csv (SK_ID_CURR, variables du modèle, default_status).
+
+    python benchmarks/synthetic_data.py --clients 300000 --output clients_data.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_dashboard.config import ID_COLUMN, MODEL_PATH  # noqa: E402
+
+FIRST_CLIENT_ID = 100002
+
+# Part des clients en défaut, proche de celle du jeu Home Credit
+DEFAULT_RATE = 0.08
+
+# Valeur utilisée par Home Credit pour les personnes sans emploi
+UNEMPLOYED_DAYS = 365243
+
+
+def model_feature_names(model_path=MODEL_PATH):
+    """Variables attendues par le modèle embarqué."""
+    import joblib
+
+    return list(joblib.load(model_path).feature_name_)
+
+
+def generate_clients(n_clients, feature_names, seed=42):
+    """Population aléatoire aux distributions plausibles pour les variables connues, uniformes sinon."""
+    rng = np.random.default_rng(seed)
+    columns = {ID_COLUMN: np.arange(FIRST_CLIENT_ID, FIRST_CLIENT_ID + n_clients, dtype=np.int64)}
+    female = rng.random(n_clients) < 0.65
+    known = {
+        "CODE_GENDER_F": female.astype(np.int64),
+        "CODE_GENDER_M": (~female).astype(np.int64),
+        "CNT_CHILDREN": rng.poisson(0.4, n_clients),
+        "AMT_INCOME_TOTAL": np.round(rng.lognormal(11.9, 0.5, n_clients), 2),
+        "AMT_CREDIT": np.round(rng.lognormal(13.1, 0.7, n_clients), 2),
+        "AMT_GOODS_PRICE": np.round(rng.lognormal(13.0, 0.7, n_clients), 2),
+        "DAYS_BIRTH": -rng.integers(21 * 365, 69 * 365, n_clients),
+        "DAYS_EMPLOYED": np.where(rng.random(n_clients) < 0.18, UNEMPLOYED_DAYS, -rng.integers(0, 40 * 365, n_clients)),
+    }
+    for name in feature_names:
+        if name in known:
+            columns[name] = known[name]
+        elif name.startswith(("FLAG_", "REG_", "LIVE_")) or name.endswith(("_F", "_M")) or "_XNA" in name:
+            columns[name] = (rng.random(n_clients) < 0.3).astype(np.int64)
+        else:
+            values = rng.random(n_clients)
+            values[rng.random(n_clients) < 0.1] = np.nan
+            columns[name] = values
+    columns["default_status"] = (rng.random(n_clients) < DEFAULT_RATE).astype(np.int64)
+    return pd.DataFrame(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50000)
+    parser.add_argument("--output", default="clients_data.csv")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = generate_clients(args.clients, model_feature_names(args.model), args.seed)
+    frame.to_csv(args.output, index=False)
+    print(f"{len(frame)} clients, {frame.shape[1]} colonnes -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
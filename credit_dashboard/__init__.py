@@ -0,0 +1 @@
+"""Briques partagées du dashboard de simulation de risque de crédit."""
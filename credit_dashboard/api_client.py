@@ -0,0 +1,220 @@
+################## Client HTTP partagé pour l'API de scoring ########################
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from credit_dashboard.config import (
+    API_CACHE_SIZE,
+    API_CACHE_TTL,
+    API_POOL_SIZE,
+    API_RETRIES,
+    API_TIMEOUT,
+    API_URL,
+)
+from credit_dashboard.metrics import metrics
+
+
+@dataclass
+class ApiResult:
+    """Réponse de l'API : code HTTP, contenu JSON décodé et provenance (cache ou réseau)."""
+
+    status_code: int
+    data: Any = None
+    cached: bool = False
+
+    @property
+    def ok(self):
+        return self.status_code == 200
+
+
+class TTLCache:
+    """Cache LRU dont les entrées expirent après `ttl` secondes."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+
+class ApiClient:
+    """
+    Client unique vers l'API de scoring : pool de connexions keep-alive,
+    timeouts, nouvelles tentatives avec backoff et cache des réponses.
+    """
+
+    def __init__(self, base_url=API_URL, timeout=API_TIMEOUT, retries=API_RETRIES,
+                 pool_size=API_POOL_SIZE, cache_size=API_CACHE_SIZE, cache_ttl=API_CACHE_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = TTLCache(cache_size, cache_ttl)
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Endpoints batch dont l'absence a été constatée (404/405) : on ne les rappelle plus
+        self._unsupported = set()
+        # Requêtes identiques en cours : les appels concurrents partagent la même réponse
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(method, endpoint, payload):
+        return method, endpoint, json.dumps(payload, sort_keys=True, default=str)
+
+    def request(self, method, endpoint, payload=None, use_cache=True):
+        """Appelle `endpoint` et retourne un `ApiResult` ; seules les réponses 200 sont mises en cache."""
+        key = self._cache_key(method, endpoint, payload)
+        if use_cache:
+            data = self.cache.get(key)
+            if data is not None:
+                metrics.increment("api_requests_total", endpoint=endpoint, status=200, cached=True)
+                return ApiResult(200, data, cached=True)
+            with self._inflight_lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = Future()
+            if pending is not None:
+                return pending.result()
+            # En cas d'exception, les appels en attente reçoivent un échec réseau
+            result = ApiResult(0)
+            try:
+                result = self._timed_send(method, endpoint, payload)
+                if result.ok:
+                    self.cache.set(key, result.data)
+            finally:
+                with self._inflight_lock:
+                    pending = self._inflight.pop(key)
+                pending.set_result(result)
+            return result
+        return self._timed_send(method, endpoint, payload)
+
+    def _timed_send(self, method, endpoint, payload):
+        start = time.perf_counter()
+        result = self._send(method, endpoint, payload)
+        metrics.observe("api_request_seconds", time.perf_counter() - start, endpoint=endpoint, status=result.status_code)
+        metrics.increment("api_requests_total", endpoint=endpoint, status=result.status_code, cached=False)
+        return result
+
+    def _send(self, method, endpoint, payload):
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{endpoint}", json=payload, timeout=self.timeout
+            )
+        except requests.RequestException:
+            return ApiResult(0)
+        if response.status_code != 200:
+            return ApiResult(response.status_code)
+        try:
+            return ApiResult(200, response.json())
+        except ValueError:
+            return ApiResult(0)
+
+    def get(self, endpoint, use_cache=True):
+        return self.request("GET", endpoint, use_cache=use_cache)
+
+    def post(self, endpoint, payload, use_cache=True):
+        return self.request("POST", endpoint, payload, use_cache=use_cache)
+
+    ##### endpoints de l'API
+    def get_client_ids(self):
+        result = self.get("/get_client_ids")
+        return result.data.get("client_ids", []) if result.ok else []
+
+    def predict(self, client_id):
+        return self.post("/predict", {"SK_ID_CURR": client_id})
+
+    def predict_with_custom_values(self, payload):
+        return self.post("/predict_with_custom_values", payload)
+
+    def predict_new_client(self, payload):
+        return self.post("/predict_new_client", payload)
+
+    def get_next_client_id(self):
+        # Jamais mis en cache : chaque appel doit réserver un nouvel identifiant
+        return self.get("/get_next_client_id", use_cache=False)
+
+    def get_global_importance(self):
+        return self.get("/get_global_importance")
+
+    def _post_batch(self, endpoint, payload):
+        """Appel à un endpoint batch ; retourne None si l'API ne le propose pas."""
+        if endpoint in self._unsupported:
+            return None
+        result = self.post(endpoint, payload, use_cache=False)
+        if result.status_code in (404, 405):
+            self._unsupported.add(endpoint)
+            return None
+        return result
+
+    def predict_batch(self, client_ids):
+        return self._post_batch("/predict_batch", {"SK_ID_CURR": list(client_ids)})
+
+    def predict_new_client_batch(self, records):
+        return self._post_batch("/predict_new_client_batch", {"clients": list(records)})
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_api_client():
+    """Client unique, partagé par toutes les sessions et toutes les pages."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient()
+        return _client
@@ -0,0 +1,137 @@
+################## Scoring par lot ########################
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from credit_dashboard.config import BATCH_CHUNK_SIZE, BATCH_MAX_WORKERS, ID_COLUMN, OPTIMAL_THRESHOLD
+
+# Colonnes attendues par /predict_new_client
+NEW_CLIENT_COLUMNS = [
+    ID_COLUMN,
+    "CODE_GENDER_F",
+    "CODE_GENDER_M",
+    "DAYS_BIRTH",
+    "CNT_CHILDREN",
+    "AMT_INCOME_TOTAL",
+    "AMT_GOODS_PRICE",
+    "AMT_CREDIT",
+]
+
+RESULT_COLUMNS = [ID_COLUMN, "probability_of_default", "decision", "status"]
+
+
+def chunked(items, size):
+    """Découpe une liste en blocs de `size` éléments."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def decision_label(probability, threshold=OPTIMAL_THRESHOLD):
+    # Pas de décision sans probabilité (NaN dans une colonne float si une partie du bloc a échoué)
+    if pd.isna(probability):
+        return None
+    return "Refusé" if probability >= threshold else "Accordé"
+
+
+def parse_client_ids(text):
+    """Extrait les identifiants d'un texte libre (séparés par virgules, espaces ou retours à la ligne)."""
+    tokens = text.replace(",", " ").replace(";", " ").split()
+    return list(dict.fromkeys(int(token) for token in tokens if token.isdigit()))
+
+
+def _status(client_id, predictions, errors):
+    if client_id in errors:
+        return errors[client_id]
+    if client_id not in predictions:
+        return "erreur"
+    # Identifiant renvoyé sans probabilité : client inconnu du modèle
+    return "ok" if not pd.isna(predictions[client_id]) else "client introuvable"
+
+
+def _rows(client_ids, predictions, errors=None):
+    errors = errors or {}
+    return [
+        {
+            ID_COLUMN: client_id,
+            "probability_of_default": predictions.get(client_id),
+            "status": _status(client_id, predictions, errors),
+        }
+        for client_id in client_ids
+    ]
+
+
+def _score_chunk_existing(api, chunk):
+    """Score un bloc de clients existants : endpoint batch, sinon un appel /predict par client."""
+    result = api.predict_batch(chunk)
+    if result is not None:
+        if not result.ok:
+            return _rows(chunk, {}, {client_id: f"HTTP {result.status_code}" for client_id in chunk})
+        predictions = {
+            item[ID_COLUMN]: item.get("probability_of_default")
+            for item in result.data.get("predictions", [])
+        }
+        return _rows(chunk, predictions)
+    predictions, errors = {}, {}
+    for client_id in chunk:
+        response = api.predict(client_id)
+        if response.ok:
+            predictions[client_id] = response.data.get("probability_of_default")
+        else:
+            errors[client_id] = f"HTTP {response.status_code}"
+    return _rows(chunk, predictions, errors)
+
+
+def _score_chunk_new(api, records):
+    """Score un bloc de nouveaux clients : endpoint batch, sinon un appel /predict_new_client par ligne."""
+    chunk = [record[ID_COLUMN] for record in records]
+    result = api.predict_new_client_batch(records)
+    if result is not None:
+        if not result.ok:
+            return _rows(chunk, {}, {client_id: f"HTTP {result.status_code}" for client_id in chunk})
+        predictions = {
+            item[ID_COLUMN]: item.get("probability_of_default")
+            for item in result.data.get("predictions", [])
+        }
+        return _rows(chunk, predictions)
+    predictions, errors = {}, {}
+    for record in records:
+        response = api.predict_new_client(record)
+        if response.ok:
+            predictions[record[ID_COLUMN]] = response.data.get("probability_of_default")
+        else:
+            errors[record[ID_COLUMN]] = f"HTTP {response.status_code}"
+    return _rows(chunk, predictions, errors)
+
+
+def _run(score_chunk, api, chunks, max_workers, threshold):
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(score_chunk, api, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            frame = pd.DataFrame(future.result())
+            frame["decision"] = frame["probability_of_default"].map(lambda p: decision_label(p, threshold))
+            yield frame[RESULT_COLUMNS]
+    finally:
+        # Générateur fermé avant la fin (page relancée, erreur) : les blocs non démarrés sont abandonnés
+        executor.shutdown(cancel_futures=True)
+
+
+def score_existing_clients(api, client_ids, chunk_size=BATCH_CHUNK_SIZE,
+                           max_workers=BATCH_MAX_WORKERS, threshold=OPTIMAL_THRESHOLD):
+    """
+    Score une liste de SK_ID_CURR par blocs envoyés en parallèle (au plus `max_workers` à la fois).
+    Génère un DataFrame de résultats par bloc, dans l'ordre de complétion.
+    """
+    chunks = list(chunked(list(client_ids), chunk_size))
+    yield from _run(_score_chunk_existing, api, chunks, max_workers, threshold)
+
+
+def score_new_clients(api, applicants, chunk_size=BATCH_CHUNK_SIZE,
+                      max_workers=BATCH_MAX_WORKERS, threshold=OPTIMAL_THRESHOLD):
+    """Même principe que `score_existing_clients` pour un DataFrame au format /predict_new_client."""
+    missing = [col for col in NEW_CLIENT_COLUMNS if col not in applicants.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes pour /predict_new_client : {missing}")
+    records = applicants[NEW_CLIENT_COLUMNS].to_dict(orient="records")
+    chunks = list(chunked(records, chunk_size))
+    yield from _run(_score_chunk_new, api, chunks, max_workers, threshold)
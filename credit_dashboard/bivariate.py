@@ -0,0 +1,168 @@
+################## Analyse bi-variée adaptée à la taille de la population ########################
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from credit_dashboard.config import (
+    BIVARIATE_DENSITY_BINS,
+    BIVARIATE_SAMPLE_SIZE,
+    BIVARIATE_SCATTER_MAX,
+)
+from credit_dashboard.data_store import get_population_store
+
+HUE_COLUMN = "default_status"
+
+# Stratégies : tous les points, échantillon stratifié, ou carte de densité agrégée
+STRATEGIES = ("scatter", "sample", "density")
+
+# Nombre de paires (feature_x, feature_y) gardées en mémoire
+_CACHE_SIZE = 64
+
+# Nombre minimal de points conservés par classe lors de l'échantillonnage
+_MIN_PER_CLASS = 200
+
+
+@dataclass
+class BivariateView:
+    """Données prêtes à tracer pour un couple de variables."""
+
+    feature_x: str
+    feature_y: str
+    strategy: str
+    total: int
+    x: np.ndarray = None
+    y: np.ndarray = None
+    hue: np.ndarray = None
+    x_edges: np.ndarray = None
+    y_edges: np.ndarray = None
+    counts: np.ndarray = None
+    default_rate: np.ndarray = None
+
+
+def stratified_sample(hue, size, random_state=42):
+    """Indices d'un échantillon respectant les proportions de `hue`, avec un minimum par classe."""
+    rng = np.random.default_rng(random_state)
+    _, inverse, class_counts = np.unique(hue, return_inverse=True, return_counts=True)
+    fraction = size / len(hue)
+    selected = []
+    for code, class_count in enumerate(class_counts):
+        members = np.flatnonzero(inverse == code)
+        quota = min(class_count, max(int(round(class_count * fraction)), _MIN_PER_CLASS))
+        selected.append(rng.choice(members, quota, replace=False))
+    return np.sort(np.concatenate(selected))
+
+
+def compute_view(frame, feature_x, feature_y, strategy=None,
+                 scatter_max=BIVARIATE_SCATTER_MAX, sample_size=BIVARIATE_SAMPLE_SIZE,
+                 bins=BIVARIATE_DENSITY_BINS):
+    """
+    Prépare la vue bi-variée : nuage complet sous `scatter_max` clients,
+    sinon échantillon stratifié sur default_status ou histogramme 2D (NumPy).
+    """
+    x = pd.to_numeric(frame[feature_x], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+    y = pd.to_numeric(frame[feature_y], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+    valid = np.isfinite(x) & np.isfinite(y)
+    hue = frame[HUE_COLUMN].to_numpy()[valid] if HUE_COLUMN in frame.columns else None
+    x, y = x[valid], y[valid]
+    total = len(x)
+
+    if strategy is None or total <= scatter_max:
+        strategy = "scatter" if total <= scatter_max else "sample"
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue : {strategy} (attendu : {STRATEGIES})")
+
+    if strategy == "scatter":
+        return BivariateView(feature_x, feature_y, strategy, total, x=x, y=y, hue=hue)
+    if strategy == "sample":
+        if hue is None:
+            indices = np.sort(np.random.default_rng(42).choice(total, min(sample_size, total), replace=False))
+        else:
+            indices = stratified_sample(hue, min(sample_size, total))
+        return BivariateView(
+            feature_x, feature_y, strategy, total,
+            x=x[indices], y=y[indices], hue=None if hue is None else hue[indices],
+        )
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    default_rate = None
+    if hue is not None:
+        defaults, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=hue.astype(np.float64))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            default_rate = np.where(counts > 0, defaults / counts, np.nan)
+    return BivariateView(
+        feature_x, feature_y, strategy, total,
+        x_edges=x_edges, y_edges=y_edges, counts=counts, default_rate=default_rate,
+    )
+
+
+def view_figure(view):
+    """Figure Plotly interactive correspondant à une `BivariateView`."""
+    title = f"Analyse bi-variée : {view.feature_x} vs {view.feature_y}"
+    if view.strategy == "density":
+        x_centers = (view.x_edges[:-1] + view.x_edges[1:]) / 2
+        y_centers = (view.y_edges[:-1] + view.y_edges[1:]) / 2
+        z = np.where(view.counts > 0, view.counts, np.nan).T
+        customdata = None if view.default_rate is None else view.default_rate.T
+        hovertemplate = "x=%{x:.3g}<br>y=%{y:.3g}<br>clients=%{z:.0f}"
+        if customdata is not None:
+            hovertemplate += "<br>taux de défaut=%{customdata:.1%}"
+        fig = go.Figure(go.Heatmap(
+            x=x_centers, y=y_centers, z=z, customdata=customdata,
+            colorscale="Viridis", colorbar={"title": "Clients"},
+            hovertemplate=hovertemplate + "<extra></extra>",
+        ))
+    else:
+        fig = go.Figure()
+        if view.hue is None:
+            fig.add_trace(go.Scattergl(x=view.x, y=view.y, mode="markers", marker={"size": 4, "opacity": 0.6}))
+        else:
+            for value in np.unique(view.hue):
+                mask = view.hue == value
+                fig.add_trace(go.Scattergl(
+                    x=view.x[mask], y=view.y[mask], mode="markers", name=f"{HUE_COLUMN} = {value}",
+                    marker={"size": 4, "opacity": 0.6},
+                ))
+    fig.update_layout(title=title, xaxis_title=view.feature_x, yaxis_title=view.feature_y)
+    return fig
+
+
+class BivariateEngine:
+    """Calcule et garde en mémoire (LRU) les vues bi-variées, par version des données."""
+
+    def __init__(self, store=None, cache_size=_CACHE_SIZE):
+        self.store = store if store is not None else get_population_store()
+        self.cache_size = cache_size
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def view(self, feature_x, feature_y, strategy=None):
+        key = (self.store.version, feature_x, feature_y, strategy)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+        columns = [feature_x, feature_y]
+        if HUE_COLUMN in self.store.columns:
+            columns.append(HUE_COLUMN)
+        view = compute_view(self.store.load(columns), feature_x, feature_y, strategy)
+        with self._lock:
+            self._views[key] = view
+            while len(self._views) > self.cache_size:
+                self._views.popitem(last=False)
+        return view
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_bivariate_engine():
+    """Moteur unique, partagé par toutes les sessions du processus."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = BivariateEngine()
+        return _engine
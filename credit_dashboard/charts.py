@@ -0,0 +1,206 @@
+################## Graphiques Plotly mémorisés ########################
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from credit_dashboard.config import OPTIMAL_THRESHOLD
+from credit_dashboard.metrics import metrics
+
+# Nombre de figures gardées en mémoire pour l'ensemble des sessions
+_CACHE_SIZE = 512
+
+
+class FigureCache:
+    """
+    Cache LRU de spécifications Plotly (dictionnaires JSON), indexé par l'empreinte des données.
+    Les spécifications sont partagées entre sessions : elles ne doivent pas être modifiées.
+    """
+
+    def __init__(self, maxsize=_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._specs:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                return self._specs[key]
+            self.misses += 1
+        spec = build().to_dict()
+        with self._lock:
+            self._specs[key] = spec
+            while len(self._specs) > self.maxsize:
+                self._specs.popitem(last=False)
+        return spec
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._specs),
+            }
+
+
+figure_cache = FigureCache()
+metrics.register_gauge("cache_hit_rate", lambda: figure_cache.stats()["hit_rate"], cache="figures")
+
+
+def input_hash(*parts):
+    """Empreinte stable des entrées d'un graphique (tableaux NumPy, listes, scalaires)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.dtype).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+def _memoize(name, build, *parts):
+    return figure_cache.get_or_build((name, input_hash(*parts)), build)
+
+
+##### jauge de probabilité
+def gauge_figure(prediction, threshold=OPTIMAL_THRESHOLD):
+    def build():
+        return go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=prediction,
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "Probabilité de défaut", 'font': {'size': 24}},
+            gauge={
+                'axis': {'range': [0, 1], 'tickwidth': 1, 'tickcolor': "darkblue"},
+                'bar': {'color': "green" if prediction < threshold else "red"},
+                'steps': [
+                    {'range': [0, threshold], 'color': 'lightgreen'},
+                    {'range': [threshold, 1], 'color': 'lightcoral'}
+                ],
+                'threshold': {
+                    'line': {'color': "blue", 'width': 4},
+                    'thickness': 0.75,
+                    'value': threshold
+                }
+            }
+        ))
+
+    # Clé arrondie : des probabilités quasi identiques, du même côté du seuil, partagent la même jauge
+    prediction = float(prediction)
+    return _memoize("gauge", build, round(prediction, 4), prediction >= threshold, threshold)
+
+
+##### importances SHAP
+def shap_frame(feature_names, shap_values):
+    """Tableau des contributions triées par importance décroissante."""
+    shap_df = pd.DataFrame({'Feature': feature_names, 'Importance': shap_values})
+    return shap_df.sort_values(by='Importance', ascending=False)
+
+
+def shap_top_figure(shap_df_top):
+    def build():
+        # Barres horizontales, la plus importante en haut
+        ordered = shap_df_top.iloc[::-1]
+        fig = go.Figure(go.Bar(
+            x=ordered['Importance'],
+            y=ordered['Feature'],
+            orientation="h",
+            marker={'color': ordered['Importance'], 'colorscale': "Viridis"},
+            text=[f"{imp:.2f}" for imp in ordered['Importance']],
+            textposition="outside",
+        ))
+        fig.update_layout(
+            title="Top 10 des caractéristiques locales importantes (SHAP values)",
+            xaxis_title="Importance",
+            yaxis_title="Caractéristiques",
+            height=500,
+        )
+        return fig
+
+    return _memoize("shap_top", build, shap_df_top['Feature'].tolist(), shap_df_top['Importance'].to_numpy())
+
+
+def comparison_figure(comparison_df):
+    def build():
+        fig = go.Figure([
+            go.Bar(x=comparison_df["Feature"], y=comparison_df["Caracteristiques locale client"],
+                   name="Caracteristiques locale client", marker_color="#1f77b4"),
+            go.Bar(x=comparison_df["Feature"], y=comparison_df["Caracteristiques globales"],
+                   name="Caracteristiques globales", marker_color="#ff7f0e"),
+        ])
+        fig.update_layout(
+            title="Comparaison des caractéristiques locales et globales",
+            barmode="group",
+            xaxis_title="Caractéristiques",
+            yaxis_title="Importance",
+            xaxis_tickangle=-45,
+            height=500,
+        )
+        return fig
+
+    return _memoize(
+        "comparison", build,
+        comparison_df["Feature"].tolist(),
+        comparison_df["Caracteristiques locale client"].to_numpy(),
+        comparison_df["Caracteristiques globales"].to_numpy(),
+    )
+
+
+##### distribution d'une variable
+def distribution_figure(stats, client_value=None, version=None):
+    """Histogramme et KDE précalculés (voir feature_stats), avec la position du client."""
+    def build():
+        fig = go.Figure()
+        if stats.is_numeric:
+            centers = (stats.bin_edges[:-1] + stats.bin_edges[1:]) / 2
+            fig.add_trace(go.Bar(
+                x=centers, y=stats.counts, width=np.diff(stats.bin_edges),
+                marker_color="#1b9e77", opacity=0.6, name="Clients",
+            ))
+            if stats.kde_x is not None:
+                fig.add_trace(go.Scatter(x=stats.kde_x, y=stats.kde_y, mode="lines",
+                                         line_color="#1b9e77", name="Densité"))
+            if client_value is not None:
+                fig.add_vline(x=client_value, line_dash="dash", line_color="red",
+                              annotation_text=f"Client sélectionné ({client_value})")
+        else:
+            fig.add_trace(go.Bar(x=stats.categories, y=stats.counts, marker_color="#1b9e77", opacity=0.6))
+        fig.update_layout(
+            title=f"Répartition de {stats.name}",
+            xaxis_title=stats.name,
+            yaxis_title="Fréquence",
+            bargap=0,
+            showlegend=False,
+        )
+        return fig
+
+    # La version des données identifie la distribution sans hacher les tableaux
+    return _memoize("distribution", build, version or input_hash(stats.counts), stats.name, client_value)
+
+
+##### sensibilité de la prédiction (page "Modification des informations")
+def sensitivity_figure(grid, probabilities, current_value, label, threshold=OPTIMAL_THRESHOLD):
+    def build():
+        fig = go.Figure(go.Scatter(x=grid, y=probabilities, mode="lines", name="Probabilité de défaut"))
+        fig.add_hline(y=threshold, line_dash="dash", line_color="blue", annotation_text="Seuil")
+        fig.add_vline(x=current_value, line_dash="dash", line_color="red", annotation_text="Valeur actuelle")
+        fig.update_layout(
+            title=f"Probabilité de défaut selon {label}",
+            xaxis_title=label,
+            yaxis_title="Probabilité de défaut",
+            yaxis_range=[0, 1],
+        )
+        return fig
+
+    return _memoize("sensitivity", build, np.asarray(grid), np.asarray(probabilities), current_value, label, threshold)
@@ -0,0 +1,146 @@
+################## Index des identifiants clients (recherche, pagination) ########################
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from credit_dashboard.config import API_CACHE_TTL, CLIENT_IDS_RETRY_DELAY
+from credit_dashboard.metrics import metrics
+from credit_dashboard.scoring import get_scoring_service
+
+# Nombre d'identifiants renvoyés par page de résultats
+PAGE_SIZE = 50
+
+
+class ClientIndex:
+    """
+    Identifiants triés dans un tableau NumPy int64.
+    Recherche par préfixe, par intervalle et test d'appartenance en O(log n) par dichotomie ;
+    seules les pages de résultats demandées sont extraites.
+    """
+
+    def __init__(self, client_ids):
+        self.ids = np.unique(np.asarray(client_ids, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, client_id):
+        try:
+            client_id = int(client_id)
+        except (TypeError, ValueError):
+            return False
+        slot = np.searchsorted(self.ids, client_id)
+        return bool(slot < len(self.ids) and self.ids[slot] == client_id)
+
+    def _bounds(self, low, high):
+        """Positions [début, fin) des identifiants compris entre `low` et `high` inclus."""
+        return (int(np.searchsorted(self.ids, low, side="left")),
+                int(np.searchsorted(self.ids, high, side="right")))
+
+    def _prefix_bounds(self, prefix):
+        """
+        Un préfixe décimal correspond, pour chaque nombre de chiffres, à un intervalle d'entiers :
+        "12" -> 12, 120-129, 1200-1299... Les intervalles sont disjoints et croissants.
+        """
+        if not len(self.ids):
+            return []
+        if not prefix:
+            return [(0, len(self.ids))]
+        if not prefix.isdigit() or (prefix.startswith("0") and prefix != "0"):
+            return []
+        value = int(prefix)
+        max_digits = len(str(max(int(self.ids[-1]), 0)))
+        bounds = []
+        for extra_digits in range(max_digits - len(prefix) + 1):
+            scale = 10 ** extra_digits
+            start, stop = self._bounds(value * scale, (value + 1) * scale - 1)
+            if stop > start:
+                bounds.append((start, stop))
+            if value == 0:
+                break
+        return bounds
+
+    @staticmethod
+    def _page(ids, bounds, offset, limit):
+        """Extrait la page [offset, offset + limit) de la concaténation des intervalles."""
+        parts = []
+        for start, stop in bounds:
+            size = stop - start
+            if offset >= size:
+                offset -= size
+                continue
+            taken = ids[start + offset:min(stop, start + offset + limit)]
+            parts.append(taken)
+            limit -= len(taken)
+            offset = 0
+            if limit <= 0:
+                break
+        return np.concatenate(parts) if parts else ids[:0]
+
+    def search(self, prefix="", offset=0, limit=PAGE_SIZE):
+        """Identifiants commençant par `prefix` (page demandée, triée) et nombre total de résultats."""
+        bounds = self._prefix_bounds(prefix.strip())
+        total = sum(stop - start for start, stop in bounds)
+        return self._page(self.ids, bounds, offset, limit), total
+
+    def range(self, low, high, offset=0, limit=PAGE_SIZE):
+        """Identifiants compris entre `low` et `high` inclus (page demandée) et nombre total de résultats."""
+        start, stop = self._bounds(low, high)
+        return self._page(self.ids, [(start, stop)], offset, limit), stop - start
+
+
+##### index partagé, reconstruit à l'expiration du cache de l'API
+_index = None
+_index_expires = 0.0
+# Reconstruction en cours : une seule requête /get_client_ids à la fois pour tout le processus
+_refresh = None
+_index_lock = threading.Lock()
+
+
+def _rebuild(future):
+    """Interroge l'API hors verrou et publie le nouvel index (ou conserve le précédent en cas d'échec)."""
+    global _index, _index_expires, _refresh
+    try:
+        client_ids = get_scoring_service().get_client_ids()
+        index = ClientIndex(client_ids) if len(client_ids) else None
+    except Exception:
+        # Modèle local ou fichier de données absent : même repli qu'une API indisponible
+        metrics.increment("client_index_failures_total")
+        index = None
+    with _index_lock:
+        if index is not None:
+            _index = index
+            _index_expires = time.monotonic() + API_CACHE_TTL
+        else:
+            # Liste vide ou erreur : dernier index valide conservé (vide au premier chargement), nouvel essai plus tard
+            if _index is None:
+                _index = ClientIndex([])
+            _index_expires = time.monotonic() + CLIENT_IDS_RETRY_DELAY
+        _refresh = None
+        index = _index
+    future.set_result(index)
+
+
+def get_client_index():
+    """
+    Index unique, construit à partir de /get_client_ids et partagé par toutes les sessions.
+    À l'expiration, l'index courant reste servi pendant sa reconstruction en arrière-plan ;
+    seul le premier chargement est attendu, et les sessions simultanées attendent la même requête.
+    """
+    global _refresh
+    with _index_lock:
+        current = _index
+        stale = current is None or time.monotonic() >= _index_expires
+        started = stale and _refresh is None
+        if started:
+            _refresh = Future()
+        future = _refresh
+    if current is not None:
+        if started:
+            threading.Thread(target=_rebuild, args=(future,), name="client-index-refresh", daemon=True).start()
+        return current
+    if started:
+        _rebuild(future)
+    return future.result()
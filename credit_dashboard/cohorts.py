@@ -0,0 +1,248 @@
+################## Comparaison d'un client à sa cohorte (agrégats précalculés) ########################
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from credit_dashboard.config import CACHE_DIR
+from credit_dashboard.data_store import get_population_store
+from credit_dashboard.feature_stats import DERIVED_FEATURES, QUANTILE_LEVELS
+
+DEFAULT_COLUMN = "default_status"
+
+
+@dataclass(frozen=True)
+class CohortDimension:
+    """Critère de regroupement : une colonne source découpée en classes par `edges`."""
+
+    name: str
+    label: str
+    source: str
+    edges: tuple
+    labels: tuple
+    transform: object = None
+
+    def codes(self, values):
+        """Numéro de classe de chaque valeur (-1 si manquante)."""
+        values = np.asarray(values, dtype=np.float64)
+        if self.transform is not None:
+            values = self.transform(values)
+        codes = np.searchsorted(np.asarray(self.edges[1:-1]), values, side="right")
+        return np.where(np.isfinite(values), codes, -1)
+
+
+# Critères proposés aux analystes
+COHORT_DIMENSIONS = {
+    dimension.name: dimension
+    for dimension in (
+        CohortDimension("gender", "Sexe", "CODE_GENDER_F", (-np.inf, 0.5, np.inf), ("Homme", "Femme")),
+        CohortDimension(
+            "age_band", "Tranche d'âge", "DAYS_BIRTH", (0, 25, 35, 45, 55, 65, np.inf),
+            ("moins de 25 ans", "25-34 ans", "35-44 ans", "45-54 ans", "55-64 ans", "65 ans et plus"),
+            transform=DERIVED_FEATURES["DAYS_BIRTH"][1],
+        ),
+        CohortDimension(
+            "income_bracket", "Tranche de revenu", "AMT_INCOME_TOTAL", (0, 100000, 150000, 200000, 300000, np.inf),
+            ("moins de 100 k€", "100-150 k€", "150-200 k€", "200-300 k€", "300 k€ et plus"),
+        ),
+        CohortDimension(DEFAULT_COLUMN, "Statut de défaut", DEFAULT_COLUMN, (-np.inf, 0.5, np.inf), ("Sans défaut", "En défaut")),
+    )
+}
+
+
+@dataclass
+class CohortAggregates:
+    """Effectifs, taux de défaut et quantiles d'une variable pour chaque combinaison de classes."""
+
+    feature: str
+    dimensions: tuple
+    counts: np.ndarray
+    default_rate: np.ndarray
+    quantiles: np.ndarray
+
+    @property
+    def shape(self):
+        return tuple(len(COHORT_DIMENSIONS[name].labels) for name in self.dimensions)
+
+    def group(self, codes):
+        """Indice à plat de la cohorte (None si une classe est inconnue)."""
+        if any(code < 0 for code in codes):
+            return None
+        return int(np.ravel_multi_index(tuple(codes), self.shape)) if codes else 0
+
+    def label(self, codes):
+        return ", ".join(COHORT_DIMENSIONS[name].labels[code] for name, code in zip(self.dimensions, codes))
+
+    def percentile(self, group, value):
+        if value is None or not np.isfinite(value) or not self.counts[group]:
+            return None
+        return float(np.interp(value, self.quantiles[group], QUANTILE_LEVELS * 100))
+
+    def to_arrays(self):
+        return {"feature": np.array(self.feature), "dimensions": np.array(self.dimensions, dtype=str),
+                "counts": self.counts, "default_rate": self.default_rate, "quantiles": self.quantiles}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(
+            feature=str(arrays["feature"]),
+            dimensions=tuple(str(name) for name in arrays["dimensions"]),
+            counts=arrays["counts"],
+            default_rate=arrays["default_rate"],
+            quantiles=arrays["quantiles"],
+        )
+
+
+def compute_cohort_aggregates(feature, values, dimensions, codes, defaults=None):
+    """
+    Agrégats de toutes les cohortes en une passe : tri lexicographique (cohorte, valeur),
+    effectifs par bincount, puis quantiles lus directement dans les segments triés.
+    """
+    shape = tuple(len(COHORT_DIMENSIONS[name].labels) for name in dimensions)
+    n_groups = int(np.prod(shape))
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+    for dimension_codes in codes:
+        valid &= dimension_codes >= 0
+    values = values[valid]
+    if codes:
+        groups = np.ravel_multi_index(tuple(dimension_codes[valid] for dimension_codes in codes), shape)
+    else:
+        # Sans critère : une seule cohorte, toute la population
+        groups = np.zeros(len(values), dtype=np.int64)
+
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Interpolation linéaire entre rangs, comme np.quantile, pour toutes les cohortes à la fois
+    positions = (np.maximum(counts, 1) - 1)[:, None] * QUANTILE_LEVELS[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(counts, 1)[:, None] - 1)
+    fraction = positions - lower
+    if len(sorted_values):
+        last = len(sorted_values) - 1
+        low_values = sorted_values[np.minimum(starts[:, None] + lower, last)]
+        high_values = sorted_values[np.minimum(starts[:, None] + upper, last)]
+        quantiles = low_values + (high_values - low_values) * fraction
+    else:
+        quantiles = np.empty((n_groups, len(QUANTILE_LEVELS)))
+    quantiles[counts == 0] = np.nan
+
+    default_rate = np.full(n_groups, np.nan)
+    if defaults is not None:
+        defaulted = np.bincount(groups, weights=np.asarray(defaults, dtype=np.float64)[valid], minlength=n_groups)
+        np.divide(defaulted, counts, out=default_rate, where=counts > 0)
+    return CohortAggregates(
+        feature=feature, dimensions=tuple(dimensions), counts=counts.astype(np.int32),
+        default_rate=default_rate.astype(np.float32), quantiles=quantiles.astype(np.float32),
+    )
+
+
+@dataclass
+class CohortPosition:
+    """Situation d'un client dans sa cohorte pour une variable."""
+
+    label: str
+    count: int
+    default_rate: float
+    median: float
+    value: float
+    percentile: float
+
+
+class CohortEngine:
+    """
+    Agrégats par (variable, critères de cohorte), calculés au premier accès pour une version des données,
+    puis conservés en mémoire et sur disque.
+    """
+
+    def __init__(self, store=None, cache_dir=CACHE_DIR):
+        self.store = store if store is not None else get_population_store()
+        self.cache_dir = cache_dir
+        self._aggregates = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def available_dimensions(self):
+        columns = self.store.columns
+        return [name for name, dimension in COHORT_DIMENSIONS.items() if dimension.source in columns]
+
+    def _values(self, feature, frame):
+        values = pd.to_numeric(frame[feature], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+        if feature in DERIVED_FEATURES:
+            values = DERIVED_FEATURES[feature][1](values)
+        return values
+
+    def _compute(self, feature, dimensions):
+        sources = [COHORT_DIMENSIONS[name].source for name in dimensions]
+        with_defaults = DEFAULT_COLUMN in self.store.columns
+        columns = list(dict.fromkeys([feature, *sources] + ([DEFAULT_COLUMN] if with_defaults else [])))
+        frame = self.store.load(columns)
+        codes = [COHORT_DIMENSIONS[name].codes(frame[COHORT_DIMENSIONS[name].source].to_numpy(np.float64, na_value=np.nan))
+                 for name in dimensions]
+        defaults = frame[DEFAULT_COLUMN].to_numpy(np.float64, na_value=np.nan) if with_defaults else None
+        return compute_cohort_aggregates(feature, self._values(feature, frame), dimensions, codes, defaults)
+
+    def aggregates(self, feature, dimensions):
+        dimensions = tuple(name for name in COHORT_DIMENSIONS if name in dimensions)
+        version = self.store.version
+        key = (feature, dimensions)
+        with self._lock:
+            if version != self._version:
+                self._aggregates = {}
+                self._version = version
+            if key in self._aggregates:
+                return self._aggregates[key]
+            directory = os.path.join(self.cache_dir, "cohorts", version[:16])
+            path = os.path.join(directory, f"{feature}__{'-'.join(dimensions) or 'all'}.npz")
+            if os.path.exists(path):
+                with np.load(path, allow_pickle=False) as arrays:
+                    aggregates = CohortAggregates.from_arrays(arrays)
+            else:
+                aggregates = self._compute(feature, dimensions)
+                os.makedirs(directory, exist_ok=True)
+                tmp_path = path + ".tmp.npz"
+                np.savez(tmp_path, **aggregates.to_arrays())
+                os.replace(tmp_path, path)
+            self._aggregates[key] = aggregates
+            return aggregates
+
+    def client_position(self, client_id, feature, dimensions):
+        """Cohorte du client (mêmes classes sur `dimensions`) et son centile pour `feature` ; None si inconnu."""
+        aggregates = self.aggregates(feature, dimensions)
+        position = self.store.locate([client_id])[0]
+        if position < 0:
+            return None
+        sources = [COHORT_DIMENSIONS[name].source for name in aggregates.dimensions]
+        row = self.store.take(list(dict.fromkeys([feature, *sources])), [position])
+        codes = [int(COHORT_DIMENSIONS[name].codes(row[COHORT_DIMENSIONS[name].source].to_numpy(np.float64, na_value=np.nan))[0])
+                 for name in aggregates.dimensions]
+        group = aggregates.group(codes)
+        if group is None:
+            return None
+        value = float(self._values(feature, row)[0])
+        return CohortPosition(
+            label=aggregates.label(codes) or "Toute la population",
+            count=int(aggregates.counts[group]),
+            default_rate=float(aggregates.default_rate[group]),
+            median=float(aggregates.quantiles[group, len(QUANTILE_LEVELS) // 2]),
+            value=value,
+            percentile=aggregates.percentile(group, value),
+        )
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_cohort_engine():
+    """Moteur unique, partagé par toutes les sessions du processus."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = CohortEngine()
+        return _engine
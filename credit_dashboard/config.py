@@ -0,0 +1,99 @@
+################## Configuration partagée du dashboard ########################
+import os
+
+# Fichier source de la population clients
+FILE_PATH = os.environ.get("CLIENTS_DATA_PATH", "clients_data.csv")
+
+# Répertoire des caches sur disque (Parquet, index, statistiques...)
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", ".dashboard_cache")
+
+# Identifiant client
+ID_COLUMN = "SK_ID_CURR"
+
+# Lecture en flux du CSV (mémoire bornée) au-delà de cette taille (Mo) ; 0 pour toujours l'utiliser
+STREAMING_MIN_SIZE_MB = float(os.environ.get("STREAMING_MIN_SIZE_MB", "256"))
+
+# Nombre de lignes par bloc lu et taille de l'échantillon réservoir par colonne
+STREAMING_CHUNK_SIZE = int(os.environ.get("STREAMING_CHUNK_SIZE", "10000"))
+STREAMING_SAMPLE_SIZE = int(os.environ.get("STREAMING_SAMPLE_SIZE", "20000"))
+
+##### API de scoring
+API_URL = os.environ.get("API_URL", "https://projet7-1.onrender.com")
+
+# Délai maximal d'une requête (secondes) et nombre de nouvelles tentatives
+API_TIMEOUT = float(os.environ.get("API_TIMEOUT", "30"))
+API_RETRIES = int(os.environ.get("API_RETRIES", "3"))
+
+# Taille du pool de connexions keep-alive
+API_POOL_SIZE = int(os.environ.get("API_POOL_SIZE", "20"))
+
+# Cache des réponses : nombre d'entrées et durée de vie (secondes)
+API_CACHE_SIZE = int(os.environ.get("API_CACHE_SIZE", "5000"))
+API_CACHE_TTL = float(os.environ.get("API_CACHE_TTL", "600"))
+
+# Délai (secondes) avant de redemander la liste des clients après un échec de l'API
+CLIENT_IDS_RETRY_DELAY = float(os.environ.get("CLIENT_IDS_RETRY_DELAY", "15"))
+
+# Nombre d'appels indépendants exécutés en parallèle pour une page
+API_FANOUT_WORKERS = int(os.environ.get("API_FANOUT_WORKERS", "8"))
+
+# Regroupement des prédictions simultanées (modèle local) : attente maximale (ms) et taille des lots
+GATEWAY_WINDOW_MS = float(os.environ.get("GATEWAY_WINDOW_MS", "5"))
+GATEWAY_MAX_BATCH = int(os.environ.get("GATEWAY_MAX_BATCH", "64"))
+
+##### Scoring
+# Seuil de probabilité au-delà duquel le crédit est refusé
+OPTIMAL_THRESHOLD = 0.08
+
+# Scoring par lot : taille des blocs envoyés à l'API et nombre de blocs en parallèle
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", "200"))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "4"))
+
+##### Scoring local
+# Modèle LightGBM embarqué dans le dépôt
+MODEL_PATH = os.environ.get("MODEL_PATH", "best_model_lgb_no.pkl")
+
+# "remote" : API uniquement, "local" : modèle embarqué uniquement,
+# "auto" : API avec bascule sur le modèle local si elle est lente ou indisponible
+SCORING_MODE = os.environ.get("SCORING_MODE", "auto")
+
+# En mode "auto" : délai accordé à l'API avant bascule, puis durée pendant laquelle on ne la sollicite plus
+FALLBACK_TIMEOUT = float(os.environ.get("FALLBACK_TIMEOUT", "5"))
+FALLBACK_COOLDOWN = float(os.environ.get("FALLBACK_COOLDOWN", "60"))
+
+# Explications SHAP locales : taille des blocs et nombre de threads LightGBM (0 = tous les cœurs)
+EXPLAIN_CHUNK_SIZE = int(os.environ.get("EXPLAIN_CHUNK_SIZE", "5000"))
+EXPLAIN_THREADS = int(os.environ.get("EXPLAIN_THREADS", "0"))
+
+# Nombre maximal de clients utilisés pour précalculer les importances globales
+GLOBAL_IMPORTANCE_SAMPLE = int(os.environ.get("GLOBAL_IMPORTANCE_SAMPLE", "50000"))
+
+##### Analyse bi-variée
+# Au-delà de ce nombre de clients, les points ne sont plus tous tracés
+BIVARIATE_SCATTER_MAX = int(os.environ.get("BIVARIATE_SCATTER_MAX", "5000"))
+
+# Taille de l'échantillon stratifié et résolution de la carte de densité
+BIVARIATE_SAMPLE_SIZE = int(os.environ.get("BIVARIATE_SAMPLE_SIZE", "5000"))
+BIVARIATE_DENSITY_BINS = int(os.environ.get("BIVARIATE_DENSITY_BINS", "80"))
+
+##### Clients similaires
+# Nombre de variables (les plus importantes pour le modèle) et de voisins affichés
+SIMILARITY_FEATURES = int(os.environ.get("SIMILARITY_FEATURES", "16"))
+SIMILARITY_NEIGHBOURS = int(os.environ.get("SIMILARITY_NEIGHBOURS", "5"))
+
+##### Mesures de performance
+# Journalisation JSON de chaque mesure (logger "credit_dashboard.metrics")
+METRICS_LOG = os.environ.get("METRICS_LOG", "0") == "1"
+
+# Nombre d'observations récentes conservées par série pour les centiles
+METRICS_WINDOW = int(os.environ.get("METRICS_WINDOW", "1000"))
+
+# Port de l'export Prometheus (/metrics) ; 0 pour le désactiver
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+
+# Panneau de diagnostic toujours affiché (sinon : paramètre d'URL ?diagnostics=1)
+SHOW_DIAGNOSTICS = os.environ.get("SHOW_DIAGNOSTICS", "0") == "1"
+
+##### Démarrage
+# Préchargement en arrière-plan des pages, des données et du modèle après le premier affichage
+WARM_UP = os.environ.get("DASHBOARD_WARM_UP", "1") == "1"
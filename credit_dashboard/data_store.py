@@ -0,0 +1,253 @@
+################## Stockage colonnaire de la population clients ########################
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from credit_dashboard.config import CACHE_DIR, FILE_PATH, ID_COLUMN, STREAMING_MIN_SIZE_MB
+from credit_dashboard.metrics import metrics
+
+# Taille des blocs lus pour le calcul de l'empreinte du fichier source
+_HASH_BLOCK_SIZE = 1 << 20
+
+# Au-delà de cette proportion de valeurs distinctes, une colonne texte n'est pas catégorisée
+_CATEGORY_MAX_RATIO = 0.5
+
+
+def file_fingerprint(path):
+    """Empreinte SHA-256 du contenu d'un fichier."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def downcast_column(series):
+    """Réduit le type d'une colonne (entiers, float32, catégories) sans perte de valeur."""
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        as_float32 = series.astype(np.float32)
+        # float32 seulement si l'aller-retour est exact : le modèle local doit recevoir les mêmes
+        # valeurs que l'API (un montant comme 1 234 567,89 perdrait ses centimes en float32)
+        if np.array_equal(as_float32.to_numpy(np.float64), series.to_numpy(np.float64), equal_nan=True):
+            return as_float32
+        return series
+    if len(series) and series.nunique(dropna=True) / len(series) <= _CATEGORY_MAX_RATIO:
+        return series.astype("category")
+    return series
+
+
+def downcast_frame(frame):
+    """Applique `downcast_column` à toutes les colonnes d'un DataFrame."""
+    return frame.apply(downcast_column)
+
+
+class PopulationStore:
+    """
+    Accès partagé à la population clients.
+    Le CSV source est converti une seule fois en Parquet typé ; les colonnes sont
+    ensuite chargées à la demande et conservées en mémoire pour tout le processus.
+    Le cache est invalidé dès que la date de modification ou le contenu du CSV change.
+    """
+
+    def __init__(self, source_path=FILE_PATH, cache_dir=CACHE_DIR):
+        self.source_path = source_path
+        self.cache_dir = cache_dir
+        self._lock = threading.RLock()
+        self._signature = None
+        self._fingerprint = None
+        self._parquet_path = None
+        self._schema = []
+        self._num_rows = 0
+        self._columns = {}
+        self._id_order = None
+        self._sorted_ids = None
+        # Profil calculé pendant une conversion en flux (voir credit_dashboard.streaming)
+        self.profile = None
+
+    ##### état du fichier source
+    def available(self):
+        return os.path.exists(self.source_path)
+
+    def _stat_signature(self):
+        stat = os.stat(self.source_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def _meta_path(self):
+        name = os.path.splitext(os.path.basename(self.source_path))[0]
+        return os.path.join(self.cache_dir, f"{name}.meta.json")
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, signature, fingerprint):
+        meta = {
+            "source": os.path.abspath(self.source_path),
+            "mtime_ns": signature[0],
+            "size": signature[1],
+            "sha256": fingerprint,
+        }
+        with open(self._meta_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+
+    ##### synchronisation avec le CSV
+    def refresh(self):
+        """Vérifie le fichier source et reconstruit le cache si nécessaire."""
+        if not self.available():
+            raise FileNotFoundError(self.source_path)
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta = self._read_meta()
+            if (meta.get("mtime_ns"), meta.get("size")) == signature:
+                # Métadonnées à jour : pas besoin de relire tout le fichier
+                fingerprint = meta["sha256"]
+            else:
+                fingerprint = file_fingerprint(self.source_path)
+            parquet_path = os.path.join(self.cache_dir, f"population-{fingerprint[:16]}.parquet")
+            if not os.path.exists(parquet_path):
+                self._convert(parquet_path)
+            else:
+                self.profile = None
+            self._write_meta(signature, fingerprint)
+            self._open(parquet_path)
+            self._signature = signature
+            self._fingerprint = fingerprint
+
+    def _convert(self, parquet_path):
+        if os.path.getsize(self.source_path) >= STREAMING_MIN_SIZE_MB * 2**20:
+            # Gros fichier : lecture par blocs, statistiques calculées au passage
+            from credit_dashboard.streaming import convert_csv_streaming
+
+            self.profile, report = convert_csv_streaming(self.source_path, parquet_path)
+            metrics.observe("population_convert_seconds", report.seconds, mode="streaming")
+            metrics.set_gauge("population_convert_max_rss_mb", report.max_rss_after_mb, mode="streaming")
+            return
+        self.profile = None
+        with metrics.timer("population_convert_seconds", mode="eager"):
+            frame = downcast_frame(pd.read_csv(self.source_path))
+            tmp_path = parquet_path + ".tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, parquet_path)
+
+    def _open(self, parquet_path):
+        import pyarrow.parquet as pq
+
+        metadata = pq.read_metadata(parquet_path)
+        self._parquet_path = parquet_path
+        self._schema = list(metadata.schema.names)
+        self._num_rows = metadata.num_rows
+        self._columns = {}
+        self._id_order = None
+        self._sorted_ids = None
+
+    ##### accès aux données
+    @property
+    def version(self):
+        """Empreinte du fichier source, utilisable comme clé de cache."""
+        self.refresh()
+        return self._fingerprint
+
+    @property
+    def columns(self):
+        self.refresh()
+        return list(self._schema)
+
+    @property
+    def num_rows(self):
+        self.refresh()
+        return self._num_rows
+
+    def feature_names(self):
+        """Colonnes analysables (toutes sauf l'identifiant client)."""
+        return [col for col in self.columns if col != ID_COLUMN]
+
+    def _ensure_loaded(self, columns):
+        """Lit depuis le Parquet les colonnes pas encore en mémoire."""
+        self.refresh()
+        columns = list(dict.fromkeys(columns))
+        unknown = [col for col in columns if col not in self._schema]
+        if unknown:
+            raise KeyError(f"Colonnes absentes de la population : {unknown}")
+        with self._lock:
+            missing = [col for col in columns if col not in self._columns]
+            if missing:
+                loaded = pd.read_parquet(self._parquet_path, columns=missing)
+                for col in missing:
+                    self._columns[col] = loaded[col]
+        return columns
+
+    def load(self, columns):
+        """Retourne un DataFrame limité aux colonnes demandées."""
+        columns = self._ensure_loaded(columns)
+        with self._lock:
+            return pd.DataFrame({col: self._columns[col] for col in columns})
+
+    def column(self, name):
+        return self.load([name])[name]
+
+    def _id_lookup(self):
+        """Identifiants triés et permutation associée, construits une fois par version."""
+        self.refresh()
+        with self._lock:
+            if self._sorted_ids is None:
+                ids = self.column(ID_COLUMN).to_numpy(np.int64)
+                order = np.argsort(ids, kind="stable")
+                self._id_order = order
+                self._sorted_ids = ids[order]
+            return self._sorted_ids, self._id_order
+
+    def locate(self, client_ids):
+        """Positions des clients dans la population (-1 si absent), par recherche dichotomique."""
+        sorted_ids, order = self._id_lookup()
+        client_ids = np.atleast_1d(np.asarray(client_ids, dtype=np.int64))
+        if not len(sorted_ids):
+            return np.full(len(client_ids), -1)
+        slots = np.minimum(np.searchsorted(sorted_ids, client_ids), len(sorted_ids) - 1)
+        return np.where(sorted_ids[slots] == client_ids, order[slots], -1)
+
+    def take(self, columns, positions):
+        """Lignes `positions` des colonnes demandées, sans recopier les colonnes entières."""
+        columns = self._ensure_loaded(columns)
+        with self._lock:
+            return pd.DataFrame({col: self._columns[col].to_numpy()[positions] for col in columns})
+
+    def take_array(self, columns, positions, dtype=np.float64):
+        """Comme `take`, mais sous forme de matrice NumPy (colonnes numériques uniquement)."""
+        columns = self._ensure_loaded(columns)
+        positions = np.asarray(positions)
+        matrix = np.empty((len(positions), len(columns)), dtype=dtype)
+        with self._lock:
+            for index, col in enumerate(columns):
+                # Vue sur la colonne en mémoire : seules les lignes demandées sont converties
+                matrix[:, index] = self._columns[col].to_numpy()[positions]
+        return matrix
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_population_store():
+    """Instance unique du stockage, partagée par toutes les sessions du processus."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PopulationStore()
+        return _store
@@ -0,0 +1,36 @@
+################## Appels indépendants exécutés en parallèle ########################
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from credit_dashboard.config import API_FANOUT_WORKERS
+
+# Les tâches ne doivent jamais appeler st.* : seul le thread du script peut écrire dans la page
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Pool unique, partagé par toutes les sessions du processus."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=API_FANOUT_WORKERS, thread_name_prefix="api-fanout")
+        return _executor
+
+
+def submit(call, *args, **kwargs):
+    """Lance `call` en arrière-plan et retourne un Future ; la page affiche le reste en attendant."""
+    return get_executor().submit(call, *args, **kwargs)
+
+
+def gather(*calls):
+    """
+    Exécute des appels sans argument en parallèle et retourne leurs résultats dans l'ordre.
+    La durée totale est celle de l'appel le plus lent ; le premier est exécuté dans le thread courant.
+    """
+    if not calls:
+        return []
+    futures = [submit(call) for call in calls[1:]]
+    results = [calls[0]()]
+    results.extend(future.result() for future in futures)
+    return results
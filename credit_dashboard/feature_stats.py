@@ -0,0 +1,226 @@
+################## Statistiques de distribution précalculées par variable ########################
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from credit_dashboard.config import CACHE_DIR
+from credit_dashboard.data_store import get_population_store
+
+# Nombre de bins maximal des histogrammes et nombre de points des courbes KDE
+MAX_BINS = 60
+KDE_POINTS = 256
+
+# En dessous de ce nombre de valeurs distinctes, une variable numérique est traitée comme discrète
+DISCRETE_MAX_VALUES = 30
+
+# Version du calcul : incrémentée quand il change, pour ne pas relire des statistiques obsolètes
+STATS_FORMAT = 2
+
+# Quantiles conservés (0 %, 1 %, ..., 100 %) pour situer un client en temps constant
+QUANTILE_LEVELS = np.linspace(0, 1, 101)
+
+
+def days_to_years(days):
+    return np.abs(days) // 365
+
+
+def days_employed_to_years(days):
+    # Les valeurs positives correspondent aux personnes sans emploi
+    days = np.asarray(days, dtype=np.float64)
+    return np.where(days < 0, np.abs(days) // 365, np.nan)
+
+
+# Variables dérivées : variable source -> (nom affiché, transformation vectorisée)
+DERIVED_FEATURES = {
+    "DAYS_BIRTH": ("AGE", days_to_years),
+    "DAYS_EMPLOYED": ("YEARS_EMPLOYED", days_employed_to_years),
+}
+
+
+def derived_name(feature):
+    return DERIVED_FEATURES[feature][0] if feature in DERIVED_FEATURES else feature
+
+
+def transform_value(feature, value):
+    """Applique à la valeur d'un client la même transformation que pour la population."""
+    if value is None or feature not in DERIVED_FEATURES:
+        return value
+    transformed = float(DERIVED_FEATURES[feature][1](np.float64(value)))
+    return None if np.isnan(transformed) else transformed
+
+
+@dataclass
+class FeatureStats:
+    """Distribution résumée d'une variable : histogramme, KDE, quantiles et moments."""
+
+    name: str
+    kind: str
+    count: int
+    missing: int
+    mean: float = np.nan
+    std: float = np.nan
+    bin_edges: np.ndarray = None
+    counts: np.ndarray = None
+    kde_x: np.ndarray = None
+    kde_y: np.ndarray = None
+    quantiles: np.ndarray = None
+    categories: np.ndarray = None
+
+    @property
+    def is_numeric(self):
+        return self.kind == "numeric"
+
+    def percentile(self, value):
+        """Rang centile d'une valeur dans la population (recherche sur les quantiles précalculés)."""
+        if not self.is_numeric or value is None or not self.count:
+            return None
+        return float(np.interp(value, self.quantiles, QUANTILE_LEVELS * 100))
+
+    def to_arrays(self):
+        arrays = {"name": np.array(self.name), "kind": np.array(self.kind),
+                  "count": np.array(self.count), "missing": np.array(self.missing),
+                  "mean": np.array(self.mean), "std": np.array(self.std)}
+        for field in ("bin_edges", "counts", "kde_x", "kde_y", "quantiles", "categories"):
+            value = getattr(self, field)
+            if value is not None:
+                arrays[field] = value
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        values = {key: arrays[key] for key in arrays.files}
+        return cls(
+            name=str(values.pop("name")),
+            kind=str(values.pop("kind")),
+            count=int(values.pop("count")),
+            missing=int(values.pop("missing")),
+            mean=float(values.pop("mean")),
+            std=float(values.pop("std")),
+            **values,
+        )
+
+
+def gaussian_kde_binned(values, grid_min, grid_max, points=KDE_POINTS):
+    """
+    KDE gaussienne par discrétisation : histogramme fin puis convolution par le noyau.
+    Coût en O(n + points²), quelle que soit la taille de la population.
+    """
+    n = len(values)
+    if n < 2:
+        return None, None
+    std = values.std(ddof=1)
+    if std == 0 or grid_max <= grid_min:
+        return None, None
+    # Règle de Scott (facteur n^(-1/5) appliqué à l'écart-type), comme seaborn avec scipy.stats.gaussian_kde
+    bandwidth = std * n ** (-1 / 5)
+    pad = 3 * bandwidth
+    grid = np.linspace(grid_min - pad, grid_max + pad, points)
+    step = grid[1] - grid[0]
+    binned, _ = np.histogram(values, bins=points, range=(grid[0] - step / 2, grid[-1] + step / 2))
+    offsets = (np.arange(points) - (points - 1) / 2) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    density = np.convolve(binned, kernel, mode="same")
+    # Exprimée en nombre de clients par unité, comme un histogramme de densité
+    return grid, density / step
+
+
+def compute_feature_stats(name, series):
+    """Calcule en une passe vectorisée les statistiques d'une colonne."""
+    missing = int(series.isna().sum())
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        counts = series.value_counts(dropna=True)
+        return FeatureStats(
+            name=name, kind="categorical", count=int(counts.sum()), missing=missing,
+            categories=np.asarray(counts.index.astype(str), dtype=str), counts=counts.to_numpy(),
+        )
+    values = series.to_numpy(np.float64, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return FeatureStats(name=name, kind="numeric", count=0, missing=missing)
+    unique = np.unique(values)
+    if len(unique) <= DISCRETE_MAX_VALUES and np.all(unique == np.round(unique)):
+        # Variable discrète : un bin centré sur chaque entier
+        bin_edges = np.arange(unique[0] - 0.5, unique[-1] + 1.5)
+    else:
+        bin_edges = np.histogram_bin_edges(values, bins="auto")
+        if len(bin_edges) - 1 > MAX_BINS:
+            bin_edges = np.linspace(values.min(), values.max(), MAX_BINS + 1)
+    counts, bin_edges = np.histogram(values, bins=bin_edges)
+    # La courbe est mise à l'échelle de l'histogramme (nombre de clients par bin)
+    kde_x, kde_y = gaussian_kde_binned(values, values.min(), values.max())
+    if kde_y is not None:
+        kde_y = kde_y * np.diff(bin_edges).mean()
+    return FeatureStats(
+        name=name, kind="numeric", count=len(values), missing=missing,
+        mean=float(values.mean()), std=float(values.std()),
+        bin_edges=bin_edges, counts=counts, kde_x=kde_x, kde_y=kde_y,
+        quantiles=np.quantile(values, QUANTILE_LEVELS),
+    )
+
+
+class FeatureStatsIndex:
+    """
+    Index des distributions, construit une fois par version des données.
+    Chaque variable est calculée au premier accès puis stockée sur disque et en mémoire.
+    """
+
+    def __init__(self, store=None, cache_dir=CACHE_DIR):
+        self.store = store if store is not None else get_population_store()
+        self.cache_dir = cache_dir
+        self._stats = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _directory(self, version):
+        return os.path.join(self.cache_dir, "feature_stats", f"{version[:16]}-v{STATS_FORMAT}")
+
+    def get(self, feature):
+        """Statistiques de `feature` (ou de sa variable dérivée : AGE, YEARS_EMPLOYED)."""
+        version = self.store.version
+        with self._lock:
+            if version != self._version:
+                self._stats = {}
+                self._version = version
+            if feature in self._stats:
+                return self._stats[feature]
+            path = os.path.join(self._directory(version), f"{feature}.npz")
+            if os.path.exists(path):
+                with np.load(path, allow_pickle=False) as arrays:
+                    stats = FeatureStats.from_arrays(arrays)
+            else:
+                stats = self._compute(feature)
+                os.makedirs(self._directory(version), exist_ok=True)
+                tmp_path = path + ".tmp.npz"
+                np.savez(tmp_path, **stats.to_arrays())
+                os.replace(tmp_path, path)
+            self._stats[feature] = stats
+            return stats
+
+    def _compute(self, feature):
+        profile = getattr(self.store, "profile", None)
+        if profile is not None and profile.covers(feature):
+            # Statistiques issues de la conversion en flux : la colonne n'est pas chargée
+            return profile.feature_stats(feature)
+        series = self.store.column(feature)
+        if feature in DERIVED_FEATURES:
+            name, transform = DERIVED_FEATURES[feature]
+            series = pd.Series(transform(series.to_numpy(np.float64, na_value=np.nan)))
+            return compute_feature_stats(name, series)
+        return compute_feature_stats(feature, series)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_feature_stats_index():
+    """Index unique, partagé par toutes les sessions du processus."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FeatureStatsIndex()
+        return _index
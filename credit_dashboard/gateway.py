@@ -0,0 +1,108 @@
+################## Regroupement des prédictions client simultanées ########################
+import copy
+import dataclasses
+import threading
+import time
+from concurrent.futures import Future
+
+from credit_dashboard.api_client import ApiResult
+
+from credit_dashboard.config import GATEWAY_MAX_BATCH, GATEWAY_WINDOW_MS
+from credit_dashboard.metrics import metrics
+from credit_dashboard.scoring import get_scoring_service
+
+
+class PredictionGateway:
+    """
+    Intermédiaire entre les pages et le scoring pour les prédictions d'un client existant.
+    Avec le modèle local, les demandes simultanées sont fusionnées en un seul appel vectorisé
+    (probabilités + SHAP) et un même SK_ID_CURR en cours de calcul n'est calculé qu'une fois.
+    Un thread unique exécute les lots : une demande isolée part aussitôt ; celles qui arrivent
+    pendant un calcul forment le lot suivant. Si ce lot regroupait déjà plusieurs demandes
+    (charge concurrente), le suivant attend jusqu'à `window` secondes d'autres demandes.
+    Avec l'API distante, les appels sont transmis tels quels : l'API n'a pas d'endpoint
+    batch avec SHAP, et ApiClient regroupe déjà les requêtes identiques en cours.
+    """
+
+    def __init__(self, service=None, window=GATEWAY_WINDOW_MS / 1000, max_batch=GATEWAY_MAX_BATCH):
+        self.service = service if service is not None else get_scoring_service()
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._inflight = {}
+        self._oldest_pending = 0.0
+        self._last_batch_end = float("-inf")
+        self._last_batch_size = 0
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def predict(self, client_id):
+        """Même résultat que `ScoringService.predict` : un `ApiResult` pour ce client."""
+        if not self.service.uses_local_engine():
+            return self.service.predict(client_id)
+        with self._condition:
+            future = self._inflight.get(client_id)
+            if future is None:
+                future = self._inflight[client_id] = Future()
+                if not self._pending:
+                    self._oldest_pending = time.monotonic()
+                self._pending.append(client_id)
+                self._ensure_worker()
+                self._condition.notify()
+            else:
+                metrics.increment("gateway_deduplicated_total")
+        metrics.increment("gateway_requests_total")
+        # Une copie par appelant : une page qui modifie `data` ne touche pas les autres sessions
+        result = future.result()
+        return dataclasses.replace(result, data=copy.deepcopy(result.data))
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="prediction-gateway", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        """Attend des demandes puis retourne le prochain lot (appelé sous `_condition`)."""
+        while not self._pending:
+            self._condition.wait()
+        # Sous charge uniquement : un utilisateur seul n'attend jamais la fenêtre
+        if self._last_batch_size > 1 and time.monotonic() - self._last_batch_end < self.window:
+            deadline = self._oldest_pending + self.window
+            while len(self._pending) < self.max_batch and time.monotonic() < deadline:
+                self._condition.wait(deadline - time.monotonic())
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        return batch
+
+    def _run(self):
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+            try:
+                with metrics.timer("gateway_batch_seconds"):
+                    results = self.service.predict_many(batch)
+            except Exception:
+                # Modèle local indisponible ou en erreur : échec pour chaque demande, comme ScoringService._local
+                metrics.increment("gateway_failures_total")
+                results = [ApiResult(0)] * len(batch)
+            with self._condition:
+                futures = [self._inflight.pop(client_id) for client_id in batch]
+                self._last_batch_end = time.monotonic()
+                self._last_batch_size = len(batch)
+            metrics.increment("gateway_batches_total")
+            metrics.increment("gateway_batched_clients_total", len(batch))
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_prediction_gateway():
+    """Passerelle unique : les demandes de toutes les sessions sont regroupées ensemble."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = PredictionGateway()
+        return _gateway
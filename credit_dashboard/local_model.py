@@ -0,0 +1,261 @@
+################## Moteur de scoring local (modèle LightGBM embarqué) ########################
+import json
+import os
+import threading
+
+import joblib
+import numpy as np
+
+from credit_dashboard.config import (
+    CACHE_DIR,
+    EXPLAIN_CHUNK_SIZE,
+    EXPLAIN_THREADS,
+    GLOBAL_IMPORTANCE_SAMPLE,
+    ID_COLUMN,
+    MODEL_PATH,
+)
+from credit_dashboard.data_store import file_fingerprint, get_population_store
+
+
+def _to_python(value):
+    """Convertit une valeur NumPy en type JSON natif (NaN -> None)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class LocalScoringEngine:
+    """
+    Équivalent en mémoire des endpoints de scoring de l'API.
+    Le modèle est chargé une fois ; les prédictions sont vectorisées sur des matrices NumPy
+    dont les colonnes suivent l'ordre `feature_names` du modèle.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, store=None, cache_dir=CACHE_DIR):
+        self.model_path = model_path
+        self.model = joblib.load(model_path)
+        self.booster = self.model.booster_
+        self.feature_names = list(self.model.feature_name_)
+        self.feature_index = {name: index for index, name in enumerate(self.feature_names)}
+        self.store = store if store is not None else get_population_store()
+        self.model_version = file_fingerprint(model_path)
+        self.cache_dir = cache_dir
+        self._global_importances = None
+        self._global_version = None
+        self._global_lock = threading.Lock()
+
+    ##### prédiction vectorisée
+    def predict_proba(self, X):
+        """Probabilités de défaut pour une matrice (n_clients, n_features)."""
+        X = np.asarray(X, dtype=np.float64)
+        return self.booster.predict(X)
+
+    def shap_values(self, X):
+        """Contributions SHAP (TreeSHAP natif LightGBM), sans la colonne de biais."""
+        X = np.asarray(X, dtype=np.float64)
+        return self.booster.predict(X, pred_contrib=True, num_threads=EXPLAIN_THREADS)[:, :-1]
+
+    def explain_batch(self, X, chunk_size=EXPLAIN_CHUNK_SIZE):
+        """Contributions SHAP d'un grand nombre de clients, calculées par blocs pour borner la mémoire."""
+        X = np.asarray(X, dtype=np.float64)
+        contributions = np.empty(X.shape, dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            contributions[start:start + chunk_size] = self.shap_values(X[start:start + chunk_size])
+        return contributions
+
+    def explain_clients(self, client_ids):
+        """Probabilités et contributions SHAP de clients existants (NaN pour les clients inconnus)."""
+        X, found = self.client_matrix(client_ids)
+        probabilities = np.full(len(found), np.nan)
+        contributions = np.full(X.shape, np.nan)
+        if found.any():
+            probabilities[found] = self.predict_proba(X[found])
+            contributions[found] = self.explain_batch(X[found])
+        return probabilities, contributions
+
+    ##### importances globales (moyenne des |SHAP|), précalculées une fois par version du modèle et des données
+    @property
+    def global_importance_path(self):
+        # Une population différente (données de test, nouvelle extraction) donne un autre fichier
+        name = f"{self.model_version[:16]}-{self.store.version[:16]}.json"
+        return os.path.join(self.cache_dir, "global_importance", name)
+
+    def _read_global_importances(self):
+        try:
+            with open(self.global_importance_path, encoding="utf-8") as handle:
+                content = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if (content.get("model_sha256"), content.get("population_sha256")) != (self.model_version, self.store.version):
+            return None
+        return content["global_importances"]
+
+    def compute_global_importances(self, sample_size=GLOBAL_IMPORTANCE_SAMPLE, random_state=42):
+        """Calcule la moyenne des |SHAP| sur (un échantillon de) la population et l'enregistre dans le cache."""
+        population_version = self.store.version
+        client_ids = self.store.column(ID_COLUMN).to_numpy()
+        if len(client_ids) > sample_size:
+            client_ids = np.random.default_rng(random_state).choice(client_ids, sample_size, replace=False)
+        X, _ = self.client_matrix(client_ids)
+        mean_abs = np.abs(self.explain_batch(X)).mean(axis=0)
+        importances = [
+            {"Feature": name, "Global Importance": float(value)}
+            for name, value in sorted(zip(self.feature_names, mean_abs), key=lambda item: -item[1])
+        ]
+        content = {
+            "model_sha256": self.model_version,
+            "population_sha256": population_version,
+            "n_samples": int(len(client_ids)),
+            "global_importances": importances,
+        }
+        path = self.global_importance_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(content, handle)
+        os.replace(tmp_path, path)
+        return importances
+
+    def has_global_importances(self):
+        if self._global_importances is not None and self._global_version == self.store.version:
+            return True
+        return self._read_global_importances() is not None
+
+    def global_importances(self):
+        """Importances globales au format de /get_global_importance, calculées au besoin."""
+        version = self.store.version
+        with self._global_lock:
+            if self._global_importances is None or self._global_version != version:
+                self._global_importances = self._read_global_importances() or self.compute_global_importances()
+                self._global_version = version
+            return self._global_importances
+
+    ##### construction des vecteurs clients
+    def empty_matrix(self, n_rows):
+        # Les variables non renseignées sont laissées manquantes : LightGBM les gère nativement
+        return np.full((n_rows, len(self.feature_names)), np.nan)
+
+    def client_matrix(self, client_ids):
+        """Matrice des variables du modèle pour des clients existants, et masque des clients trouvés."""
+        positions = self.store.locate(client_ids)
+        found = positions >= 0
+        X = self.empty_matrix(len(positions))
+        population_columns = set(self.store.columns)
+        available = [name for name in self.feature_names if name in population_columns]
+        if found.any() and available:
+            indexes = [self.feature_index[name] for name in available]
+            X[np.ix_(found, indexes)] = self.store.take_array(available, positions[found])
+        return X, found
+
+    def vector_from_values(self, values, base=None):
+        """Vecteur du modèle à partir d'un dictionnaire de variables (les inconnues sont ignorées)."""
+        vector = self.empty_matrix(1)[0] if base is None else np.array(base, dtype=np.float64)
+        for name, value in values.items():
+            if name in self.feature_index and value is not None:
+                vector[self.feature_index[name]] = float(value)
+        return vector
+
+    def client_info(self, vector):
+        return {name: _to_python(value) for name, value in zip(self.feature_names, vector)}
+
+    def _response(self, vector, client_info=None):
+        probability = float(self.predict_proba(vector[None, :])[0])
+        response = {
+            "probability_of_default": probability,
+            "shap_values": self.shap_values(vector[None, :])[0].tolist(),
+            "feature_names": self.feature_names,
+        }
+        if client_info is not None:
+            response["client_info"] = client_info
+        return response
+
+    ##### équivalents des endpoints de l'API (None si le client est inconnu)
+    def get_client_ids(self):
+        return self.store.column(ID_COLUMN).tolist()
+
+    def get_next_client_id(self):
+        return {"next_id": int(self.store.column(ID_COLUMN).max()) + 1}
+
+    def predict(self, client_id):
+        X, found = self.client_matrix([client_id])
+        if not found[0]:
+            return None
+        return self._response(X[0], self.client_info(X[0]))
+
+    def predict_clients(self, client_ids):
+        """Équivalent vectorisé de `predict` : un seul appel au modèle et à TreeSHAP pour tous les clients."""
+        X, found = self.client_matrix(client_ids)
+        responses = [None] * len(found)
+        if found.any():
+            rows = np.flatnonzero(found)
+            probabilities = self.predict_proba(X[rows])
+            contributions = self.shap_values(X[rows])
+            for row, probability, contribution in zip(rows, probabilities, contributions):
+                responses[row] = {
+                    "probability_of_default": float(probability),
+                    "shap_values": contribution.tolist(),
+                    "feature_names": self.feature_names,
+                    "client_info": self.client_info(X[row]),
+                }
+        return responses
+
+    def predict_with_custom_values(self, payload):
+        X, found = self.client_matrix([payload[ID_COLUMN]])
+        if not found[0]:
+            return None
+        vector = self.vector_from_values(payload, base=X[0])
+        return self._response(vector)
+
+    def predict_new_client(self, payload):
+        return self._response(self.vector_from_values(payload))
+
+    def get_global_importance(self):
+        return {"global_importances": self.global_importances()}
+
+    def predict_batch(self, client_ids):
+        X, found = self.client_matrix(client_ids)
+        probabilities = np.full(len(found), np.nan)
+        if found.any():
+            probabilities[found] = self.predict_proba(X[found])
+        return {
+            "predictions": [
+                {ID_COLUMN: _to_python(client_id), "probability_of_default": _to_python(probability)}
+                for client_id, probability in zip(client_ids, probabilities)
+            ]
+        }
+
+    def predict_new_client_batch(self, records):
+        X = self.empty_matrix(len(records))
+        for row, record in enumerate(records):
+            X[row] = self.vector_from_values(record)
+        probabilities = self.predict_proba(X) if len(records) else []
+        return {
+            "predictions": [
+                {ID_COLUMN: _to_python(record[ID_COLUMN]), "probability_of_default": float(probability)}
+                for record, probability in zip(records, probabilities)
+            ]
+        }
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_local_engine():
+    """Moteur unique, chargé au premier appel et partagé par toutes les sessions."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalScoringEngine()
+        return _engine
+
+
+if __name__ == "__main__":
+    # Précalcul des importances globales : python -m credit_dashboard.local_model
+    engine = get_local_engine()
+    top = engine.compute_global_importances()[:10]
+    print(f"Importances globales enregistrées dans {engine.global_importance_path}")
+    for item in top:
+        print(f"{item['Feature']:<40} {item['Global Importance']:.4f}")
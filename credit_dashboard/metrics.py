@@ -0,0 +1,156 @@
+################## Mesures de performance du dashboard ########################
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from credit_dashboard.config import METRICS_LOG, METRICS_WINDOW
+
+logger = logging.getLogger("credit_dashboard.metrics")
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key):
+    if not label_key:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in label_key) + "}"
+
+
+class MetricsRegistry:
+    """
+    Compteurs, durées et jauges du processus.
+    Les durées gardent les `window` dernières observations pour calculer les centiles.
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._gauge_callbacks = {}
+        self._timings = defaultdict(lambda: {"count": 0, "sum": 0.0, "recent": deque(maxlen=self.window)})
+
+    ##### enregistrement
+    def increment(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = float(value)
+
+    def register_gauge(self, name, callback, **labels):
+        """Jauge dont la valeur `callback()` est lue à chaque export (remplace un enregistrement identique)."""
+        with self._lock:
+            self._gauge_callbacks[(name, _label_key(labels))] = callback
+
+    def observe(self, name, seconds, **labels):
+        with self._lock:
+            timing = self._timings[(name, _label_key(labels))]
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["recent"].append(seconds)
+        if METRICS_LOG:
+            logger.info(json.dumps({"metric": name, "seconds": round(seconds, 6), **labels}, default=str))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    ##### lecture
+    def _callback_gauges(self):
+        with self._lock:
+            callbacks = list(self._gauge_callbacks.items())
+        return {key: float(callback()) for key, callback in callbacks}
+
+    def snapshot(self):
+        """État courant : compteurs, jauges et résumé des durées (nombre, moyenne, p50, p95, p99, max)."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timings = {key: (value["count"], value["sum"], np.array(value["recent"])) for key, value in self._timings.items()}
+        gauges.update(self._callback_gauges())
+        summaries = {}
+        for key, (count, total, recent) in timings.items():
+            summaries[key] = {
+                "count": count,
+                "mean": total / count if count else 0.0,
+                "p50": float(np.percentile(recent, 50)) if len(recent) else 0.0,
+                "p95": float(np.percentile(recent, 95)) if len(recent) else 0.0,
+                "p99": float(np.percentile(recent, 99)) if len(recent) else 0.0,
+                "max": float(recent.max()) if len(recent) else 0.0,
+            }
+        return {"counters": counters, "gauges": gauges, "timings": summaries}
+
+    def rows(self):
+        """Lignes lisibles pour un tableau : une par série."""
+        snapshot = self.snapshot()
+        rows = []
+        for (name, labels), summary in sorted(snapshot["timings"].items()):
+            rows.append({"métrique": name, "étiquettes": _format_labels(labels), **summary})
+        for kind in ("counters", "gauges"):
+            for (name, labels), value in sorted(snapshot[kind].items()):
+                rows.append({"métrique": name, "étiquettes": _format_labels(labels), "valeur": value})
+        return rows
+
+    def prometheus_text(self):
+        """Export au format texte Prometheus."""
+        snapshot = self.snapshot()
+        lines = []
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (name, labels), value in sorted(snapshot["gauges"].items()):
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (name, labels), summary in sorted(snapshot["timings"].items()):
+            for quantile in ("p50", "p95", "p99"):
+                quantile_labels = labels + (("quantile", f"0.{quantile[1:]}"),)
+                lines.append(f"{name}{_format_labels(quantile_labels)} {summary[quantile]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {summary['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {summary['mean'] * summary['count']}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+##### export HTTP au format Prometheus
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port):
+    """Démarre (une seule fois par processus) un serveur /metrics dans un thread d'arrière-plan."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
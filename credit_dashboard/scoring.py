@@ -0,0 +1,174 @@
+################## Choix du moteur de scoring : API distante ou modèle local ########################
+import threading
+import time
+
+from credit_dashboard.api_client import ApiClient, ApiResult, get_api_client
+from credit_dashboard.config import (
+    API_URL,
+    FALLBACK_COOLDOWN,
+    FALLBACK_TIMEOUT,
+    SCORING_MODE,
+)
+from credit_dashboard.local_model import get_local_engine
+from credit_dashboard.metrics import metrics
+from credit_dashboard.what_if import WhatIfSession
+
+SCORING_MODES = ("remote", "local", "auto")
+
+
+def _local_result(data):
+    return ApiResult(200, data) if data is not None else ApiResult(404)
+
+
+class ScoringService:
+    """
+    Point d'entrée unique des pages pour le scoring.
+    Expose les mêmes méthodes que `ApiClient` et retourne des `ApiResult`,
+    quel que soit le moteur utilisé.
+    """
+
+    def __init__(self, mode=SCORING_MODE, api=None):
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Mode de scoring inconnu : {mode} (attendu : {SCORING_MODES})")
+        self.mode = mode
+        if api is None:
+            # En mode "auto", l'API doit répondre vite pour ne pas retarder la bascule
+            api = ApiClient(API_URL, timeout=FALLBACK_TIMEOUT, retries=0) if mode == "auto" else get_api_client()
+        self.api = api
+        self._remote_down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self):
+        return get_local_engine()
+
+    def _remote_available(self):
+        return self.mode == "remote" or (self.mode == "auto" and time.monotonic() >= self._remote_down_until)
+
+    def uses_local_engine(self):
+        """Vrai si les prochains appels seront servis par le modèle local."""
+        return not self._remote_available()
+
+    def _mark_remote_down(self):
+        with self._lock:
+            self._remote_down_until = time.monotonic() + FALLBACK_COOLDOWN
+        metrics.increment("scoring_fallbacks_total")
+
+    @staticmethod
+    def _timed_local(local_call):
+        with metrics.timer("local_scoring_seconds"):
+            return local_call()
+
+    def _local(self, local_call, failed=None):
+        """Appel local ; en mode "auto", une erreur locale renvoie le résultat distant en échec."""
+        if self.mode == "auto":
+            try:
+                return self._timed_local(local_call)
+            except (OSError, ImportError, KeyError):
+                return failed if failed is not None else ApiResult(0)
+        return self._timed_local(local_call)
+
+    def _call(self, remote_call, local_call):
+        """Appel distant, avec bascule locale en mode "auto" si l'API ne répond pas ou renvoie une erreur serveur."""
+        if self.mode == "local":
+            return self._timed_local(local_call)
+        if not self._remote_available():
+            return self._local(local_call)
+        result = remote_call()
+        # None : endpoint absent de l'API, à traiter par l'appelant
+        if self.mode == "remote" or result is None or 0 < result.status_code < 500:
+            return result
+        self._mark_remote_down()
+        return self._local(local_call, failed=result)
+
+    ##### méthodes équivalentes à ApiClient
+    def _remote_client_ids(self):
+        client_ids = self.api.get_client_ids()
+        return ApiResult(200, client_ids) if client_ids else ApiResult(0)
+
+    def get_client_ids(self):
+        result = self._call(self._remote_client_ids, lambda: ApiResult(200, self.engine.get_client_ids()))
+        return result.data or []
+
+    def predict(self, client_id):
+        return self._call(
+            lambda: self.api.predict(client_id),
+            lambda: _local_result(self.engine.predict(client_id)),
+        )
+
+    def predict_many(self, client_ids):
+        """
+        Prédictions de plusieurs clients existants en un appel vectorisé du modèle local
+        (voir gateway.PredictionGateway) ; une réponse par client, comme `predict`.
+        """
+        result = self._local(lambda: ApiResult(200, [
+            _local_result(response) for response in self.engine.predict_clients(client_ids)
+        ]))
+        return result.data if result.ok else [result] * len(client_ids)
+
+    def predict_with_custom_values(self, payload):
+        return self._call(
+            lambda: self.api.predict_with_custom_values(payload),
+            lambda: _local_result(self.engine.predict_with_custom_values(payload)),
+        )
+
+    def predict_new_client(self, payload):
+        return self._call(
+            lambda: self.api.predict_new_client(payload),
+            lambda: _local_result(self.engine.predict_new_client(payload)),
+        )
+
+    def get_next_client_id(self):
+        return self._call(
+            self.api.get_next_client_id,
+            lambda: _local_result(self.engine.get_next_client_id()),
+        )
+
+    def get_global_importance(self):
+        # Importances précalculées à côté du modèle : aucune requête nécessaire
+        if self.mode != "remote":
+            try:
+                if self.mode == "local" or self.engine.has_global_importances():
+                    return ApiResult(200, self.engine.get_global_importance())
+            except (OSError, ImportError):
+                pass
+        return self.api.get_global_importance()
+
+    def predict_batch(self, client_ids):
+        # En local, le lot est scoré en un seul appel vectorisé
+        return self._call(
+            lambda: self.api.predict_batch(client_ids),
+            lambda: _local_result(self.engine.predict_batch(client_ids)),
+        )
+
+    def predict_new_client_batch(self, records):
+        return self._call(
+            lambda: self.api.predict_new_client_batch(records),
+            lambda: _local_result(self.engine.predict_new_client_batch(records)),
+        )
+
+    def what_if_session(self, client_id):
+        """Session de simulation locale, ou None si le modèle local n'est pas utilisable."""
+        if self.mode == "remote":
+            return None
+        try:
+            return WhatIfSession(self.engine, client_id)
+        except (OSError, ImportError, KeyError):
+            return None
+
+    def cache_stats(self):
+        return self.api.cache_stats()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_scoring_service():
+    """Service unique, configuré par la variable d'environnement SCORING_MODE."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScoringService()
+            metrics.register_gauge("cache_hit_rate", lambda: _service.cache_stats()["hit_rate"], cache="api")
+        return _service
@@ -0,0 +1,181 @@
+################## Recherche des clients les plus similaires (KD-tree) ########################
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from credit_dashboard.batch import NEW_CLIENT_COLUMNS
+from credit_dashboard.config import CACHE_DIR, ID_COLUMN, SIMILARITY_FEATURES, SIMILARITY_NEIGHBOURS
+from credit_dashboard.data_store import get_population_store
+from credit_dashboard.scoring import get_scoring_service
+
+DEFAULT_COLUMN = "default_status"
+
+# Variables descriptives utilisées si les importances globales ne sont pas disponibles
+FALLBACK_FEATURES = [
+    "EXT_SOURCE_1", "EXT_SOURCE_2", "EXT_SOURCE_3", "DAYS_BIRTH", "DAYS_EMPLOYED", "AMT_INCOME_TOTAL",
+    "AMT_CREDIT", "AMT_ANNUITY", "AMT_GOODS_PRICE", "CNT_CHILDREN", "CODE_GENDER_F",
+]
+
+# Nombre de variables de l'index affichées à côté des voisins
+DISPLAYED_FEATURES = 4
+
+# Variables saisies pour un nouveau client (payload de /predict_new_client)
+NEW_CLIENT_FEATURES = [name for name in NEW_CLIENT_COLUMNS if name != ID_COLUMN]
+
+# Délai (secondes) avant de redemander les importances globales si l'index utilise FALLBACK_FEATURES
+FALLBACK_RETRY_DELAY = 60
+
+# En dessous de ce nombre de variables renseignées, tous les nouveaux clients auraient les mêmes voisins
+MIN_QUERY_FEATURES = 2
+
+
+def ranked_features(importances, columns, limit=SIMILARITY_FEATURES):
+    """Variables de la population les plus importantes pour le modèle (format /get_global_importance)."""
+    excluded = {ID_COLUMN, DEFAULT_COLUMN}
+    ranked = [item["Feature"] for item in importances if item["Feature"] in columns and item["Feature"] not in excluded]
+    return ranked[:limit]
+
+
+class SimilarityIndex:
+    """
+    KD-tree sur les variables standardisées (valeurs manquantes remplacées par la moyenne).
+    L'index est construit une fois par version des données et par jeu de variables, enregistré
+    avec joblib puis relu en mémoire partagée (mmap) : toutes les sessions lisent le même fichier.
+    """
+
+    def __init__(self, features, store=None, cache_dir=CACHE_DIR):
+        self.store = store if store is not None else get_population_store()
+        self.cache_dir = cache_dir
+        self.requested_features = list(features)
+        self._content = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _path(self, version, features):
+        digest = hashlib.sha1("|".join(features).encode()).hexdigest()[:8]
+        return os.path.join(self.cache_dir, "similarity", f"{version[:16]}-{digest}.joblib")
+
+    def _build(self, features, path):
+        columns = [ID_COLUMN, *features]
+        with_outcomes = DEFAULT_COLUMN in self.store.columns
+        frame = self.store.load(columns + ([DEFAULT_COLUMN] if with_outcomes else []))
+        X = np.column_stack([
+            pd.to_numeric(frame[name], errors="coerce").to_numpy(np.float64, na_value=np.nan) for name in features
+        ])
+        mean = np.nan_to_num(np.nanmean(X, axis=0))
+        std = np.nanstd(X, axis=0)
+        std[~(std > 0)] = 1.0
+        Z = (X - mean) / std
+        Z[np.isnan(Z)] = 0.0
+        content = {
+            "features": features,
+            "mean": mean,
+            "std": std,
+            "ids": frame[ID_COLUMN].to_numpy(np.int64),
+            "outcomes": frame[DEFAULT_COLUMN].to_numpy(np.float64, na_value=np.nan) if with_outcomes else np.full(len(frame), np.nan),
+            "tree": KDTree(Z, leaf_size=40),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        joblib.dump(content, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        """Contenu de l'index pour la version courante des données (construit au premier appel)."""
+        version = self.store.version
+        with self._lock:
+            if self._content is None or version != self._version:
+                features = [name for name in self.requested_features if name in self.store.columns]
+                if not features:
+                    raise KeyError("Aucune variable de similarité n'est présente dans les données")
+                path = self._path(version, features)
+                if not os.path.exists(path):
+                    self._build(features, path)
+                self._content = joblib.load(path, mmap_mode="r")
+                self._version = version
+            return self._content
+
+    @property
+    def features(self):
+        return self._load()["features"]
+
+    def _standardize(self, content, X):
+        Z = (X - content["mean"]) / content["std"]
+        Z[np.isnan(Z)] = 0.0
+        return Z
+
+    def _neighbours(self, content, X, k, exclude=None):
+        # Un voisin de plus pour pouvoir écarter le client lui-même
+        distances, positions = content["tree"].query(self._standardize(content, X), k=k + 1)
+        distances, positions = distances[0], positions[0]
+        keep = content["ids"][positions] != exclude if exclude is not None else np.ones(len(positions), dtype=bool)
+        distances, positions = distances[keep][:k], positions[keep][:k]
+        shown = content["features"][:DISPLAYED_FEATURES]
+        neighbours = pd.DataFrame({ID_COLUMN: content["ids"][positions], "Distance": np.round(distances, 3)})
+        neighbours[DEFAULT_COLUMN] = content["outcomes"][positions]
+        return pd.concat([neighbours, self.store.take(shown, positions)], axis=1)
+
+    def neighbours(self, client_id, k=SIMILARITY_NEIGHBOURS):
+        """Les `k` clients les plus proches d'un client existant (None s'il est inconnu)."""
+        content = self._load()
+        position = self.store.locate([client_id])[0]
+        if position < 0:
+            return None
+        X = self.store.take_array(content["features"], [position])
+        return self._neighbours(content, X, k, exclude=int(client_id))
+
+    def neighbours_of_values(self, values, k=SIMILARITY_NEIGHBOURS):
+        """
+        Les `k` clients les plus proches d'un nouveau client (payload de /predict_new_client).
+        None si moins de `MIN_QUERY_FEATURES` variables de l'index sont renseignées : les autres
+        seraient remplacées par la moyenne et la recherche renverrait toujours les mêmes clients.
+        """
+        content = self._load()
+        provided = [name for name in content["features"] if values.get(name) is not None]
+        if len(provided) < MIN_QUERY_FEATURES:
+            return None
+        X = np.array([[np.nan if values.get(name) is None else float(values[name]) for name in content["features"]]])
+        return self._neighbours(content, X, k)
+
+
+_index = None
+_index_expires = 0.0
+_new_client_index = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index():
+    """
+    Index unique, sur les variables les plus importantes pour le modèle si elles sont connues.
+    Les importances sont demandées hors verrou (ApiClient regroupe les appels simultanés) ;
+    un index construit sur FALLBACK_FEATURES est remplacé dès que l'API répond.
+    """
+    global _index, _index_expires
+    with _index_lock:
+        if _index is not None and time.monotonic() < _index_expires:
+            return _index
+    response = get_scoring_service().get_global_importance()
+    importances = response.data.get("global_importances", []) if response.ok else []
+    features = ranked_features(importances, get_population_store().columns)
+    with _index_lock:
+        if _index is None or time.monotonic() >= _index_expires:
+            requested = features or FALLBACK_FEATURES
+            if _index is None or _index.requested_features != requested:
+                _index = SimilarityIndex(requested)
+            _index_expires = float("inf") if features else time.monotonic() + FALLBACK_RETRY_DELAY
+        return _index
+
+
+def get_new_client_similarity_index():
+    """Index unique sur les seules variables saisies pour un nouveau client."""
+    global _new_client_index
+    with _index_lock:
+        if _new_client_index is None:
+            _new_client_index = SimilarityIndex(NEW_CLIENT_FEATURES)
+        return _new_client_index
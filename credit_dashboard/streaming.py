@@ -0,0 +1,356 @@
+################## Lecture en flux des gros fichiers de population ########################
+import os
+import resource
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from credit_dashboard.config import STREAMING_CHUNK_SIZE, STREAMING_SAMPLE_SIZE
+from credit_dashboard.feature_stats import (
+    DERIVED_FEATURES,
+    DISCRETE_MAX_VALUES,
+    compute_feature_stats,
+    gaussian_kde_binned,
+)
+
+# Au-delà de ce nombre de valeurs distinctes, une colonne texte reste du texte
+_CATEGORY_MAX_VALUES = 10000
+
+# Proportion maximale de valeurs distinctes pour catégoriser une colonne texte (comme data_store)
+_CATEGORY_MAX_RATIO = 0.5
+
+_INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+class NumericAccumulator:
+    """
+    Statistiques d'une colonne numérique mises à jour bloc par bloc, en mémoire bornée :
+    moments (combinaison de Chan), min/max, valeurs manquantes, comptage exact des valeurs
+    tant qu'elles sont peu nombreuses, et échantillon réservoir pour les quantiles.
+    """
+
+    def __init__(self, sample_size=STREAMING_SAMPLE_SIZE, rng=None):
+        self.sample_size = sample_size
+        self.rng = rng if rng is not None else np.random.default_rng(42)
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # Vrai tant que pandas a lu la colonne comme des entiers dans chaque bloc
+        self.integral = True
+        self.float32_safe = True
+        self.value_counts = {}
+        # Alloué au fil de l'eau : une colonne courte ne réserve pas tout l'échantillon
+        self.sample = np.empty(0)
+        self._seen = 0
+
+    def update(self, values, integral=False):
+        self.integral = self.integral and integral
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        self.missing += int((~finite).sum())
+        values = values[finite]
+        n = len(values)
+        if not n:
+            return
+        # Moyenne et somme des carrés des écarts, combinées avec celles des blocs précédents
+        chunk_mean = values.mean()
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self.float32_safe:
+            self.float32_safe = bool(np.array_equal(values.astype(np.float32).astype(np.float64), values))
+        if self.value_counts is not None:
+            unique, counts = np.unique(values, return_counts=True)
+            for value, count in zip(unique.tolist(), counts.tolist()):
+                self.value_counts[value] = self.value_counts.get(value, 0) + count
+            if len(self.value_counts) > DISCRETE_MAX_VALUES:
+                self.value_counts = None
+        self._reservoir(values)
+
+    def _reservoir(self, values):
+        """Échantillonnage réservoir (algorithme R), vectorisé sur le bloc."""
+        free = max(self.sample_size - self._seen, 0)
+        head = values[:free]
+        if len(head):
+            self.sample = np.concatenate([self.sample, head])
+        tail = values[free:]
+        if len(tail):
+            positions = self._seen + len(head) + np.arange(len(tail))
+            slots = self.rng.integers(0, positions + 1)
+            accepted = slots < self.sample_size
+            self.sample[slots[accepted]] = tail[accepted]
+        self._seen += len(values)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / self.count)) if self.count else np.nan
+
+    @property
+    def exact(self):
+        """Vrai si l'échantillon contient toutes les valeurs de la colonne."""
+        return self._seen <= self.sample_size
+
+    def values_sample(self):
+        return self.sample[:min(self._seen, self.sample_size)]
+
+    def target_dtype(self):
+        """Type réduit, selon les mêmes règles que data_store.downcast_column."""
+        if self.integral:
+            for dtype in _INTEGER_TYPES:
+                info = np.iinfo(dtype)
+                if not self.count or (info.min <= self.min and self.max <= info.max):
+                    return np.dtype(dtype)
+        return np.dtype(np.float32 if self.float32_safe else np.float64)
+
+
+class CategoryAccumulator:
+    """Comptage des modalités d'une colonne texte (abandonné au-delà de `_CATEGORY_MAX_VALUES`)."""
+
+    def __init__(self, counted=True):
+        # Sans comptage (`counted=False`), la colonne reste du texte non catégorisé
+        self.counts = {} if counted else None
+        self.missing = 0
+        self.rows = 0
+        self.boolean = counted
+
+    def update(self, values, boolean=False):
+        self.boolean = self.boolean and boolean
+        series = pd.Series(values, dtype=object)
+        self.rows += len(series)
+        self.missing += int(series.isna().sum())
+        if self.counts is None:
+            return
+        for value, count in series.dropna().astype(str).value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        if len(self.counts) > _CATEGORY_MAX_VALUES:
+            self.counts = None
+
+    def target_dtype(self):
+        if self.boolean:
+            return np.dtype(bool)
+        if self.counts is not None and self.rows and len(self.counts) / self.rows <= _CATEGORY_MAX_RATIO:
+            return pd.CategoricalDtype(sorted(self.counts))
+        return np.dtype(object)
+
+
+class StreamingProfile:
+    """Profil d'une population lu en une seule passe : types réduits et statistiques des pages d'analyse."""
+
+    def __init__(self, sample_size=STREAMING_SAMPLE_SIZE, seed=42):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.accumulators = {}
+        # Colonnes lues comme numériques dans certains blocs et comme texte dans d'autres
+        self.mixed = set()
+        self.num_rows = 0
+
+    def _accumulator(self, name, numeric):
+        accumulator = self.accumulators.get(name)
+        if accumulator is None:
+            accumulator = NumericAccumulator(self.sample_size, self.rng) if numeric else CategoryAccumulator()
+            self.accumulators[name] = accumulator
+        elif name not in self.mixed and isinstance(accumulator, NumericAccumulator) != numeric:
+            # Les valeurs des blocs précédents sont perdues pour le comptage des modalités :
+            # la colonne reste du texte (object), sans catégories ni statistiques partielles
+            self.mixed.add(name)
+            self.accumulators.pop(("derived", name), None)
+            accumulator = self.accumulators[name] = CategoryAccumulator(counted=False)
+        return accumulator
+
+    def update(self, chunk):
+        self.num_rows += len(chunk)
+        for name in chunk.columns:
+            series = chunk[name]
+            boolean = pd.api.types.is_bool_dtype(series)
+            numeric = pd.api.types.is_numeric_dtype(series) and not boolean
+            accumulator = self._accumulator(name, numeric)
+            if name in self.mixed:
+                accumulator.update(series.to_numpy())
+            elif numeric:
+                values = series.to_numpy(np.float64, na_value=np.nan)
+                accumulator.update(values, pd.api.types.is_integer_dtype(series))
+                if name in DERIVED_FEATURES:
+                    # Variable dérivée (AGE, YEARS_EMPLOYED) accumulée sous le nom de la variable source
+                    self._accumulator(("derived", name), True).update(DERIVED_FEATURES[name][1](values))
+            else:
+                accumulator.update(series.to_numpy(), boolean)
+
+    def dtypes(self):
+        return {name: accumulator.target_dtype() for name, accumulator in self.accumulators.items()
+                if isinstance(name, str)}
+
+    def covers(self, feature):
+        key = ("derived", feature) if feature in DERIVED_FEATURES else feature
+        # Colonne mixte : statistiques calculées sur la colonne chargée depuis le Parquet
+        return key in self.accumulators and feature not in self.mixed
+
+    def feature_stats(self, feature):
+        """`FeatureStats` de la variable (ou de sa variable dérivée), comme feature_stats.compute_feature_stats."""
+        key = ("derived", feature) if feature in DERIVED_FEATURES else feature
+        accumulator = self.accumulators[key]
+        name = DERIVED_FEATURES[feature][0] if feature in DERIVED_FEATURES else feature
+        if isinstance(accumulator, CategoryAccumulator):
+            counts = pd.Series(accumulator.counts or {}, dtype=np.int64).sort_values(ascending=False)
+            stats = compute_feature_stats(name, pd.Series(np.repeat(counts.index.to_numpy(dtype=object), counts.to_numpy())))
+            stats.missing = accumulator.missing
+            return stats
+        sample = accumulator.values_sample()
+        stats = compute_feature_stats(name, pd.Series(sample))
+        stats.missing = accumulator.missing
+        if accumulator.exact or not accumulator.count:
+            return stats
+        # Au-delà de l'échantillon : moments, extrêmes et comptages exacts, forme de la distribution estimée
+        scale = accumulator.count / len(sample)
+        discrete = accumulator.value_counts is not None
+        if discrete:
+            values = np.array(list(accumulator.value_counts), dtype=np.float64)
+            weights = np.array(list(accumulator.value_counts.values()), dtype=np.int64)
+        if discrete and np.all(values == np.round(values)):
+            stats.bin_edges = np.arange(values.min() - 0.5, values.max() + 1.5)
+        else:
+            # Bornes étendues au minimum et maximum réels, que l'échantillon a pu manquer
+            stats.bin_edges = np.linspace(accumulator.min, accumulator.max, len(stats.bin_edges))
+        if discrete:
+            stats.counts = np.histogram(values, bins=stats.bin_edges, weights=weights)[0].astype(np.int64)
+        else:
+            stats.counts = np.round(np.histogram(sample, bins=stats.bin_edges)[0] * scale).astype(np.int64)
+        stats.kde_x, stats.kde_y = gaussian_kde_binned(sample, accumulator.min, accumulator.max)
+        if stats.kde_y is not None:
+            stats.kde_y = stats.kde_y * scale * np.diff(stats.bin_edges).mean()
+        stats.count = accumulator.count
+        stats.mean = accumulator.mean
+        stats.std = accumulator.std
+        stats.quantiles[0], stats.quantiles[-1] = accumulator.min, accumulator.max
+        return stats
+
+
+def iter_csv(path, chunk_size=STREAMING_CHUNK_SIZE, dtype=None):
+    return pd.read_csv(path, chunksize=chunk_size, dtype=dtype)
+
+
+def profile_csv(path, chunk_size=STREAMING_CHUNK_SIZE, sample_size=STREAMING_SAMPLE_SIZE):
+    """Première passe : statistiques et types réduits, sans jamais charger le fichier entier."""
+    profile = StreamingProfile(sample_size)
+    for chunk in iter_csv(path, chunk_size):
+        profile.update(chunk)
+    return profile
+
+
+def stream_csv_to_parquet(path, parquet_path, dtypes, chunk_size=STREAMING_CHUNK_SIZE):
+    """Seconde passe : conversion bloc par bloc vers Parquet avec les types réduits."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        # Les types réduits sont appliqués dès l'analyse du CSV : aucun bloc float64 intermédiaire
+        for chunk in iter_csv(path, chunk_size, dtypes):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+@dataclass
+class MemoryReport:
+    """Pic de mémoire Python (tracemalloc) et mémoire résidente maximale du processus."""
+
+    label: str
+    seconds: float = 0.0
+    peak_mb: float = 0.0
+    max_rss_before_mb: float = 0.0
+    max_rss_after_mb: float = 0.0
+    details: dict = field(default_factory=dict)
+
+    def __str__(self):
+        return (f"{self.label} : {self.seconds:.1f} s, pic Python {self.peak_mb:.1f} Mo, "
+                f"RSS max {self.max_rss_before_mb:.0f} -> {self.max_rss_after_mb:.0f} Mo")
+
+    @property
+    def rss_growth_mb(self):
+        """Hausse de la mémoire résidente maximale : nulle si le pic précédent n'est pas dépassé."""
+        return self.max_rss_after_mb - self.max_rss_before_mb
+
+
+def _max_rss_mb():
+    # ru_maxrss est exprimé en kilo-octets sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class measure_memory:
+    """
+    Gestionnaire de contexte remplissant un `MemoryReport` pour le bloc exécuté.
+    tracemalloc ralentit toutes les allocations du processus : avec `trace=False`,
+    seule la mémoire résidente maximale est relevée.
+    """
+
+    def __init__(self, label, trace=True):
+        self.report = MemoryReport(label)
+        self.trace = trace
+
+    def __enter__(self):
+        self._tracing = tracemalloc.is_tracing()
+        if self.trace:
+            if not self._tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        self.report.max_rss_before_mb = _max_rss_mb()
+        self._start = time.perf_counter()
+        return self.report
+
+    def __exit__(self, *exc_info):
+        self.report.seconds = time.perf_counter() - self._start
+        self.report.max_rss_after_mb = _max_rss_mb()
+        if self.trace:
+            self.report.peak_mb = (tracemalloc.get_traced_memory()[1] - self._baseline) / 2**20
+            if not self._tracing:
+                tracemalloc.stop()
+
+
+def convert_csv_streaming(path, parquet_path, chunk_size=STREAMING_CHUNK_SIZE,
+                          sample_size=STREAMING_SAMPLE_SIZE, trace_memory=False):
+    """Profil en une passe puis écriture Parquet en flux ; retourne le profil et le rapport mémoire."""
+    with measure_memory("Conversion en flux", trace_memory) as report:
+        profile = profile_csv(path, chunk_size, sample_size)
+        tmp_path = parquet_path + ".tmp"
+        stream_csv_to_parquet(path, tmp_path, profile.dtypes(), chunk_size)
+        os.replace(tmp_path, parquet_path)
+    report.details = {"rows": profile.num_rows, "columns": len(profile.dtypes())}
+    return profile, report
+
+
+if __name__ == "__main__":
+    # Comparaison de la lecture en flux et de la lecture complète :
+    # python -m credit_dashboard.streaming clients_data.csv
+    # La lecture en flux passe en premier : la RSS maximale ne redescend jamais
+    import sys
+    import tempfile
+
+    from credit_dashboard.data_store import downcast_frame
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "clients_data.csv"
+    with tempfile.TemporaryDirectory() as directory:
+        _, streamed = convert_csv_streaming(source, os.path.join(directory, "streamed.parquet"), trace_memory=True)
+        with measure_memory("Lecture complète (pd.read_csv + réduction des types)") as eager:
+            frame = downcast_frame(pd.read_csv(source))
+            frame.to_parquet(os.path.join(directory, "eager.parquet"), index=False)
+        eager.details = {"memory_mb": frame.memory_usage(deep=True).sum() / 2**20}
+    for report in (streamed, eager):
+        print(f"{report} (+{report.rss_growth_mb:.0f} Mo)")
+    print(f"{streamed.details['rows']} lignes, {streamed.details['columns']} colonnes ; "
+          f"DataFrame réduit en mémoire : {eager.details['memory_mb']:.1f} Mo")
@@ -0,0 +1,74 @@
+################## Pages du dashboard, importées à la demande ########################
+import importlib
+import threading
+
+from credit_dashboard.config import WARM_UP
+from credit_dashboard.metrics import metrics
+
+# Libellé du menu -> (module de credit_dashboard.views, icône)
+PAGES = {
+    "Accueil": ("home", "house"),
+    "Prédictions": ("predictions", "graph-up"),
+    "Analyse des Caractéristiques": ("feature_analysis", "list-task"),
+    "Analyse Bi-Variée": ("bivariate_analysis", "bi-graph-up-arrow"),
+    "Modification des informations": ("client_update", "pencil-square"),
+    "Prédiction nouveau client": ("new_client", "file-plus"),
+    "Prédiction par lot": ("batch_scoring", "collection"),
+}
+
+
+def load_page(label):
+    """Importe le module d'une page : pandas, Plotly, le modèle... ne sont chargés qu'à ce moment."""
+    module_name = PAGES[label][0]
+    with metrics.timer("page_import_seconds", page=label):
+        return importlib.import_module(f"credit_dashboard.views.{module_name}")
+
+
+def render_page(label):
+    load_page(label).render()
+
+
+def render_diagnostics():
+    importlib.import_module("credit_dashboard.views.diagnostics").render()
+
+
+##### préchauffage des ressources partagées, une seule fois par processus
+_warm_up_started = False
+_warm_up_lock = threading.Lock()
+
+
+def _warm_up():
+    with metrics.timer("warm_up_seconds"):
+        for label in PAGES:
+            load_page(label)
+        from credit_dashboard.data_store import get_population_store
+        from credit_dashboard.scoring import get_scoring_service
+        from credit_dashboard.similarity import get_new_client_similarity_index, get_similarity_index
+
+        store = get_population_store()
+        if store.available():
+            store.refresh()
+        service = get_scoring_service()
+        if service.mode != "remote":
+            try:
+                service.engine
+            except (OSError, ImportError):
+                # Modèle absent : les pages basculeront sur l'API
+                pass
+        if store.available():
+            # Index des clients similaires construit ou projeté en mémoire (mmap)
+            try:
+                get_similarity_index().features
+                get_new_client_similarity_index().features
+            except (OSError, KeyError):
+                pass
+
+
+def start_warm_up():
+    """Charge en arrière-plan les pages, les données et le modèle, après l'affichage de la première page."""
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started or not WARM_UP:
+            return
+        _warm_up_started = True
+    threading.Thread(target=_warm_up, name="dashboard-warm-up", daemon=True).start()
@@ -0,0 +1,83 @@
+################## Page "Prédiction par lot" ########################
+import pandas as pd
+import streamlit as st
+
+from credit_dashboard.batch import parse_client_ids, score_existing_clients, score_new_clients
+from credit_dashboard.config import BATCH_CHUNK_SIZE, BATCH_MAX_WORKERS, ID_COLUMN, OPTIMAL_THRESHOLD
+from credit_dashboard.scoring import get_scoring_service
+
+
+def render():
+    api = get_scoring_service()
+
+    st.title("Prédiction par lot")
+
+    source = st.radio("Clients à scorer", options=["Clients existants", "Nouveaux clients (CSV)"], horizontal=True)
+
+    # Constitution du lot
+    applicants = None
+    batch_ids = []
+    if source == "Clients existants":
+        uploaded = st.file_uploader("Fichier CSV contenant une colonne SK_ID_CURR", type="csv")
+        typed_ids = st.text_area("Ou saisissez les ID clients (séparés par des virgules ou des retours à la ligne)")
+        if uploaded is not None:
+            try:
+                uploaded_ids = pd.read_csv(uploaded, usecols=[ID_COLUMN])[ID_COLUMN]
+                batch_ids = list(dict.fromkeys(uploaded_ids.dropna().astype(int).tolist()))
+            except (ValueError, pd.errors.ParserError) as error:
+                # Colonne SK_ID_CURR absente, identifiants non numériques ou CSV mal formé
+                st.error(f"Fichier CSV illisible : {error}")
+        elif typed_ids:
+            batch_ids = parse_client_ids(typed_ids)
+        elif st.checkbox("Scorer tous les clients disponibles"):
+            batch_ids = api.get_client_ids()
+        lot_size = len(batch_ids)
+    else:
+        uploaded = st.file_uploader("Fichier CSV au format /predict_new_client", type="csv")
+        if uploaded is not None:
+            try:
+                applicants = pd.read_csv(uploaded)
+            except (ValueError, pd.errors.ParserError) as error:
+                st.error(f"Fichier CSV illisible : {error}")
+        lot_size = 0 if applicants is None else len(applicants)
+
+    col_chunk, col_workers = st.columns(2)
+    chunk_size = col_chunk.number_input("Taille des blocs", value=BATCH_CHUNK_SIZE, step=50, min_value=1)
+    max_workers = col_workers.number_input("Requêtes en parallèle", value=BATCH_MAX_WORKERS, step=1, min_value=1, max_value=16)
+
+    st.write(f"**{lot_size} client(s) dans le lot**")
+
+    if lot_size and st.button("Lancer le scoring"):
+        if source == "Clients existants":
+            batches = score_existing_clients(api, batch_ids, int(chunk_size), int(max_workers))
+        else:
+            batches = score_new_clients(api, applicants, int(chunk_size), int(max_workers))
+
+        # Remplissage progressif du tableau au fil des blocs terminés
+        progress = st.progress(0.0)
+        table = st.empty()
+        results = []
+        scored = 0
+        try:
+            for frame in batches:
+                results.append(frame)
+                scored += len(frame)
+                progress.progress(scored / lot_size, text=f"{scored} / {lot_size} clients scorés")
+                table.dataframe(pd.concat(results, ignore_index=True), height=400)
+        except ValueError as error:
+            st.error(str(error))
+        # Conservation des résultats : le bouton de téléchargement relance le script
+        st.session_state.batch_results = pd.concat(results, ignore_index=True) if results else None
+
+    batch_results = st.session_state.get("batch_results")
+    if batch_results is not None:
+        st.subheader("Résultats")
+        refused = int((batch_results["decision"] == "Refusé").sum())
+        st.write(f"Seuil de décision : {OPTIMAL_THRESHOLD} — {refused} refus sur {len(batch_results)} clients")
+        st.dataframe(batch_results, height=400)
+        st.download_button(
+            "Télécharger les résultats (CSV)",
+            data=batch_results.to_csv(index=False).encode("utf-8"),
+            file_name="predictions_lot.csv",
+            mime="text/csv",
+        )
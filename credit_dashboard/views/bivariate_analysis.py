@@ -0,0 +1,56 @@
+################## Page "Analyse Bi-Variée" ########################
+import streamlit as st
+
+from credit_dashboard.bivariate import get_bivariate_engine, view_figure
+from credit_dashboard.config import BIVARIATE_SCATTER_MAX
+from credit_dashboard.data_store import get_population_store
+
+
+def render():
+    population_store = get_population_store()
+    bivariate_engine = get_bivariate_engine()
+
+    st.title("Analyse Bi-Variée")
+
+    if population_store.available():
+        # Vérifiez si les données sont bien chargées
+        if population_store.num_rows == 0:
+            st.warning("Le fichier de données des clients est vide ou n'a pas été chargé correctement.")
+        else:
+            # Liste des colonnes disponibles (excluant SK_ID_CURR)
+            available_features = population_store.feature_names()
+
+            # Sélection des deux features (X et Y)
+            feature_x = st.selectbox("Choisissez la 1ère variable (X)", available_features)
+            feature_y = st.selectbox("Choisissez la 2ème variable (Y)", available_features)
+
+            if feature_x and feature_y:
+                # Vérifiez si les colonnes sont disponibles dans les données
+                if feature_x not in available_features or feature_y not in available_features:
+                    st.error(f"Les colonnes '{feature_x}' ou '{feature_y}' ne sont pas présentes dans le DataFrame.")
+                else:
+                    # Au-delà d'un certain volume, échantillon stratifié ou carte de densité
+                    strategy = None
+                    if population_store.num_rows > BIVARIATE_SCATTER_MAX:
+                        strategy_labels = {"Échantillon stratifié": "sample", "Carte de densité": "density"}
+                        strategy = strategy_labels[st.radio("Représentation", list(strategy_labels), horizontal=True)]
+
+                    view = bivariate_engine.view(feature_x, feature_y, strategy)
+
+                    if view.total == 0:
+                        st.warning(f"Aucune donnée disponible après suppression des NaN pour les colonnes '{feature_x}' et '{feature_y}'.")
+                    else:
+                        # Création du graphique interactif
+                        st.plotly_chart(view_figure(view))
+                        if view.strategy == "density":
+                            st.caption(
+                                f"Cette carte de densité montre la relation entre {feature_x} et {feature_y} "
+                                f"pour l'ensemble des {view.total} clients. Le survol d'une case indique son taux de défaut (si disponible)."
+                            )
+                        else:
+                            st.caption(
+                                f"Ce graphique de dispersion montre la relation entre {feature_x} et {feature_y} "
+                                f"pour {len(view.x)} clients sur {view.total}. Les points sont colorés en fonction de la variable 'default_status' (si disponible)."
+                            )
+    else:
+        st.warning("Les données des clients ne sont pas disponibles.")
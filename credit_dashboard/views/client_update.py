@@ -0,0 +1,104 @@
+################## Page "Modification des informations" ########################
+import numpy as np
+import streamlit as st
+
+from credit_dashboard.charts import gauge_figure, sensitivity_figure
+from credit_dashboard.client_index import get_client_index
+from credit_dashboard.config import OPTIMAL_THRESHOLD
+from credit_dashboard.gateway import get_prediction_gateway
+from credit_dashboard.scoring import get_scoring_service
+from credit_dashboard.views.widgets import client_picker
+from credit_dashboard.what_if import WHAT_IF_FEATURES, WHAT_IF_GRID_SIZE
+
+
+def render():
+    api = get_scoring_service()
+    gateway = get_prediction_gateway()
+
+    st.title("Modification des informations")
+
+    # Index des identifiants côté serveur : seuls les résultats de la recherche sont affichés
+    client_index = get_client_index()
+
+    if len(client_index):
+        selected_id = client_picker(client_index, key="client_update")
+
+        if selected_id:
+            # Simulation locale : le vecteur du client est gardé en mémoire pour la session
+            what_if = st.session_state.get("what_if")
+            if what_if is None or what_if.client_id != selected_id:
+                what_if = api.what_if_session(selected_id)
+                st.session_state.what_if = what_if
+
+            if what_if is not None:
+                client_info = {feature: what_if.value(feature, current=False) or 0 for feature in WHAT_IF_FEATURES}
+            else:
+                # Sans modèle local, l'endpoint /predict fournit les informations du client
+                response = gateway.predict(selected_id)
+                client_info = response.data.get("client_info", {}) if response.ok else None
+
+            if client_info is not None:
+                # Convertir les valeurs récupérées en types numériques appropriés
+                current_income = float(client_info.get("AMT_INCOME_TOTAL", 0.0))
+                current_credit_amount = float(client_info.get("AMT_CREDIT", 0.0))
+                current_children = int(client_info.get("CNT_CHILDREN", 0))
+                current_goods_price = float(client_info.get("AMT_GOODS_PRICE", 0.0))
+
+                # Affichage des champs avec valeurs actuelles (réinitialisés à chaque changement de client)
+                new_income = st.number_input("Revenus annuel total du client (€)", value=current_income, step=1000.0, min_value=0.0, key=f"income_{selected_id}")
+                new_credit_amount = st.number_input("Montant du crédit (€)", value=current_credit_amount, step=1000.0, min_value=0.0, key=f"credit_{selected_id}")
+                new_children = st.number_input("Nombre d'enfants", value=current_children, step=1, min_value=0, key=f"children_{selected_id}")
+                new_goods_price = st.number_input("Montant des biens (€)", value=current_goods_price, step=1000.0, min_value=0.0, key=f"goods_{selected_id}")
+
+                # Préparer les données modifiées
+                payload = {
+                    "SK_ID_CURR": selected_id,
+                    "AMT_INCOME_TOTAL": new_income,
+                    "AMT_CREDIT": new_credit_amount,
+                    "CNT_CHILDREN": new_children,
+                    "AMT_GOODS_PRICE": new_goods_price
+                }
+
+                prediction = None
+                if what_if is not None:
+                    # Nouveau score à chaque modification, sans aller-retour réseau
+                    prediction = what_if.update(**{feature: payload[feature] for feature in WHAT_IF_FEATURES})
+                elif st.button("Mettre à jour et prédire"):
+                    # Envoyer les données modifiées à l'API
+                    response = api.predict_with_custom_values(payload)
+                    if response.ok:
+                        prediction = response.data.get("probability_of_default", None)
+                    else:
+                        st.error("Erreur lors de la mise à jour ou de la prédiction.")
+
+                if prediction is not None:
+                    # Définir le seuil optimal
+                    optimal_threshold = OPTIMAL_THRESHOLD
+                    st.subheader("Résultat de la prédiction")
+
+                    # Afficher la jauge avec Plotly
+                    st.plotly_chart(gauge_figure(prediction, optimal_threshold))
+
+                if what_if is not None:
+                    # Courbe de la probabilité lorsqu'une variable varie, les autres restant fixes
+                    st.subheader("Sensibilité de la prédiction")
+                    sweep_labels = {
+                        "Montant du crédit (€)": "AMT_CREDIT",
+                        "Revenus annuel total du client (€)": "AMT_INCOME_TOTAL",
+                        "Montant des biens (€)": "AMT_GOODS_PRICE",
+                        "Nombre d'enfants": "CNT_CHILDREN",
+                    }
+                    sweep_label = st.selectbox("Variable à faire varier", list(sweep_labels))
+                    sweep_feature = sweep_labels[sweep_label]
+                    current_value = payload[sweep_feature]
+                    if sweep_feature == "CNT_CHILDREN":
+                        grid = np.arange(0, max(current_value, 5) + 1)
+                    else:
+                        grid = np.linspace(0, max(2 * current_value, 100000.0), WHAT_IF_GRID_SIZE)
+                    probabilities = what_if.sweep(sweep_feature, grid)
+
+                    st.plotly_chart(sensitivity_figure(grid, probabilities, current_value, sweep_label))
+            else:
+                st.error("Impossible de récupérer les informations du client.")
+    else:
+        st.warning("Aucun client disponible. Veuillez vérifier les données ou l'API.")
@@ -0,0 +1,15 @@
+################## Panneau de diagnostic (mesures de performance) ########################
+import pandas as pd
+import streamlit as st
+
+from credit_dashboard.charts import figure_cache
+from credit_dashboard.metrics import metrics
+from credit_dashboard.scoring import get_scoring_service
+
+
+def render():
+    with st.sidebar.expander("Diagnostic", expanded=True):
+        st.dataframe(pd.DataFrame(metrics.rows()), hide_index=True)
+        st.write("Cache API :", get_scoring_service().cache_stats())
+        st.write("Cache des graphiques :", figure_cache.stats())
+        st.code(metrics.prometheus_text(), language="text")
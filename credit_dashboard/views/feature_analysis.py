@@ -0,0 +1,96 @@
+################## Page "Analyse des Caractéristiques" ########################
+import numpy as np
+import streamlit as st
+
+from credit_dashboard.charts import distribution_figure
+from credit_dashboard.client_index import get_client_index
+from credit_dashboard.cohorts import COHORT_DIMENSIONS, get_cohort_engine
+from credit_dashboard.data_store import get_population_store
+from credit_dashboard.fanout import gather
+from credit_dashboard.feature_stats import get_feature_stats_index, transform_value
+from credit_dashboard.gateway import get_prediction_gateway
+from credit_dashboard.views.widgets import client_picker
+
+
+def render():
+    gateway = get_prediction_gateway()
+    population_store = get_population_store()
+    feature_stats = get_feature_stats_index()
+    cohort_engine = get_cohort_engine()
+
+    st.title("Analyse des Caractéristiques Clients")
+
+    # Vérifier si les données globales des clients sont disponibles
+    if population_store.available():
+        # Liste de toutes les colonnes (features) disponibles, excluant `SK_ID_CURR`
+        all_features = population_store.feature_names()
+
+        # Index des identifiants côté serveur : seuls les résultats de la recherche sont affichés
+        client_index = get_client_index()
+
+        if len(client_index):
+            selected_id = client_picker(client_index, key="feature_analysis")
+
+            if selected_id:
+                # Sélection de la caractéristique à analyser
+                feature_selected = st.selectbox(
+                    "Choisissez une caractéristique à explorer",
+                    all_features
+                )
+
+                # Appel API pour obtenir les données du client, en parallèle de la lecture de la distribution
+                # (précalculée ; AGE et années d'emploi dérivés de DAYS_BIRTH et DAYS_EMPLOYED)
+                response, stats = gather(
+                    lambda: gateway.predict(selected_id),
+                    lambda: feature_stats.get(feature_selected),
+                )
+                if response.ok:
+                    data = response.data
+                    client_value = data.get("client_info", {}).get(feature_selected)
+
+                    client_value = transform_value(feature_selected, client_value)
+                    raw_feature, feature_selected = feature_selected, stats.name
+
+                    # Vérifier si la caractéristique est disponible dans les données
+                    if stats.count:
+                        # Histogramme et densité précalculés, ligne pointillée pour le client sélectionné
+                        st.plotly_chart(distribution_figure(stats, client_value, population_store.version))
+
+                        st.caption(
+                            f"Ce graphique montre la répartition de la caractéristique '{feature_selected}' "
+                            f"dans l'ensemble des clients. La ligne pointillée rouge représente la valeur pour le client sélectionné."
+                        )
+                        percentile = stats.percentile(client_value)
+                        if percentile is not None:
+                            st.write(f"Le client se situe au **{percentile:.0f}ᵉ centile** de la population.")
+                        elif stats.name == "YEARS_EMPLOYED":
+                            st.write("Client sélectionné : Non employé")
+
+                        # Comparaison avec les clients similaires (agrégats précalculés par cohorte)
+                        if stats.is_numeric:
+                            st.subheader("Comparaison avec des clients similaires")
+                            dimensions = cohort_engine.available_dimensions()
+                            selected_dimensions = st.multiselect(
+                                "Clients ayant le même...",
+                                dimensions,
+                                default=[name for name in ("gender", "age_band") if name in dimensions],
+                                format_func=lambda name: COHORT_DIMENSIONS[name].label,
+                            )
+                            cohort = cohort_engine.client_position(selected_id, raw_feature, selected_dimensions)
+                            if cohort is None or cohort.percentile is None:
+                                st.info("Le client ne peut pas être rattaché à une cohorte pour cette caractéristique.")
+                            else:
+                                col_count, col_rate, col_median, col_percentile = st.columns(4)
+                                col_count.metric("Clients de la cohorte", f"{cohort.count:,}".replace(",", " "))
+                                col_rate.metric("Taux de défaut", "-" if np.isnan(cohort.default_rate) else f"{cohort.default_rate:.1%}")
+                                col_median.metric(f"Médiane de {feature_selected}", f"{cohort.median:,.2f}")
+                                col_percentile.metric("Centile du client", f"{cohort.percentile:.0f}ᵉ")
+                                st.caption(f"Cohorte : {cohort.label}")
+                    else:
+                        st.warning(f"La caractéristique {feature_selected} n'est pas disponible dans les données des clients.")
+                else:
+                    st.error("Impossible de récupérer les informations du client sélectionné.")
+        else:
+            st.warning("Aucun client disponible. Veuillez vérifier les données.")
+    else:
+        st.warning("Les données globales des clients ne sont pas disponibles pour la comparaison.")
@@ -0,0 +1,36 @@
+################## Page d'accueil ########################
+import streamlit as st
+
+
+def render():
+    # Titre principal avec HTML pour du style
+    st.markdown(
+        "<h1 style='text-align: center; color: #4CAF50;'>Bienvenue sur le Dashboard de Simulation de Risque de Crédit</h1>",
+        unsafe_allow_html=True,
+    )
+
+    # Intégration de l'image
+    st.image("pret_a_depense.png", use_container_width=True, caption="Prêt à dépenser - Analyse de risque de crédit")
+
+    # Description sous l'image avec texte plus grand
+    st.markdown(
+        """
+        <h2 style='text-align: center;'>Ce tableau de bord vous permet de :</h2>
+        <ul style='font-size: 20px;'>
+            <li><b>Visualiser</b> les prédictions de risque de crédit pour chaque client.</li>
+            <li><b>Comparer</b> les caractéristiques d'un client à l'ensemble de la population.</li>
+            <li><b>Explorer</b> les relations entre différentes variables.</li>
+            <li><b>Modifier</b> les informations client pour recalculer les scores en temps réel.</li>
+        </ul>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Note ou footer en bas
+    st.markdown(
+        """
+        <hr>
+        <p style='text-align: center; color: gray;'>Utilisez le menu latéral pour naviguer entre les sections du tableau de bord.</p>
+        """,
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,94 @@
+################## Page "Prédiction nouveau client" ########################
+import streamlit as st
+
+from credit_dashboard.charts import gauge_figure, shap_frame, shap_top_figure
+from credit_dashboard.config import OPTIMAL_THRESHOLD
+from credit_dashboard.data_store import get_population_store
+from credit_dashboard.scoring import get_scoring_service
+from credit_dashboard.similarity import get_new_client_similarity_index
+from credit_dashboard.views.widgets import similar_clients
+
+
+def render():
+    api = get_scoring_service()
+
+    st.title("Prédiction nouveau client")
+
+    # Initialiser le session_state pour stocker l'ID
+    if "new_client_id" not in st.session_state:
+        # Récupérer le prochain ID depuis l'API uniquement au premier chargement
+        response = api.get_next_client_id()
+        if response.ok:
+            st.session_state.new_client_id = response.data.get("next_id")
+        else:
+            st.error("Erreur lors de la récupération du prochain ID client.")
+            st.session_state.new_client_id = None
+
+    # Utiliser l'ID stocké dans session_state
+    new_id = st.session_state.new_client_id
+    if new_id:
+        st.write(f"**Nouvel ID client : {new_id}**")
+
+        # Saisie des informations principales
+        new_gender = st.selectbox("Sexe", options=["Homme", "Femme"], index=0)
+        new_age = st.number_input("Âge (années)", value=30, step=1)
+        new_children = st.number_input("Nombre d'enfants", value=0, step=1, min_value=0)
+        new_income = st.number_input("Revenu annuel total (€)", value=0.0, step=1000.0, min_value=0.0)
+        new_goods_price = st.number_input("Montant des biens (€)", value=0.0, step=1000.0, min_value=0.0)
+        new_credit_amount = st.number_input("Montant du crédit (€)", value=0.0, step=1000.0, min_value=0.0)
+
+        # Transformation du sexe pour correspondre au modèle
+        code_gender_f = 1 if new_gender == "Femme" else 0
+        code_gender_m = 1 if new_gender == "Homme" else 0
+
+        # Envoyer la requête pour obtenir le score et la probabilité
+        if st.button("Calculer le Score et la Probabilité"):
+            # Préparer les données pour les colonnes nécessaires
+            payload = {
+                "SK_ID_CURR": new_id,
+                "CODE_GENDER_F": code_gender_f,
+                "CODE_GENDER_M": code_gender_m,
+                "DAYS_BIRTH": -new_age * 365,  # Transformer l'âge en jours
+                "CNT_CHILDREN": new_children,
+                "AMT_INCOME_TOTAL": new_income,
+                "AMT_GOODS_PRICE": new_goods_price,
+                "AMT_CREDIT": new_credit_amount
+            }
+
+            # Appeler l'API pour calculer le score
+            response = api.predict_new_client(payload)
+
+            if response.ok:
+                data = response.data
+                prediction = data.get("probability_of_default", None)
+                shap_values = data.get("shap_values", [])
+                feature_names = data.get("feature_names", [])
+
+                # Définir le seuil optimal
+                optimal_threshold = OPTIMAL_THRESHOLD
+                st.subheader("Résultat de la prédiction")
+
+                # Afficher la jauge avec Plotly
+                st.plotly_chart(gauge_figure(prediction, optimal_threshold))
+
+                # SECTION 2 : Graphique des 10 principales caractéristiques locales importantes
+                st.subheader("Caractéristiques locales importantes")
+                shap_df = shap_frame(feature_names, shap_values)
+                shap_df_top = shap_df.head(10)
+
+                # Graphique des SHAP values
+                st.plotly_chart(shap_top_figure(shap_df_top))
+
+                # SECTION 3 : Clients existants les plus proches du nouveau client
+                if get_population_store().available():
+                    try:
+                        neighbours = get_new_client_similarity_index().neighbours_of_values(payload)
+                    except (KeyError, OSError):
+                        st.warning("Impossible de rechercher les clients similaires.")
+                    else:
+                        similar_clients(neighbours, basis="saisies dans le formulaire")
+
+            else:
+                st.error("Erreur lors du calcul de la probabilité pour le nouveau client.")
+    else:
+        st.warning("Impossible de générer un nouvel ID client. Vérifiez l'API.")
@@ -0,0 +1,109 @@
+################## Page "Prédictions" ########################
+import pandas as pd
+import streamlit as st
+
+from credit_dashboard.charts import comparison_figure, gauge_figure, shap_frame, shap_top_figure
+from credit_dashboard.client_index import get_client_index
+from credit_dashboard.config import OPTIMAL_THRESHOLD
+from credit_dashboard.data_store import get_population_store
+from credit_dashboard.fanout import submit
+from credit_dashboard.gateway import get_prediction_gateway
+from credit_dashboard.scoring import get_scoring_service
+from credit_dashboard.similarity import get_similarity_index
+from credit_dashboard.views.widgets import client_picker, similar_clients
+
+
+def render():
+    api = get_scoring_service()
+    gateway = get_prediction_gateway()
+
+    st.title("Prédictions pour un Client Existant")
+
+    # Index des identifiants côté serveur : seuls les résultats de la recherche sont affichés
+    client_index = get_client_index()
+
+    if len(client_index):
+        selected_id = client_picker(client_index, key="predictions")
+
+        if selected_id is not None and st.button("Obtenir la prédiction"):
+            # Importances globales et voisins demandés en parallèle de la prédiction
+            global_future = submit(api.get_global_importance)
+            neighbours_future = None
+            if get_population_store().available():
+                neighbours_future = submit(lambda: get_similarity_index().neighbours(selected_id))
+            response = gateway.predict(selected_id)
+            if response.ok:
+                data = response.data
+                prediction = data.get("probability_of_default", None)
+                shap_values = data.get("shap_values", [])
+                feature_names = data.get("feature_names", [])
+                client_info = data.get("client_info", {})
+
+                # SECTION 0 : Informations descriptives du client
+                st.subheader("Informations descriptives du client")
+
+                if client_info:  # Vérifiez si les informations sont disponibles
+                    filtered_info = {
+                        "Sexe": "Femme" if client_info.get("CODE_GENDER_F", 0) == 1 else "Homme",
+                        "Âge (années)": abs(client_info.get("DAYS_BIRTH", 0)) // 365,
+                        "Nombre d'enfants": client_info.get("CNT_CHILDREN", 0),
+                        "Revenu annuel total (€)": f"{client_info.get('AMT_INCOME_TOTAL', 0):,.2f}",
+                        "Montant du crédit (€)": f"{client_info.get('AMT_CREDIT', 0):,.2f}",
+                        "Durée d'emploi (années)": abs(client_info.get("DAYS_EMPLOYED", 0)) // 365 
+                                                    if client_info.get("DAYS_EMPLOYED", 0) < 0 else "Non employé"
+                    }
+                    filtered_info_df = pd.DataFrame(filtered_info.items(), columns=["Caractéristique", "Valeur"])
+                    st.table(filtered_info_df)
+                else:
+                    st.warning("Les informations descriptives du client ne sont pas disponibles.")
+
+                # SECTION 1 : Résultat de la prédiction avec jauge
+                st.subheader("Résultat de la prédiction")
+                optimal_threshold = OPTIMAL_THRESHOLD
+
+                # Afficher la jauge avec Plotly
+                st.plotly_chart(gauge_figure(prediction, optimal_threshold))
+
+                # SECTION 2 : Graphique des 10 principales caractéristiques locales importantes
+                st.subheader("Caractéristiques locales")
+                shap_df = shap_frame(feature_names, shap_values)
+                shap_df_top = shap_df.head(10)
+
+                # Graphique des SHAP values
+                st.plotly_chart(shap_top_figure(shap_df_top))
+
+                # SECTION 3 : Tableau interactif des SHAP values
+                st.subheader("Tableau interactif des SHAP values")
+                st.dataframe(shap_df.style.set_properties(**{'font-size': '14pt', 'padding': '5px'}), height=400)
+
+                # SECTION 4 : Comparaison des caractéristiques locales et globales
+                st.subheader("Comparaison des caractéristiques locales et globales")
+                
+                # Importances globales demandées avec la prédiction
+                with st.spinner("Chargement des importances globales..."):
+                    global_response = global_future.result()
+                if global_response.ok:
+                    global_data = global_response.data.get("global_importances", [])
+                    global_shap_df = pd.DataFrame(global_data)
+
+                    # Fusion des données locales et globales
+                    comparison_df = shap_df_top.merge(global_shap_df, on="Feature", how="inner")
+                    # Renommer les colonnes pour le graphique
+                    comparison_df.rename(columns={
+                        "Importance": "Caracteristiques locale client",
+                        "Global Importance": "Caracteristiques globales"
+                    }, inplace=True)
+                    # Créer un graphique comparatif
+                    st.plotly_chart(comparison_figure(comparison_df))
+                else:
+                    st.warning("Impossible de récupérer les importances globales. Vérifiez l'API.")
+
+                # SECTION 5 : Clients les plus proches et leur issue
+                if neighbours_future is not None:
+                    try:
+                        neighbours = neighbours_future.result()
+                    except (KeyError, OSError):
+                        # Index absent ou illisible : la prédiction reste affichée
+                        st.warning("Impossible de rechercher les clients similaires.")
+                    else:
+                        similar_clients(neighbours)
@@ -0,0 +1,44 @@
+################## Composants partagés entre les pages ########################
+import numpy as np
+import streamlit as st
+
+from credit_dashboard.client_index import PAGE_SIZE
+
+
+def client_picker(client_index, key, label="Choisissez un ID client (SK_ID_CURR)"):
+    """
+    Recherche d'un client par début d'identifiant : seule la page de résultats courante
+    est envoyée au navigateur, jamais la liste complète.
+    """
+    prefix = st.text_input(
+        "Rechercher un ID client", key=f"{key}_search", placeholder="Début de l'identifiant, ex. 1002"
+    ).strip()
+    matches, total = client_index.search(prefix)
+    if not total:
+        st.warning("Aucun client ne correspond à cette recherche.")
+        return None
+    if total > PAGE_SIZE:
+        pages = -(-total // PAGE_SIZE)
+        # Une nouvelle recherche repart de la première page
+        page = st.number_input(
+            f"Page de résultats (sur {pages})", min_value=1, max_value=pages, value=1, step=1,
+            key=f"{key}_page_{prefix}",
+        )
+        matches, _ = client_index.search(prefix, offset=(int(page) - 1) * PAGE_SIZE)
+    st.caption(f"{total} client(s) correspondant(s)")
+    return st.selectbox(label, matches.tolist(), key=f"{key}_select")
+
+
+def similar_clients(neighbours, basis="les plus importantes pour le modèle"):
+    """Tableau des clients les plus proches et de leur issue (default_status)."""
+    st.subheader("Clients similaires")
+    if neighbours is None or neighbours.empty:
+        st.info("Aucun client similaire n'a été trouvé.")
+        return
+    st.dataframe(neighbours, hide_index=True)
+    outcomes = neighbours["default_status"].to_numpy(np.float64)
+    if np.isfinite(outcomes).any():
+        st.caption(
+            f"{int(np.nansum(outcomes))} client(s) en défaut parmi les {len(neighbours)} plus proches "
+            f"(variables standardisées {basis})."
+        )
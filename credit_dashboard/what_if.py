@@ -0,0 +1,69 @@
+################## Simulation "what-if" sur un client existant ########################
+import numpy as np
+
+# Variables modifiables depuis la page "Modification des informations"
+WHAT_IF_FEATURES = ["AMT_INCOME_TOTAL", "AMT_CREDIT", "CNT_CHILDREN", "AMT_GOODS_PRICE"]
+
+# Nombre de points de la courbe de sensibilité
+WHAT_IF_GRID_SIZE = 60
+
+
+class WhatIfSession:
+    """
+    Vecteur de variables d'un client conservé en mémoire.
+    Seules les variables modifiées sont mises à jour avant un nouveau scoring local,
+    et une variable peut être balayée sur une grille en un seul appel vectorisé.
+    """
+
+    def __init__(self, engine, client_id):
+        X, found = engine.client_matrix([client_id])
+        if not found[0]:
+            raise KeyError(f"Client inconnu : {client_id}")
+        self.engine = engine
+        self.client_id = client_id
+        self.base = X[0]
+        self.current = self.base.copy()
+        self._probability = None
+
+    def _index(self, feature):
+        try:
+            return self.engine.feature_index[feature]
+        except KeyError:
+            raise KeyError(f"Variable absente du modèle : {feature}") from None
+
+    def value(self, feature, current=True):
+        vector = self.current if current else self.base
+        value = vector[self._index(feature)]
+        return None if np.isnan(value) else float(value)
+
+    def update(self, **changes):
+        """Applique les variables modifiées et retourne la probabilité de défaut."""
+        for feature, value in changes.items():
+            index = self._index(feature)
+            value = np.nan if value is None else float(value)
+            if not np.array_equal(self.current[index], value, equal_nan=True):
+                self.current[index] = value
+                self._probability = None
+        return self.probability
+
+    @property
+    def probability(self):
+        # Le score n'est recalculé que si le vecteur a changé depuis le dernier appel
+        if self._probability is None:
+            self._probability = float(self.engine.predict_proba(self.current[None, :])[0])
+        return self._probability
+
+    def reset(self):
+        self.current = self.base.copy()
+        self._probability = None
+
+    def sweep(self, feature, grid):
+        """Probabilités de défaut lorsque `feature` parcourt `grid`, les autres variables restant fixes."""
+        grid = np.asarray(grid, dtype=np.float64)
+        X = np.repeat(self.current[None, :], len(grid), axis=0)
+        X[:, self._index(feature)] = grid
+        return self.engine.predict_proba(X)
+
+    def changed_features(self):
+        changed = ~np.isclose(self.current, self.base, equal_nan=True)
+        return [name for name, flag in zip(self.engine.feature_names, changed) if flag]
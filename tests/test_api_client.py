@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from credit_dashboard.api_client import ApiClient, ApiResult, TTLCache
+
+
+class CountingClient(ApiClient):
+    """ApiClient dont `_send` ne touche pas le réseau : réponses programmées et appels comptés."""
+
+    def __init__(self, responses, delay=0.0, **kwargs):
+        super().__init__("http://api.test", **kwargs)
+        self.responses = list(responses)
+        self.delay = delay
+        self.sent = 0
+        self._sent_lock = threading.Lock()
+
+    def _send(self, method, endpoint, payload):
+        with self._sent_lock:
+            self.sent += 1
+            response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        time.sleep(self.delay)
+        return response
+
+
+def test_concurrent_identical_requests_share_one_send():
+    client = CountingClient([ApiResult(200, {"probability_of_default": 0.2})], delay=0.2)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: client.predict(100002), range(8)))
+    assert client.sent == 1
+    assert all(result.data == {"probability_of_default": 0.2} for result in results)
+    # Réponse suivante servie par le cache
+    assert client.predict(100002).cached
+
+
+def test_failed_request_is_not_cached():
+    client = CountingClient([ApiResult(503), ApiResult(200, {"probability_of_default": 0.2})])
+    assert client.predict(100002).status_code == 503
+    result = client.predict(100002)
+    assert result.ok and not result.cached
+    assert client.sent == 2
+
+
+def test_uncached_endpoint_always_sends():
+    client = CountingClient([ApiResult(200, {"SK_ID_CURR": 1})])
+    client.get_next_client_id()
+    client.get_next_client_id()
+    assert client.sent == 2
+
+
+def test_missing_batch_endpoint_is_remembered():
+    client = CountingClient([ApiResult(404)])
+    assert client.predict_batch([1, 2]) is None
+    assert client.predict_batch([3]) is None
+    assert client.sent == 1
+
+
+def test_retry_policy():
+    retry = ApiClient("http://api.test", retries=2).session.get_adapter("http://api.test").max_retries
+    assert retry.total == 2
+    assert set(retry.status_forcelist) == {429, 502, 503, 504}
+    assert "POST" in retry.allowed_methods
+
+
+def test_ttl_cache_expiry_and_lru(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" est la moins récemment utilisée
+    assert cache.get("b") is None
+    now[0] = 11.0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("status", [404, 0])
+def test_errors_are_not_shared_after_completion(status):
+    client = CountingClient([ApiResult(status), ApiResult(200, {"probability_of_default": 0.5})])
+    client.predict(1)
+    assert client.predict(1).ok
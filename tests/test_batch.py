@@ -0,0 +1,88 @@
+import math
+import time
+
+import pandas as pd
+
+from credit_dashboard.api_client import ApiResult
+from credit_dashboard.batch import decision_label, parse_client_ids, score_existing_clients
+
+
+class FakeApi:
+    """API sans endpoint batch : /predict répond 404 pour les identifiants de `missing`."""
+
+    def __init__(self, probabilities, missing=(), batch=None):
+        self.probabilities = probabilities
+        self.missing = set(missing)
+        self.batch = batch
+
+    def predict_batch(self, client_ids):
+        return self.batch
+
+    def predict(self, client_id):
+        if client_id in self.missing:
+            return ApiResult(404, {"detail": "Client introuvable"})
+        return ApiResult(200, {"probability_of_default": self.probabilities[client_id]})
+
+
+def _score(api, client_ids, **kwargs):
+    return pd.concat(score_existing_clients(api, client_ids, **kwargs)).set_index("SK_ID_CURR")
+
+
+def test_decision_label_threshold():
+    assert decision_label(0.5, threshold=0.5) == "Refusé"
+    assert decision_label(0.1, threshold=0.5) == "Accordé"
+
+
+def test_decision_label_without_probability():
+    assert decision_label(None) is None
+    assert decision_label(math.nan) is None
+
+
+def test_partial_failures_are_never_approved():
+    api = FakeApi({1: 0.01, 3: 0.9}, missing={2, 4})
+    results = _score(api, [1, 2, 3, 4], chunk_size=4, threshold=0.5)
+    assert results.loc[1, "decision"] == "Accordé"
+    assert results.loc[3, "decision"] == "Refusé"
+    for client_id in (2, 4):
+        assert pd.isna(results.loc[client_id, "decision"])
+        assert results.loc[client_id, "status"] == "HTTP 404"
+    assert (results.loc[[1, 3], "status"] == "ok").all()
+
+
+def test_batch_response_without_probability():
+    # Forme renvoyée par le modèle local pour un identifiant inconnu
+    batch = ApiResult(200, {"predictions": [
+        {"SK_ID_CURR": 1, "probability_of_default": 0.01},
+        {"SK_ID_CURR": 2, "probability_of_default": None},
+    ]})
+    results = _score(FakeApi({}, batch=batch), [1, 2], threshold=0.5)
+    assert results.loc[1, ["decision", "status"]].tolist() == ["Accordé", "ok"]
+    assert pd.isna(results.loc[2, "decision"])
+    assert results.loc[2, "status"] == "client introuvable"
+
+
+def test_batch_http_error_marks_whole_chunk():
+    results = _score(FakeApi({}, batch=ApiResult(503)), [1, 2], threshold=0.5)
+    assert results["decision"].isna().all()
+    assert (results["status"] == "HTTP 503").all()
+
+
+def test_parse_client_ids_deduplicates():
+    assert parse_client_ids("100002, 100003;100002\nabc 100004") == [100002, 100003, 100004]
+
+
+def test_closing_the_run_cancels_pending_chunks():
+    api = FakeApi({client_id: 0.01 for client_id in range(100)})
+    calls = []
+    predict = api.predict
+
+    def slow_predict(client_id):
+        calls.append(client_id)
+        time.sleep(0.01)
+        return predict(client_id)
+
+    api.predict = slow_predict
+    batches = score_existing_clients(api, list(range(100)), chunk_size=1, max_workers=1)
+    next(batches)
+    batches.close()
+    assert len(calls) < 100
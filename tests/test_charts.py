@@ -0,0 +1,9 @@
+from credit_dashboard.charts import gauge_figure
+
+
+def test_gauge_colour_uses_raw_probability():
+    # 0.079996 et 0.080004 ont le même arrondi mais pas la même décision
+    accepted = gauge_figure(0.079996, threshold=0.08)
+    refused = gauge_figure(0.080004, threshold=0.08)
+    assert accepted["data"][0]["gauge"]["bar"]["color"] == "green"
+    assert refused["data"][0]["gauge"]["bar"]["color"] == "red"
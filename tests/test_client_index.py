@@ -0,0 +1,126 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from credit_dashboard import client_index
+from credit_dashboard.client_index import ClientIndex, get_client_index
+
+
+@pytest.fixture
+def index():
+    return ClientIndex([5, 12, 120, 129, 130, 1200, 1299, 1300, 100002, 12, 0])
+
+
+def test_ids_are_sorted_and_unique(index):
+    assert index.ids.tolist() == [0, 5, 12, 120, 129, 130, 1200, 1299, 1300, 100002]
+    assert 129 in index
+    assert 128 not in index
+    assert "abc" not in index
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("", [0, 5, 12, 120, 129, 130, 1200, 1299, 1300, 100002]),
+    ("12", [12, 120, 129, 1200, 1299]),
+    ("13", [130, 1300]),
+    ("0", [0]),
+    ("05", []),
+    ("1x", []),
+    ("9", []),
+])
+def test_prefix_search(index, prefix, expected):
+    matches, total = index.search(prefix, limit=100)
+    assert matches.tolist() == expected
+    assert total == len(expected)
+
+
+def test_pagination_spans_intervals(index):
+    pages = [index.search("12", offset=offset, limit=2)[0].tolist() for offset in (0, 2, 4, 6)]
+    assert pages == [[12, 120], [129, 1200], [1299], []]
+
+
+def test_range(index):
+    matches, total = index.range(100, 1299, offset=1, limit=3)
+    assert matches.tolist() == [129, 130, 1200]
+    assert total == 5
+
+
+def test_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    index = ClientIndex(rng.integers(100000, 460000, 5000))
+    for prefix in ("1", "10", "123", "4599", "45999"):
+        expected = [value for value in index.ids.tolist() if str(value).startswith(prefix)]
+        matches, total = index.search(prefix, limit=len(index))
+        assert matches.tolist() == expected
+        assert total == len(expected)
+
+
+class FakeService:
+    def __init__(self, client_ids, delay=0.0):
+        self.client_ids = client_ids
+        self.delay = delay
+        self.calls = 0
+
+    def get_client_ids(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return list(self.client_ids)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    fake = FakeService([3, 1, 2])
+    monkeypatch.setattr(client_index, "get_scoring_service", lambda: fake)
+    monkeypatch.setattr(client_index, "_index", None)
+    monkeypatch.setattr(client_index, "_index_expires", 0.0)
+    monkeypatch.setattr(client_index, "_refresh", None)
+    return fake
+
+
+def test_concurrent_first_load_fetches_once(service):
+    service.delay = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_client_index())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert service.calls == 1
+    assert all(result.ids.tolist() == [1, 2, 3] for result in results)
+
+
+def test_stale_index_served_during_refresh(service, monkeypatch):
+    first = get_client_index()
+    monkeypatch.setattr(client_index, "_index_expires", 0.0)
+    service.client_ids, service.delay = [4, 5], 0.2
+    start = time.monotonic()
+    assert get_client_index() is first
+    assert time.monotonic() - start < 0.1
+    deadline = time.monotonic() + 5
+    while client_index._refresh is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_client_index().ids.tolist() == [4, 5]
+
+
+def test_failure_is_retried_after_delay(service, monkeypatch):
+    service.client_ids = []
+    assert len(get_client_index()) == 0
+    assert len(get_client_index()) == 0
+    assert service.calls == 1
+    service.client_ids = [7]
+    monkeypatch.setattr(client_index, "_index_expires", 0.0)
+    get_client_index()
+    deadline = time.monotonic() + 5
+    while client_index._refresh is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_client_index().ids.tolist() == [7]
+
+
+def test_failed_first_load_returns_empty_index(service, monkeypatch):
+    def unavailable():
+        raise FileNotFoundError("clients_data.csv")
+
+    monkeypatch.setattr(service, "get_client_ids", unavailable)
+    assert len(get_client_index()) == 0
+    assert len(get_client_index()) == 0
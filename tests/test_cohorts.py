@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from credit_dashboard.cohorts import COHORT_DIMENSIONS, CohortAggregates, compute_cohort_aggregates
+from credit_dashboard.feature_stats import QUANTILE_LEVELS
+
+
+@pytest.fixture
+def population():
+    rng = np.random.default_rng(0)
+    n = 3000
+    values = rng.lognormal(11, 0.5, n)
+    values[::97] = np.nan
+    gender = rng.integers(0, 2, n).astype(float)
+    income = rng.uniform(20000, 400000, n)
+    income[::131] = np.nan
+    defaults = (rng.random(n) < 0.1).astype(float)
+    return values, gender, income, defaults
+
+
+def test_quantiles_and_rates_match_numpy(population):
+    values, gender, income, defaults = population
+    dimensions = ("gender", "income_bracket")
+    codes = [COHORT_DIMENSIONS[name].codes(column) for name, column in zip(dimensions, (gender, income))]
+    aggregates = compute_cohort_aggregates("AMT_CREDIT", values, dimensions, codes, defaults)
+    assert aggregates.shape == (2, 5)
+    for gender_code in range(2):
+        for income_code in range(5):
+            group = aggregates.group((gender_code, income_code))
+            members = np.isfinite(values) & (codes[0] == gender_code) & (codes[1] == income_code)
+            assert aggregates.counts[group] == members.sum()
+            if not members.any():
+                assert np.isnan(aggregates.quantiles[group]).all()
+                continue
+            np.testing.assert_allclose(
+                aggregates.quantiles[group], np.quantile(values[members], QUANTILE_LEVELS).astype(np.float32), rtol=1e-6,
+            )
+            assert aggregates.default_rate[group] == pytest.approx(defaults[members].mean(), rel=1e-6)
+
+
+def test_without_dimensions_is_whole_population(population):
+    values = population[0]
+    aggregates = compute_cohort_aggregates("AMT_CREDIT", values, (), [])
+    finite = values[np.isfinite(values)]
+    assert aggregates.group(()) == 0
+    assert aggregates.counts.tolist() == [len(finite)]
+    np.testing.assert_allclose(aggregates.quantiles[0], np.quantile(finite, QUANTILE_LEVELS), rtol=1e-6)
+    assert np.isnan(aggregates.default_rate[0])
+
+
+def test_group_label_and_percentile():
+    values = np.arange(1.0, 101.0)
+    codes = [COHORT_DIMENSIONS["gender"].codes(np.repeat([0.0, 1.0], 50))]
+    aggregates = compute_cohort_aggregates("X", values, ("gender",), codes)
+    assert aggregates.group((1,)) == 1
+    assert aggregates.group((-1,)) is None
+    assert aggregates.label((1,)) == "Femme"
+    assert aggregates.percentile(1, 51.0) == pytest.approx(0.0)
+    assert aggregates.percentile(1, 100.0) == pytest.approx(100.0)
+    assert aggregates.percentile(0, np.nan) is None
+
+
+def test_arrays_round_trip(population):
+    values, gender, _, defaults = population
+    codes = [COHORT_DIMENSIONS["gender"].codes(gender)]
+    aggregates = compute_cohort_aggregates("AMT_CREDIT", values, ("gender",), codes, defaults)
+    restored = CohortAggregates.from_arrays(aggregates.to_arrays())
+    assert restored.feature == "AMT_CREDIT"
+    assert restored.dimensions == ("gender",)
+    np.testing.assert_array_equal(restored.quantiles, aggregates.quantiles)
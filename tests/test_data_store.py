@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from credit_dashboard.data_store import PopulationStore, downcast_column
+
+
+def test_amounts_with_cents_stay_float64():
+    series = pd.Series([1234567.89, 250000.5, np.nan])
+    assert downcast_column(series).dtype == np.float64
+
+
+def test_exact_floats_are_downcast():
+    series = pd.Series([0.5, 270000.0, np.nan])
+    downcast = downcast_column(series)
+    assert downcast.dtype == np.float32
+    np.testing.assert_array_equal(downcast.to_numpy(np.float64), series.to_numpy())
+
+
+def test_integers_and_categories():
+    assert downcast_column(pd.Series([0, 1, 300])).dtype == np.int16
+    assert isinstance(downcast_column(pd.Series(["a", "b", "a", "a"])).dtype, pd.CategoricalDtype)
+
+
+def test_store_keeps_model_inputs_exact(tmp_path):
+    frame = pd.DataFrame({"SK_ID_CURR": [100002, 100003], "AMT_CREDIT": [406597.5, 1293502.55]})
+    frame.to_csv(tmp_path / "clients.csv", index=False)
+    store = PopulationStore(str(tmp_path / "clients.csv"), str(tmp_path / "cache"))
+    positions = store.locate([100003])
+    assert store.take_array(["AMT_CREDIT"], positions)[0, 0] == 1293502.55
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import gaussian_kde
+
+from credit_dashboard.feature_stats import QUANTILE_LEVELS, compute_feature_stats, gaussian_kde_binned
+
+
+def test_binned_kde_matches_scott_bandwidth():
+    values = np.random.default_rng(0).normal(50, 10, 5000)
+    grid, density = gaussian_kde_binned(values, values.min(), values.max())
+    # gaussian_kde utilise la règle de Scott par défaut, comme seaborn.kdeplot
+    expected = gaussian_kde(values)(grid) * len(values)
+    assert np.abs(density - expected).max() < 0.02 * expected.max()
+
+
+def test_binned_kde_degenerate():
+    assert gaussian_kde_binned(np.array([1.0]), 1.0, 1.0) == (None, None)
+    assert gaussian_kde_binned(np.full(10, 3.0), 3.0, 3.0) == (None, None)
+
+
+def test_numeric_stats():
+    series = pd.Series([1.0, 2.0, np.nan, 4.0, 8.0])
+    stats = compute_feature_stats("X", series)
+    assert (stats.count, stats.missing) == (4, 1)
+    assert stats.mean == pytest.approx(3.75)
+    np.testing.assert_allclose(stats.quantiles, np.quantile([1.0, 2.0, 4.0, 8.0], QUANTILE_LEVELS))
+    assert stats.counts.sum() == 4
+
+
+def test_categorical_stats():
+    stats = compute_feature_stats("C", pd.Series(["a", "b", "a", None]))
+    assert stats.kind == "categorical"
+    assert stats.categories.tolist() == ["a", "b"]
+    assert stats.counts.tolist() == [2, 1]
+    assert stats.missing == 1
@@ -0,0 +1,91 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from credit_dashboard.api_client import ApiResult
+from credit_dashboard.gateway import PredictionGateway
+
+
+class FakeService:
+    """Service de scoring local : chaque lot dure `delay` secondes et est enregistré."""
+
+    def __init__(self, local=True, delay=0.05, error=None):
+        self.local = local
+        self.delay = delay
+        self.error = error
+        self.batches = []
+        self.single_calls = []
+        self._lock = threading.Lock()
+
+    def uses_local_engine(self):
+        return self.local
+
+    def predict(self, client_id):
+        self.single_calls.append(client_id)
+        return ApiResult(200, {"probability_of_default": 0.5})
+
+    def predict_many(self, client_ids):
+        with self._lock:
+            self.batches.append(list(client_ids))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [ApiResult(200, {"SK_ID_CURR": client_id, "shap_values": [0.1]}) for client_id in client_ids]
+
+
+def _predict_all(gateway, client_ids):
+    with ThreadPoolExecutor(len(client_ids)) as pool:
+        return list(pool.map(gateway.predict, client_ids))
+
+
+def test_concurrent_requests_are_batched():
+    service = FakeService()
+    gateway = PredictionGateway(service, window=0.02)
+    results = _predict_all(gateway, list(range(20)))
+    assert [result.data["SK_ID_CURR"] for result in results] == list(range(20))
+    assert sorted(client_id for batch in service.batches for client_id in batch) == list(range(20))
+    assert len(service.batches) < 20
+
+
+def test_identical_ids_are_computed_once_and_copied():
+    service = FakeService(delay=0.2)
+    gateway = PredictionGateway(service)
+    first = threading.Thread(target=gateway.predict, args=(1,))
+    first.start()
+    time.sleep(0.05)
+    results = _predict_all(gateway, [2, 2, 2])
+    first.join()
+    assert sum(batch.count(2) for batch in service.batches) == 1
+    results[0].data["shap_values"].append(99)
+    assert results[1].data["shap_values"] == [0.1]
+    assert results[0] is not results[1]
+
+
+def test_remote_mode_passes_through():
+    service = FakeService(local=False)
+    gateway = PredictionGateway(service)
+    assert gateway.predict(7).ok
+    assert service.single_calls == [7]
+    assert service.batches == []
+
+
+def test_local_failure_returns_failed_results():
+    service = FakeService(error=FileNotFoundError("best_model_lgb_no.pkl"))
+    gateway = PredictionGateway(service)
+    results = _predict_all(gateway, [1, 2, 3])
+    assert [result.status_code for result in results] == [0, 0, 0]
+    # Le thread de la passerelle reste disponible après l'échec
+    service.error = None
+    assert gateway.predict(4).ok
+
+
+@pytest.mark.parametrize("client_ids", [[5], [5, 6]])
+def test_single_user_is_not_delayed(client_ids):
+    service = FakeService(delay=0.0)
+    gateway = PredictionGateway(service, window=1.0)
+    start = time.monotonic()
+    for client_id in client_ids:
+        gateway.predict(client_id)
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,100 @@
+import pytest
+
+from credit_dashboard import scoring
+from credit_dashboard.api_client import ApiResult
+from credit_dashboard.scoring import ScoringService
+
+
+class FakeApi:
+    """API distante : répond `status` à /predict et compte les appels."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = 0
+
+    def predict(self, client_id):
+        self.calls += 1
+        return ApiResult(self.status, {"probability_of_default": 0.9} if self.status == 200 else None)
+
+
+class FakeEngine:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def predict(self, client_id):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"probability_of_default": 0.1} if client_id == 1 else None
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = FakeEngine()
+    monkeypatch.setattr(scoring, "get_local_engine", lambda: fake)
+    return fake
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ScoringService("gpu", api=FakeApi())
+
+
+def test_local_mode_never_calls_the_api(engine):
+    api = FakeApi()
+    service = ScoringService("local", api=api)
+    assert service.predict(1).data == {"probability_of_default": 0.1}
+    assert service.predict(2).status_code == 404
+    assert api.calls == 0
+    assert service.uses_local_engine()
+
+
+def test_remote_mode_returns_api_errors(engine):
+    service = ScoringService("remote", api=FakeApi(status=503))
+    assert service.predict(1).status_code == 503
+    assert engine.calls == 0
+    assert not service.uses_local_engine()
+
+
+@pytest.mark.parametrize("status", [200, 404, 422])
+def test_auto_mode_keeps_api_answers(engine, status):
+    service = ScoringService("auto", api=FakeApi(status=status))
+    assert service.predict(1).status_code == status
+    assert engine.calls == 0
+
+
+@pytest.mark.parametrize("status", [0, 500, 503])
+def test_auto_mode_falls_back_on_server_errors(engine, status):
+    api = FakeApi(status=status)
+    service = ScoringService("auto", api=api)
+    assert service.predict(1).data == {"probability_of_default": 0.1}
+    assert engine.calls == 1
+    # Pendant la période de repli, l'API n'est plus appelée
+    assert service.uses_local_engine()
+    service.predict(1)
+    assert api.calls == 1
+
+
+def test_auto_mode_retries_the_api_after_cooldown(engine, monkeypatch):
+    api = FakeApi(status=503)
+    service = ScoringService("auto", api=api)
+    service.predict(1)
+    monkeypatch.setattr(service, "_remote_down_until", 0.0)
+    api.status = 200
+    assert service.predict(1).data == {"probability_of_default": 0.9}
+    assert api.calls == 2
+
+
+def test_auto_mode_local_failure_returns_remote_result(engine):
+    engine.error = FileNotFoundError("best_model_lgb_no.pkl")
+    service = ScoringService("auto", api=FakeApi(status=503))
+    assert service.predict(1).status_code == 503
+    # API en repli et modèle absent : échec réseau
+    assert service.predict(1).status_code == 0
+
+
+def test_local_mode_raises_local_errors(engine):
+    engine.error = FileNotFoundError("best_model_lgb_no.pkl")
+    with pytest.raises(FileNotFoundError):
+        ScoringService("local", api=FakeApi()).predict(1)
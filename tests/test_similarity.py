@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_dashboard.data_store import PopulationStore
+from credit_dashboard.similarity import NEW_CLIENT_FEATURES, SimilarityIndex
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 200
+    frame = pd.DataFrame({
+        "SK_ID_CURR": np.arange(100000, 100000 + n),
+        "EXT_SOURCE_2": rng.random(n),
+        "DAYS_BIRTH": -rng.integers(7000, 25000, n),
+        "AMT_INCOME_TOTAL": rng.integers(20000, 400000, n).astype(float),
+        "AMT_CREDIT": rng.integers(50000, 1000000, n).astype(float),
+        "default_status": rng.integers(0, 2, n),
+    })
+    frame.to_csv(tmp_path / "clients.csv", index=False)
+    return PopulationStore(str(tmp_path / "clients.csv"), str(tmp_path / "cache"))
+
+
+def test_new_client_index_uses_payload_fields(store, tmp_path):
+    index = SimilarityIndex(NEW_CLIENT_FEATURES, store, str(tmp_path / "cache"))
+    assert index.features == ["DAYS_BIRTH", "AMT_INCOME_TOTAL", "AMT_CREDIT"]
+    frame = store.load(["SK_ID_CURR", "DAYS_BIRTH", "AMT_INCOME_TOTAL", "AMT_CREDIT"])
+    first, second = frame.iloc[0], frame.iloc[1]
+    neighbours = [
+        index.neighbours_of_values({name: row[name] for name in NEW_CLIENT_FEATURES if name in row}, k=1)
+        for row in (first, second)
+    ]
+    assert neighbours[0]["SK_ID_CURR"].tolist() == [first["SK_ID_CURR"]]
+    assert neighbours[1]["SK_ID_CURR"].tolist() == [second["SK_ID_CURR"]]
+
+
+def test_new_client_without_enough_indexed_fields(store, tmp_path):
+    # Index sur les variables importantes : une seule est renseignée par le formulaire
+    index = SimilarityIndex(["EXT_SOURCE_2", "DAYS_BIRTH"], store, str(tmp_path / "cache"))
+    payload = {"DAYS_BIRTH": -12000, "AMT_INCOME_TOTAL": 100000.0, "AMT_CREDIT": 300000.0}
+    assert index.neighbours_of_values(payload) is None
+
+
+def test_fallback_index_is_retried(store, monkeypatch):
+    from credit_dashboard import similarity
+    from credit_dashboard.api_client import ApiResult
+
+    responses = [ApiResult(0), ApiResult(200, {"global_importances": [
+        {"Feature": "EXT_SOURCE_2", "Global Importance": 0.3},
+        {"Feature": "AMT_CREDIT", "Global Importance": 0.2},
+    ]})]
+
+    class FakeService:
+        def get_global_importance(self):
+            return responses[0]
+
+    monkeypatch.setattr(similarity, "get_scoring_service", FakeService)
+    monkeypatch.setattr(similarity, "get_population_store", lambda: store)
+    monkeypatch.setattr(similarity, "_index", None)
+    monkeypatch.setattr(similarity, "_index_expires", 0.0)
+    monkeypatch.setattr(similarity, "SimilarityIndex", lambda features: SimilarityIndex(features, store))
+
+    fallback = similarity.get_similarity_index()
+    assert fallback.requested_features == similarity.FALLBACK_FEATURES
+    assert similarity.get_similarity_index() is fallback
+    responses.pop(0)
+    monkeypatch.setattr(similarity, "_index_expires", 0.0)
+    assert similarity.get_similarity_index().requested_features == ["EXT_SOURCE_2", "AMT_CREDIT"]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_dashboard.streaming import (
+    CategoryAccumulator,
+    NumericAccumulator,
+    StreamingProfile,
+    convert_csv_streaming,
+)
+
+
+def test_numeric_accumulator_matches_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(10, 3, 1000)
+    values[::50] = np.nan
+    accumulator = NumericAccumulator(sample_size=100)
+    for chunk in np.array_split(values, 7):
+        accumulator.update(chunk)
+    finite = values[np.isfinite(values)]
+    assert accumulator.count == len(finite)
+    assert accumulator.missing == 20
+    assert accumulator.mean == pytest.approx(finite.mean())
+    assert accumulator.std == pytest.approx(finite.std())
+    assert (accumulator.min, accumulator.max) == (finite.min(), finite.max())
+    assert accumulator.value_counts is None
+
+
+def test_numeric_accumulator_integer_dtype():
+    accumulator = NumericAccumulator()
+    accumulator.update(np.array([0, 1, 1, 300]), integral=True)
+    assert accumulator.target_dtype() == np.int16
+    assert accumulator.value_counts == {0.0: 1, 1.0: 2, 300.0: 1}
+    accumulator.update(np.array([0.5]), integral=False)
+    assert accumulator.target_dtype() == np.float32
+
+
+def test_reservoir_is_exact_until_full():
+    accumulator = NumericAccumulator(sample_size=10)
+    accumulator.update(np.arange(6.0))
+    assert accumulator.exact
+    np.testing.assert_array_equal(accumulator.values_sample(), np.arange(6.0))
+    accumulator.update(np.arange(6.0, 100.0))
+    assert not accumulator.exact
+    sample = accumulator.values_sample()
+    assert len(sample) == 10
+    assert len(np.unique(sample)) == 10
+    assert np.isin(sample, np.arange(100.0)).all()
+
+
+def test_category_accumulator_dtype():
+    accumulator = CategoryAccumulator()
+    accumulator.update(np.array(["b", "a", None, "a"], dtype=object))
+    assert accumulator.missing == 1
+    assert accumulator.target_dtype() == pd.CategoricalDtype(["a", "b"])
+    assert CategoryAccumulator(counted=False).target_dtype() == np.dtype(object)
+
+
+@pytest.mark.parametrize("values", [
+    ["1", "2", "3", "4", "5", "a", "b"],
+    ["a", "b", "c", "d", "e", "1", "2"],
+])
+def test_type_flip_keeps_every_value(tmp_path, values):
+    # Colonne numérique (ou texte) dans le premier bloc, de l'autre type dans le second
+    csv_path = tmp_path / "clients.csv"
+    pd.DataFrame({"SK_ID_CURR": range(len(values)), "CODE": values}).to_csv(csv_path, index=False)
+    profile, _ = convert_csv_streaming(str(csv_path), str(tmp_path / "clients.parquet"), chunk_size=5)
+    assert profile.dtypes()["CODE"] == np.dtype(object)
+    assert not profile.covers("CODE")
+    converted = pd.read_parquet(tmp_path / "clients.parquet")
+    assert converted["CODE"].astype(str).tolist() == values
+
+
+def test_profile_dtypes():
+    profile = StreamingProfile()
+    profile.update(pd.DataFrame({"A": [1, 2], "B": [0.5, 1.5], "C": [True, False], "D": ["x", "x"]}))
+    profile.update(pd.DataFrame({"A": [3, 4], "B": [2.5, 3.5], "C": [False, False], "D": ["y", "x"]}))
+    dtypes = profile.dtypes()
+    assert dtypes["A"] == np.int8
+    assert dtypes["B"] == np.float32
+    assert dtypes["C"] == np.dtype(bool)
+    assert dtypes["D"] == pd.CategoricalDtype(["x", "y"])
+    assert profile.num_rows == 4
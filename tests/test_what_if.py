@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from credit_dashboard.what_if import WhatIfSession
+
+
+class FakeEngine:
+    """Modèle linéaire sur deux variables ; compte les appels à predict_proba."""
+
+    feature_names = ["AMT_INCOME_TOTAL", "AMT_CREDIT"]
+    feature_index = {name: index for index, name in enumerate(feature_names)}
+
+    def __init__(self):
+        self.rows = {100002: [100000.0, 200000.0]}
+        self.calls = 0
+
+    def client_matrix(self, client_ids):
+        found = np.array([client_id in self.rows for client_id in client_ids])
+        X = np.array([self.rows.get(client_id, [np.nan, np.nan]) for client_id in client_ids])
+        return X, found
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return np.nan_to_num(X[:, 1] / (X[:, 0] + X[:, 1]))
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+def test_unknown_client(engine):
+    with pytest.raises(KeyError):
+        WhatIfSession(engine, 1)
+
+
+def test_update_rescores_only_on_change(engine):
+    session = WhatIfSession(engine, 100002)
+    assert session.probability == pytest.approx(2 / 3)
+    assert session.update(AMT_INCOME_TOTAL=100000) == pytest.approx(2 / 3)
+    assert engine.calls == 1
+    assert session.update(AMT_CREDIT=100000) == pytest.approx(0.5)
+    assert engine.calls == 2
+    assert session.changed_features() == ["AMT_CREDIT"]
+    assert session.value("AMT_CREDIT") == 100000.0
+    assert session.value("AMT_CREDIT", current=False) == 200000.0
+
+
+def test_missing_values_and_unknown_features(engine):
+    session = WhatIfSession(engine, 100002)
+    session.update(AMT_INCOME_TOTAL=None)
+    assert session.value("AMT_INCOME_TOTAL") is None
+    with pytest.raises(KeyError):
+        session.update(CNT_CHILDREN=1)
+
+
+def test_reset(engine):
+    session = WhatIfSession(engine, 100002)
+    session.update(AMT_CREDIT=0)
+    session.reset()
+    assert session.changed_features() == []
+    assert session.probability == pytest.approx(2 / 3)
+
+
+def test_sweep_keeps_other_features(engine):
+    session = WhatIfSession(engine, 100002)
+    session.update(AMT_INCOME_TOTAL=300000)
+    probabilities = session.sweep("AMT_CREDIT", [0, 100000, 300000])
+    np.testing.assert_allclose(probabilities, [0.0, 0.25, 0.5])
+    assert session.value("AMT_CREDIT") == 200000.0